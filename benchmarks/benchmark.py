@@ -0,0 +1,223 @@
+"""
+Mesure les performances des méthodes draw de PixelMaster sur des images synthétiques, toujours les mêmes,
+de 256x256 à 8K, et enregistre pour chaque cas la durée, le débit en mégapixels par seconde et la mémoire
+maximale utilisée dans un fichier JSON. Le mode comparaison signale les cas plus lents qu'une référence.
+
+Exemples :
+    python benchmarks/benchmark.py --output baseline.json
+    python benchmarks/benchmark.py --sizes 256 1080p --methods square blur --output current.json
+    python benchmarks/benchmark.py --compare baseline.json current.json --threshold 0.1
+    python benchmarks/benchmark.py --quick
+"""
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+import PIL
+from PIL import Image
+
+from PixelMaster import PixelMaster
+
+# Taille (largeur, hauteur) des images synthétiques ; 32 ne sert qu'à --quick
+SIZE_DICT = {'32': (32, 32),
+             '256': (256, 256),
+             '1024': (1024, 1024),
+             '1080p': (1920, 1080),
+             '4k': (3840, 2160),
+             '8k': (7680, 4320)}
+# Valeurs du premier paramètre de chaque méthode
+PARAMETER_DICT = {'square': ('division_nb', (4, 16, 64)),
+                  'triangle': ('division_nb', (4, 16, 64)),
+                  'circle': ('division_nb', (4, 16, 64)),
+                  'blur': ('blur_nb', (1, 4, 16)),
+                  'enhance': ('factor', (2, 3))}
+
+
+def getSyntheticPicture(width: int, height: int, seed: int = 0) -> Image:
+    """
+    Construit une image synthétique déterministe : des dégradés, des bandes et du bruit, pour que les
+    sections n'aient pas toutes la même couleur.
+
+    Args:
+        width (int): La largeur de l'image.
+        height (int): La hauteur de l'image.
+        seed (int, optionnel): La graine du bruit. Defaults to 0.
+
+    Returns:
+        Image: L'image RGB.
+    """
+    x = np.linspace(0, 1, width, dtype=np.float32)[np.newaxis, :]
+    y = np.linspace(0, 1, height, dtype=np.float32)[:, np.newaxis]
+    noise = np.random.default_rng(seed).integers(0, 64, (height, width, 3), dtype=np.uint8)
+    picture_array = np.empty((height, width, 3), dtype=np.uint8)
+    picture_array[:, :, 0] = 191 * x
+    picture_array[:, :, 1] = 191 * y
+    picture_array[:, :, 2] = 96 + 95 * np.sin(20 * (x + y))
+    picture_array += noise
+    return Image.fromarray(picture_array)
+
+
+def runCase(case: dict) -> dict:
+    """
+    Mesure un cas dans un processus neuf, pour que la mémoire maximale ne dépende que de ce cas. La durée
+    retenue est la plus courte de repeat exécutions, chacune avec une nouvelle instance de PixelMaster.
+
+    Args:
+        case (dict): Le cas : method, size, parameter, value, repeat et backend.
+
+    Returns:
+        dict: Le cas complété par wall_s, mp_per_s, peak_rss_mb et rss_before_mb.
+    """
+    width, height = SIZE_DICT[case['size']]
+    picture = getSyntheticPicture(width, height)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    draw_name = PixelMaster.METHOD_DICT[case['method']]
+    wall_list = []
+    for _ in range(case['repeat']):
+        master = PixelMaster(picture, case['backend'])
+        start = time.perf_counter()
+        getattr(master, draw_name)(case['value'])
+        wall_list.append(time.perf_counter() - start)
+        del master
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en kilo-octets sous Linux, en octets sous macOS
+    unit = 2**20 if sys.platform == 'darwin' else 2**10
+    wall = min(wall_list)
+    return dict(case, wall_s=wall, mp_per_s=width * height / 1e6 / wall,
+                peak_rss_mb=peak_rss / unit, rss_before_mb=rss_before / unit)
+
+
+def getCaseKey(case: dict) -> tuple:
+    """
+    Renvoie ce qui identifie un cas d'un fichier de résultats à l'autre.
+
+    Args:
+        case (dict): Le cas.
+
+    Returns:
+        tuple: La méthode, la taille, la valeur du paramètre et le moteur.
+    """
+    return case['method'], case['size'], case['value'], case.get('backend')
+
+
+def runBenchmark(size_list: list, method_list: list, repeat: int, backend: str, value_nb: int = None) -> dict:
+    """
+    Mesure tous les cas demandés, un processus par cas.
+
+    Args:
+        size_list (list): Les tailles, des clés de SIZE_DICT.
+        method_list (list): Les méthodes, des clés de PARAMETER_DICT.
+        repeat (int): Le nombre d'exécutions de chaque cas.
+        backend (str): Le moteur d'accès aux pixels, ou None pour le plus rapide.
+        value_nb (int, optionnel): Le nombre de valeurs du paramètre mesurées pour chaque méthode, les
+            premières de PARAMETER_DICT. Par défaut, toutes.
+
+    Returns:
+        dict: Les informations sur la machine et les résultats.
+    """
+    result_list = []
+    for size in size_list:
+        for method in method_list:
+            parameter, value_list = PARAMETER_DICT[method]
+            for value in value_list[:value_nb]:
+                case = {'method': method, 'size': size, 'parameter': parameter, 'value': value,
+                        'repeat': repeat, 'backend': backend}
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    result = executor.submit(runCase, case).result()
+                result_list.append(result)
+                setting = f"{parameter}={value}"
+                print(f"{method:9} {size:6} {setting:15} {result['wall_s']:9.4f} s "
+                      f"{result['mp_per_s']:9.2f} MP/s {result['peak_rss_mb']:9.1f} Mo", flush=True)
+    return {'meta': {'date': datetime.datetime.now().isoformat(timespec='seconds'),
+                     'python': platform.python_version(), 'numpy': np.__version__,
+                     'pillow': PIL.__version__, 'platform': platform.platform(),
+                     'cpu_count': os.cpu_count()},
+            'results': result_list}
+
+
+def compareResult(baseline: dict, current: dict, threshold: float) -> list:
+    """
+    Compare deux fichiers de résultats et affiche l'évolution de chaque cas présent dans les deux.
+
+    Args:
+        baseline (dict): Les résultats de référence.
+        current (dict): Les nouveaux résultats.
+        threshold (float): Le ralentissement relatif toléré, par exemple 0.1 pour 10 %.
+
+    Returns:
+        list: Les cas dont la durée dépasse celle de la référence de plus de threshold.
+    """
+    baseline_dict = {getCaseKey(case): case for case in baseline['results']}
+    regression_list = []
+    for case in current['results']:
+        reference = baseline_dict.get(getCaseKey(case))
+        if reference is None:
+            continue
+        ratio = case['wall_s'] / reference['wall_s']
+        regression = ratio > 1 + threshold
+        if regression:
+            regression_list.append(case)
+        setting = f"{case['parameter']}={case['value']}"
+        print(f"{case['method']:9} {case['size']:6} {setting:15} "
+              f"{reference['wall_s']:9.4f} s -> {case['wall_s']:9.4f} s  x{ratio:5.2f}"
+              f"{'  RÉGRESSION' if regression else ''}")
+    return regression_list
+
+
+def main(argv: list = None) -> int:
+    """
+    Point d'entrée du banc d'essai.
+
+    Args:
+        argv (list, optionnel): Les arguments. Par défaut, ceux de la ligne de commande.
+
+    Returns:
+        int: Le code de sortie : 1 si une régression est détectée, 0 sinon.
+    """
+    parser = argparse.ArgumentParser(description="Banc d'essai des méthodes draw de PixelMaster.")
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZE_DICT), default=list(SIZE_DICT)[1:])
+    parser.add_argument('--methods', nargs='+', choices=list(PARAMETER_DICT), default=list(PARAMETER_DICT))
+    parser.add_argument('--repeat', type=int, default=3, help="exécutions par cas, la plus rapide est gardée")
+    parser.add_argument('--backend', choices=('numpy', 'pixelaccess', 'buffer'))
+    parser.add_argument('--output', help="fichier JSON des résultats")
+    parser.add_argument('--baseline', help="fichier JSON de référence à comparer aux nouveaux résultats")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help="compare deux fichiers JSON sans rien mesurer")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="ralentissement relatif toléré avant de signaler une régression")
+    parser.add_argument('--quick', action='store_true',
+                        help="vérifie seulement que le banc d'essai tourne : une exécution de chaque méthode, "
+                             "pour une seule valeur, sur une image 32x32")
+    argument = parser.parse_args(argv)
+    if argument.compare:
+        baseline_path, current_path = argument.compare
+        with open(baseline_path) as baseline_file, open(current_path) as current_file:
+            baseline, current = json.load(baseline_file), json.load(current_file)
+    else:
+        if argument.quick:
+            current = runBenchmark(['32'], argument.methods, 1, argument.backend, 1)
+        else:
+            current = runBenchmark(argument.sizes, argument.methods, argument.repeat, argument.backend)
+        if argument.output:
+            with open(argument.output, 'w') as output_file:
+                json.dump(current, output_file, indent=2)
+        if not argument.baseline:
+            return 0
+        with open(argument.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    regression_list = compareResult(baseline, current, argument.threshold)
+    print(f"{len(regression_list)} régression(s) au-delà de {argument.threshold:.0%}")
+    return 1 if regression_list else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,471 +1,4766 @@
-from PIL import Image
+from PIL import GifImagePlugin, Image
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from collections import OrderedDict, deque
+from http import HTTPStatus
+import argparse
+import array
+import asyncio
+import functools
+import glob
+import hashlib
+import inspect
+import io
+import json
 import math
+import os
+import struct
+import sys
+import time
+import urllib.parse
+import zlib
 
+try:
+    import numpy as np
+    from multiprocessing import shared_memory
+except ImportError:
+    np = None
 
-class PixelMaster():
+
+class PixelAccessBackend():
 
     def __init__(self, picture: Image):
         """
-        Initialise une instance de PixelMaster avec l'image passée en argument.
+        Accès aux pixels d'une image par l'objet PixelAccess renvoyé par Image.load(), bien plus rapide que
+        Image.getpixel et Image.putpixel.
 
         Args:
-            picture (Image): une instance de la classe Image de la bibliothèque PIL
+            picture (Image): L'image à lire ou à peindre.
         """
         self.m_picture = picture
+        self.size = picture.size
+        pixel_access = picture.load()
+        if len(picture.getbands()) > 1:
+            self.getpixel = pixel_access.__getitem__
+            self.putpixel = pixel_access.__setitem__
+        else:
+            # Les images à une composante lisent et peignent aussi des tuples, ramenés à la plage du mode
+            # (PIL ne borne pas les valeurs des images 16 bits)
+            max_value = 65535 if picture.mode == 'I;16' else 255
+            self.getpixel = lambda xy: (pixel_access[xy],)
+            self.putpixel = lambda xy, color: pixel_access.__setitem__(
+                xy, min(max(int(color[0]), 0), max_value))
 
-    def __getPictureSeparation(self, division_nb: int, proportional: bool = True) -> tuple[list, list, int, int]:
+    def toPicture(self) -> Image:
         """
-        Divise l'image en sections carrées de taille égale, en fonction du nombre de divisions souhaitées et
-        renvoie les coordonnées de chaque section ainsi que la largeur et la hauteur de l'image.
-
-        Args:
-            division_nb (int): Le nombre de sections carrées souhaitées pour diviser l'image.
-            proportional (bool, optionnel): Si True, divise l'image de manière proportionnelle. Si False, divise
-                l'image de sorte que la taille des sections soit la même quelle que soit la direction.
-                Defaults to True.
+        Renvoie l'image lue ou peinte.
 
         Returns:
-            tuple[list, list, int, int]: Un tuple contenant deux listes d'entiers, représentant les coordonnées
-            x et y de chaque section de l'image, ainsi que la largeur et la hauteur de l'image.
+            Image: L'image.
         """
-        width, height = self.m_picture.size
-        if proportional:
-            nb_pixel_width = width//division_nb
-            nb_pixel_height = height//division_nb
-        else:
-            if width <= height:
-                nb_pixel_width, nb_pixel_height = width//division_nb, width//division_nb
-            else:
-                nb_pixel_width, nb_pixel_height = height//division_nb, height//division_nb
-        width_list = []
-        height_list = []
+        return self.m_picture
 
-        width_index = 0
-        while width >= nb_pixel_width * (width_index + 1):
-            width_list.append(nb_pixel_width * width_index)
-            width_list.append(nb_pixel_width*(width_index+1)-1)
-            width_index += 1
-        height_index = 0
-        while height >= nb_pixel_height * (height_index + 1):
-            height_list.append(nb_pixel_height * height_index)
-            height_list.append(nb_pixel_height*(height_index+1)-1)
-            height_index += 1
-        if proportional:
-            if width_list[-1] < width:
-                width_list.append(nb_pixel_width*width_index)
-                width_list.append(width)
-            if height_list[-1] < height:
-                height_list.append(nb_pixel_height*height_index)
-                height_list.append(height)
 
-        return width_list, height_list, width, height
+class BufferBackend():
 
-    def __totalPixelColor(self, red_total: int, green_total: int, blue_total: int, nb_pixel: int, x: int, y: int, coef: int = 1, a: int = 0, b: int = 0, c: int = 0, d: int = 0) -> tuple[int, int, int, int]:
+    def __init__(self, picture: Image):
         """
-        Calcule la somme des valeurs des composantes rouge, verte et bleue de tous les pixels dans une zone donnée.
+        Accès aux pixels d'une image copiée dans un bytearray, ligne par ligne, ou dans un tableau d'entiers
+        16 bits pour le mode 'I;16'. Ne dépend que de Python.
 
         Args:
-            red_total (int): La somme actuelle des valeurs de la composante rouge de tous les pixels dans la zone.
-            green_total (int): La somme actuelle des valeurs de la composante verte de tous les pixels dans la zone.
-            blue_total (int): La somme actuelle des valeurs de la composante bleue de tous les pixels dans la zone.
-            nb_pixel (int): Le nombre actuel de pixels dans la zone.
-            x (int): La coordonnée x du pixel courant dans la zone.
-            y (int): La coordonnée y du pixel courant dans la zone.
-            coef (int, optional): Le coefficient de zoom appliqué à la zone. Par défaut, 1.
-            a (int, optional): La coordonnée de début en x de la zone de zoom. Par défaut, 0.
-            b (int, optional): La coordonnée de fin en x de la zone de zoom. Par défaut, 0.
-            c (int, optional): La coordonnée de début en y de la zone de zoom. Par défaut, 0.
-            d (int, optional): La coordonnée de fin en y de la zone de zoom. Par défaut, 0.
+            picture (Image): L'image à lire ou à peindre.
+        """
+        self.m_mode = picture.mode
+        self.size = picture.size
+        self.m_nb_color = len(picture.getbands())
+        if picture.mode == 'I;16':
+            self.m_max_value = 65535
+            self.m_buffer = array.array('H', picture.tobytes('raw', 'I;16N'))
+            self.m_pack = functools.partial(array.array, 'H')
+        else:
+            self.m_max_value = 255
+            self.m_buffer = bytearray(picture.tobytes())
+            self.m_pack = bytes
 
-        Returns:
-            tuple[int, int, int, int]: Un tuple contenant la nouvelle somme des valeurs de la composante rouge, 
-            la nouvelle somme des valeurs de la composante verte, la nouvelle somme des valeurs de la composante bleue 
-            et le nouveau nombre de pixels dans la zone.
+    def getpixel(self, xy: tuple) -> tuple:
+        """
+        Lit la couleur d'un pixel. Comme Image.getpixel, les coordonnées négatives partent de la fin.
 
-        Raises:
-            None
+        Args:
+            xy (tuple): Les coordonnées (x, y) du pixel.
+
+        Returns:
+            tuple: La couleur du pixel.
         """
-        if a <= b and c <= d:
-            red, green, blue = self.m_picture.getpixel((x, y))
-            red_total += red*coef
-            green_total += green*coef
-            blue_total += blue*coef
-            if coef == 1:
-                nb_pixel += 1
-            else:
-                nb_pixel += 1 + coef
-        return red_total, green_total, blue_total, nb_pixel
+        x, y = xy
+        width, height = self.size
+        if x < 0:
+            x += width
+        if y < 0:
+            y += height
+        index = (y * width + x) * self.m_nb_color
+        return tuple(self.m_buffer[index:index + self.m_nb_color])
 
-    def __averagePixelColor(self, red_total: int, green_total: int, blue_total: int, nb_pixel: int) -> tuple[int, int, int]:
+    def putpixel(self, xy: tuple, color: tuple):
         """
-        Calcule la couleur moyenne d'un ensemble de pixels.
+        Peint un pixel. Comme Image.putpixel, les composantes sont ramenées dans la plage du mode.
 
         Args:
-            red_total (int): somme de la composante rouge de chaque pixel
-            green_total (int): somme de la composante verte de chaque pixel
-            blue_total (int): somme de la composante bleue de chaque pixel
-            nb_pixel (int): nombre total de pixels considérés
+            xy (tuple): Les coordonnées (x, y) du pixel.
+            color (tuple): La couleur du pixel.
+        """
+        x, y = xy
+        width, height = self.size
+        if x < 0:
+            x += width
+        if y < 0:
+            y += height
+        index = (y * width + x) * self.m_nb_color
+        try:
+            self.m_buffer[index:index + self.m_nb_color] = self.m_pack(color)
+        except (ValueError, TypeError, OverflowError):
+            self.m_buffer[index:index + self.m_nb_color] = self.m_pack(
+                min(max(int(value), 0), self.m_max_value) for value in color)
+
+    def toPicture(self) -> Image:
+        """
+        Renvoie l'image lue ou peinte.
 
         Returns:
-            tuple[int, int, int]: une tuple contenant les valeurs moyennes des composantes rouge, verte et bleue respectivement.
+            Image: L'image.
+        """
+        if self.m_mode == 'I;16':
+            return Image.frombytes(self.m_mode, self.size, self.m_buffer.tobytes(), 'raw', 'I;16N')
+        return Image.frombytes(self.m_mode, self.size, bytes(self.m_buffer))
+
+
+def _getPngChunk(chunk_type: bytes, data: bytes) -> bytes:
+    """
+    Construit un bloc PNG : longueur, type, contenu et somme de contrôle.
+
+    Args:
+        chunk_type (bytes): Le type du bloc.
+        data (bytes): Le contenu du bloc.
+
+    Returns:
+        bytes: Le bloc.
+    """
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+
+def _getPngHeader(size: tuple, mode: str, palette: bytes = None, transparency=None) -> bytes:
+    """
+    Construit les blocs PNG qui précèdent les pixels : IHDR puis, pour les couleurs indexées, PLTE et tRNS.
+
+    Args:
+        size (tuple): La largeur et la hauteur de l'image.
+        mode (str): Le mode de l'image, une clé de StripWriter.PNG_COLOR_TYPE.
+        palette (bytes, optionnel): La palette RGB du mode 'P'.
+        transparency (optionnel): La transparence du mode 'P', comme dans Image.info : l'index de la couleur
+            transparente ou l'alpha de chaque couleur.
+
+    Returns:
+        bytes: Les blocs.
+
+    Raises:
+        ValueError: Si le mode 'P' est donné sans palette.
+    """
+    width, height = size
+    color_type, bit_depth = StripWriter.PNG_COLOR_TYPE[mode]
+    header = _getPngChunk(b'IHDR', struct.pack('>IIBBBBB', width, height, bit_depth, color_type, 0, 0, 0))
+    if mode == 'P':
+        if palette is None:
+            raise ValueError("Le mode 'P' nécessite une palette")
+        header += _getPngChunk(b'PLTE', bytes(palette))
+        if isinstance(transparency, int):
+            header += _getPngChunk(b'tRNS', bytes([255] * transparency + [0]))
+        elif transparency is not None:
+            header += _getPngChunk(b'tRNS', bytes(transparency))
+    return header
+
+
+def _getEightBitPicture(picture: Image) -> Image:
+    """
+    Ramène une image 16 bits sur 8 bits, pour les formats qui n'ont que 8 bits par composante.
+
+    Args:
+        picture (Image): L'image.
+
+    Returns:
+        Image: L'image elle-même, ou une image 'L' pour le mode 'I;16'.
+    """
+    if picture.mode == 'I;16':
+        return picture.point(lambda value: value / 257, 'L')
+    return picture
+
+
+def _toBigEndian(raw: bytes) -> bytes:
+    """
+    Convertit les pixels bruts d'une image 'I;16', petit-boutistes, dans l'ordre grand-boutiste des formats
+    PNG et PNM.
+
+    Args:
+        raw (bytes): Les pixels.
+
+    Returns:
+        bytes: Les pixels, octets de poids fort en premier.
+    """
+    swapped = bytearray(len(raw))
+    swapped[0::2] = raw[1::2]
+    swapped[1::2] = raw[0::2]
+    return bytes(swapped)
+
+
+class StripWriter():
+
+    def __init__(self, path: str, size: tuple, mode: str, palette: bytes = None, transparency=None):
+        """
+        Écrit une image bande par bande dans un fichier PNG ou PNM (PPM, PGM), sans la garder en mémoire.
+
+        Args:
+            path (str): Le chemin du fichier, dont l'extension (.png, .ppm, .pgm ou .pnm) choisit le format.
+            size (tuple): La largeur et la hauteur de l'image.
+            mode (str): Le mode de l'image : '1', 'L', 'LA', 'I;16', 'P', 'RGB' ou 'RGBA' (seulement 'L',
+                'I;16' et 'RGB' en PNM).
+            palette (bytes, optionnel): La palette RGB du mode 'P'.
+            transparency (optionnel): La transparence du mode 'P', comme dans Image.info.
 
         Raises:
-            Aucune exception n'est levée.
+            ValueError: Si le format ou le mode n'est pas pris en charge.
         """
-        if nb_pixel == 0:
-            return 0, 0, 0
+        extension = os.path.splitext(str(path))[1].lower()
+        if extension == '.png':
+            if mode not in self.PNG_COLOR_TYPE:
+                raise ValueError(f"Mode non pris en charge en PNG : {mode}")
+            self.m_compressor = zlib.compressobj()
+        elif extension in ('.ppm', '.pgm', '.pnm'):
+            if mode not in ('L', 'I;16', 'RGB'):
+                raise ValueError(f"Mode non pris en charge en PNM : {mode}")
+            self.m_compressor = None
+        else:
+            raise ValueError(f"Format de sortie non pris en charge : {extension}")
+        self.m_mode = mode
+        header = None
+        if self.m_compressor is not None:
+            header = b'\x89PNG\r\n\x1a\n' + _getPngHeader(size, mode, palette, transparency)
+        self.m_file = open(path, 'wb')
+        width, height = size
+        if header is not None:
+            self.m_file.write(header)
         else:
-            red_avg = red_total // nb_pixel
-            green_avg = green_total // nb_pixel
-            blue_avg = blue_total // nb_pixel
-            return red_avg, green_avg, blue_avg
+            self.m_file.write(f"{'P6' if mode == 'RGB' else 'P5'}\n{width} {height}\n"
+                              f"{65535 if mode == 'I;16' else 255}\n".encode())
 
-    def drawTriangularPicture(self, division_nb: int) -> Image:
+    # Type de couleur et profondeur PNG de chaque mode
+    PNG_COLOR_TYPE = {'1': (0, 1), 'L': (0, 8), 'I;16': (0, 16), 'P': (3, 8), 'RGB': (2, 8), 'LA': (4, 8),
+                      'RGBA': (6, 8)}
+
+    def __writeChunk(self, chunk_type: bytes, data: bytes):
         """
-        Génère une image pixelisée en forme de triangles.
+        Écrit un bloc PNG.
 
         Args:
-            division_nb (int): Le nombre de divisions de l'image.
+            chunk_type (bytes): Le type du bloc.
+            data (bytes): Le contenu du bloc.
+        """
+        self.m_file.write(_getPngChunk(chunk_type, data))
 
-        Returns:
-            Image: L'image pixelisée en forme de triangles.
+    def write(self, strip: bytes, row_size: int):
         """
-        width_list, height_list, width, height = self.__getPictureSeparation(
-            division_nb)
-        pixelated_picture = Image.new('RGB', (width, height))
-        index_x = 0
-        for i in range(len(width_list)//2):
-            index_y = 0
-            for i in range(len(height_list)//2):
-                start_x = width_list[index_x]
-                start_y = height_list[index_y]
-                end_x = width_list[index_x+1]
-                end_y = height_list[index_y+1]
-                red_t_total, green_t_total, blue_t_total, px_triangle_t = 0, 0, 0, 0
-                red_l_total, green_l_total, blue_l_total, px_triangle_l = 0, 0, 0, 0
-                red_r_total, green_r_total, blue_r_total, px_triangle_r = 0, 0, 0, 0
-                red_d_total, green_d_total, blue_d_total, px_triangle_d = 0, 0, 0, 0
-                if end_y - start_y != 0:
-                    ratio = (end_x - start_x) / (end_y - start_y)
-                else:
-                    ratio = 1
-                for x in range(start_x - 1, end_x):
-                    for y in range(start_y-1, end_y):
-                        red_t_total, green_t_total, blue_t_total, px_triangle_t = self.__totalPixelColor(
-                            red_t_total, green_t_total, blue_t_total, px_triangle_t, x, y, 1, (y-start_y)*ratio, (x-start_x), (y-start_y)*ratio, (end_x-x))
-                        red_l_total, green_l_total, blue_l_total, px_triangle_l = self.__totalPixelColor(
-                            red_l_total, green_l_total, blue_l_total, px_triangle_l, x, y, 1, (x-start_x), (y-start_y)*ratio, (y-start_y)*ratio, (end_x-x))
-                        red_r_total, green_r_total, blue_r_total, px_triangle_r = self.__totalPixelColor(
-                            red_r_total, green_r_total, blue_r_total, px_triangle_r, x, y, 1, (y-start_y)*ratio, (x-start_x), (end_x-x), (y-start_y)*ratio)
-                        red_d_total, green_d_total, blue_d_total, px_triangle_d = self.__totalPixelColor(
-                            red_d_total, green_d_total, blue_d_total, px_triangle_d, x, y, 1, (x-start_x), (y-start_y)*ratio, (end_x-x), (y-start_y)*ratio)
-
-                red_t_avg, green_t_avg, blue_t_avg = self.__averagePixelColor(
-                    red_t_total, green_t_total, blue_t_total, px_triangle_t)
-                red_l_avg, green_l_avg, blue_l_avg = self.__averagePixelColor(
-                    red_l_total, green_l_total, blue_l_total, px_triangle_l)
-                red_r_avg, green_r_avg, blue_r_avg = self.__averagePixelColor(
-                    red_r_total, green_r_total, blue_r_total, px_triangle_r)
-                red_d_avg, green_d_avg, blue_d_avg = self.__averagePixelColor(
-                    red_d_total, green_d_total, blue_d_total, px_triangle_d)
+        Écrit la bande suivante de l'image.
 
-                for x in range(start_x - 1, end_x):
-                    for y in range(start_y-1, end_y):
-                        if (x-start_x) >= (y-start_y)*ratio and (end_x-x) >= (y-start_y)*ratio:
-                            pixelated_picture.putpixel(
-                                (x, y), (red_t_avg, green_t_avg, blue_t_avg))
-                        elif (x-start_x) <= (y-start_y)*ratio and (end_x-x) >= (y-start_y)*ratio:
-                            pixelated_picture.putpixel(
-                                (x, y), (red_l_avg, green_l_avg, blue_l_avg))
-                        elif (x-start_x) >= (y-start_y)*ratio and (end_x-x) <= (y-start_y)*ratio:
-                            pixelated_picture.putpixel(
-                                (x, y), (red_r_avg, green_r_avg, blue_r_avg))
-                        elif (x-start_x) <= (y-start_y)*ratio and (end_x-x) <= (y-start_y)*ratio:
-                            pixelated_picture.putpixel(
-                                (x, y), (red_d_avg, green_d_avg, blue_d_avg))
-                index_y += 2
-            index_x += 2
-        return pixelated_picture
+        Args:
+            strip (bytes): Les pixels de la bande, ligne par ligne, comme les renvoie Image.tobytes.
+            row_size (int): Le nombre d'octets d'une ligne.
+        """
+        if self.m_mode == 'I;16':
+            strip = _toBigEndian(strip)
+        if self.m_compressor is None:
+            self.m_file.write(strip)
+            return
+        # Chaque ligne PNG commence par son type de filtre (0, aucun filtre)
+        for start in range(0, len(strip), row_size):
+            data = self.m_compressor.compress(b'\x00' + strip[start:start + row_size])
+            if data:
+                self.__writeChunk(b'IDAT', data)
 
-    def drawCircularPicture(self, division_nb: int) -> Image:
+    def close(self):
         """
-        Dessine une image circulaire divisée en plusieurs sections, chaque section étant remplie avec la même couleur moyenne
-        de pixels.
+        Termine l'image et ferme le fichier.
+        """
+        if self.m_compressor is not None:
+            self.__writeChunk(b'IDAT', self.m_compressor.flush())
+            self.__writeChunk(b'IEND', b'')
+        self.m_file.close()
 
-        Args:
-            division_nb (int): Le nombre de divisions de l'image circulaire. Plus la valeur est grande, plus l'image aura de 
-            sections.
+    def __enter__(self):
+        return self
 
-        Returns:
-            Image: L'image dessinée.
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
-        """
-        # Obtenir les coordonnées de séparation de chaque section de l'image
-        width_list, height_list, width, height = self.__getPictureSeparation(
-            division_nb, False)
-        # Créer une nouvelle image pixelisée avec la taille de l'image d'origine
-        pixelated_picture = Image.new('RGB', (width, height))
-        index_x = 0
-        # Parcourir chaque section horizontale de l'image
-        for i in range(len(width_list)//2):
-            index_y = 0
-            # Parcourir chaque section verticale de l'image
-            for i in range(len(height_list)//2):
-                # Obtenir les coordonnées de début et de fin de la section actuelle
-                start_x = width_list[index_x]
-                start_y = height_list[index_y]
-                end_x = width_list[index_x+1]
-                end_y = height_list[index_y+1]
-                width_pixel = end_x - start_x
-                height_pix = end_y - start_y
-                x_loc_zone = (width_pixel + 1) // 2
-                y_loc_zone = (height_pix + 1) // 2
-                x_loc = start_x + x_loc_zone
-                y_loc = start_y + y_loc_zone
-                # Calculer la couleur moyenne de pixels de la section actuelle
-                red_total, green_total, blue_total, px_circle = 0, 0, 0, 0
-                for x in range(start_x - 1, end_x):
-                    for y in range(start_y-1, end_y):
-                        red_total, green_total, blue_total, px_circle = self.__totalPixelColor(
-                            red_total, green_total, blue_total, px_circle, x, y)
-                red_avg, green_avg, blue_avg = self.__averagePixelColor(
-                    red_total, green_total, blue_total, px_circle)
-                # Dessiner un cercle rempli de la couleur moyenne dans la section actuelle
-                for i_width in range(x_loc_zone):
-                    for x in range(i_width):
-                        # Calculer la position en y du pixel à dessiner en fonction de sa position en x
-                        if i_width > 0:
-                            y = int((math.sqrt(1-(x/i_width)**2))*i_width)
-                        else:
-                            y = 0
-                        # Dessiner les pixels dans les quatre quarts du cercle
-                        pixelated_picture.putpixel(
-                            (x+x_loc, y+y_loc), (red_avg, green_avg, blue_avg))
-                        pixelated_picture.putpixel(
-                            (x+x_loc, y_loc-y), (red_avg, green_avg, blue_avg))
-                        pixelated_picture.putpixel(
-                            (x_loc-x, y+y_loc), (red_avg, green_avg, blue_avg))
-                        pixelated_picture.putpixel(
-                            (x_loc-x, y_loc-y), (red_avg, green_avg, blue_avg))
-                for i_height in range(y_loc_zone):
-                    for y in range(i_height):
-                        # Calculer la position en x du prochain cercle en fonction de sa position en y
-                        if i_height > 0:
-                            x = int((math.sqrt(1-(y/i_height)**2))*i_height)
-                        else:
-                            x = 0
-                        pixelated_picture.putpixel(
-                            (x+x_loc, y+y_loc), (red_avg, green_avg, blue_avg))
-                        pixelated_picture.putpixel(
-                            (x+x_loc, y_loc-y), (red_avg, green_avg, blue_avg))
-                        pixelated_picture.putpixel(
-                            (x_loc-x, y+y_loc), (red_avg, green_avg, blue_avg))
-                        pixelated_picture.putpixel(
-                            (x_loc-x, y_loc-y), (red_avg, green_avg, blue_avg))
-                index_y += 2
-            index_x += 2
-        return pixelated_picture
 
-    def drawSquarePicture(self, division_nb: int) -> Image:
+class AnimationWriter():
+
+    def __init__(self, path: str, size: tuple, mode: str, frame_nb: int, duration: int = 100, loop: int = 0,
+                 palette: bytes = None, transparency=None):
         """
-        Crée une nouvelle image en utilisant des carrés de pixels pour réduire la résolution de l'image.
+        Écrit une animation GIF ou APNG image par image, sans garder les images précédentes en mémoire.
 
         Args:
-            division_nb (int): Le nombre de divisions à effectuer sur l'image.
+            path (str): Le chemin du fichier, dont l'extension (.gif, .png ou .apng) choisit le format.
+            size (tuple): La largeur et la hauteur des images.
+            mode (str): Le mode des images : '1', 'L', 'LA', 'I;16', 'P', 'RGB' ou 'RGBA' (converties en
+                couleurs indexées en GIF, sauf en mode 'P').
+            frame_nb (int): Le nombre d'images de l'animation, écrit dans l'en-tête APNG.
+            duration (int, optionnel): La durée d'affichage de chaque image, en millisecondes. Defaults to 100.
+            loop (int, optionnel): Le nombre de répétitions, 0 pour répéter sans fin. Defaults to 0.
+            palette (bytes, optionnel): La palette RGB, commune à toutes les images, du mode 'P' en APNG.
+            transparency (optionnel): La transparence du mode 'P' en APNG, comme dans Image.info.
 
-        Returns:
-            Image: L'image réduite créée en utilisant des carrés de pixels.
+        Raises:
+            ValueError: Si le format ou le mode n'est pas pris en charge.
         """
-        width_list, height_list, width, height = self.__getPictureSeparation(
-            division_nb)
-        pixelated_picture = Image.new('RGB', (width, height))
-        index_x = 0
-        for i in range(len(width_list)//2):
-            index_y = 0
-            for i in range(len(height_list)//2):
-                start_x = width_list[index_x]
-                start_y = height_list[index_y]
-                end_x = width_list[index_x+1]
-                end_y = height_list[index_y+1]
-                red_total, green_total, blue_total, px_square = 0, 0, 0, 0
-                for x in range(start_x - 1, end_x):
-                    for y in range(start_y-1, end_y):
-                        red_total, green_total, blue_total, px_square = self.__totalPixelColor(
-                            red_total, green_total, blue_total, px_square, x, y)
-                red_avg, green_avg, blue_avg = self.__averagePixelColor(
-                    red_total, green_total, blue_total, px_square)
-                for x in range(start_x - 1, end_x):
-                    for y in range(start_y-1, end_y):
-                        pixelated_picture.putpixel(
-                            (x, y), (red_avg, green_avg, blue_avg))
-                index_y += 2
-            index_x += 2
-        return pixelated_picture
+        extension = os.path.splitext(str(path))[1].lower()
+        if extension not in ('.gif', '.png', '.apng'):
+            raise ValueError(f"Format d'animation non pris en charge : {extension}")
+        if mode not in StripWriter.PNG_COLOR_TYPE:
+            raise ValueError(f"Mode non pris en charge : {mode}")
+        self.m_gif = extension == '.gif'
+        self.m_size = size
+        self.m_mode = mode
+        self.m_duration = duration
+        self.m_loop = loop
+        self.m_frame_index = 0
+        # Numéro des blocs fcTL et fdAT, communs à toutes les images APNG
+        self.m_sequence = 0
+        header = None
+        if not self.m_gif:
+            header = b'\x89PNG\r\n\x1a\n' + _getPngHeader(size, mode, palette, transparency)
+        self.m_file = open(path, 'wb')
+        if header is not None:
+            self.m_file.write(header)
+            self.m_file.write(_getPngChunk(b'acTL', struct.pack('>II', frame_nb, loop)))
 
-    def drawBlurredPicture(self, blur_nb: int) -> Image:
+    def write(self, frame: Image):
         """
-        Cette fonction floute une image.
+        Écrit l'image suivante de l'animation.
 
         Args:
-            blur_nb (int): Le nombre de pixels à prendre en compte pour le flou.
+            frame (Image): L'image, de la taille et du mode donnés à la construction.
 
-        Returns:
-            Image : L'image floutée.
+        Raises:
+            ValueError: Si la taille ou le mode de l'image ne correspond pas.
+        """
+        if frame.size != self.m_size or frame.mode != self.m_mode:
+            raise ValueError(f"Image {frame.mode} {frame.size} au lieu de {self.m_mode} {self.m_size}")
+        if self.m_gif:
+            # Une palette de 256 couleurs par image, écrite dans l'en-tête de l'image
+            if frame.mode == 'P':
+                indexed_frame = frame
+            else:
+                indexed_frame = _getEightBitPicture(frame).convert('RGB').quantize()
+            if self.m_frame_index == 0:
+                header = GifImagePlugin.getheader(
+                    indexed_frame, None, {'loop': self.m_loop, 'duration': self.m_duration})[0]
+                self.m_file.write(b''.join(header))
+            self.m_file.writelines(GifImagePlugin.getdata(
+                indexed_frame, (0, 0), duration=self.m_duration, include_color_table=True))
+        else:
+            width, height = self.m_size
+            self.m_file.write(_getPngChunk(b'fcTL', struct.pack(
+                '>IIIIIHHBB', self.m_sequence, width, height, 0, 0, self.m_duration, 1000, 0, 0)))
+            self.m_sequence += 1
+            # Chaque ligne PNG commence par son type de filtre (0, aucun filtre)
+            raw = frame.tobytes()
+            if self.m_mode == 'I;16':
+                raw = _toBigEndian(raw)
+            row_size = len(raw) // height
+            compressor = zlib.compressobj()
+            data = b''.join(compressor.compress(b'\x00' + raw[start:start + row_size])
+                            for start in range(0, len(raw), row_size)) + compressor.flush()
+            if self.m_frame_index == 0:
+                self.m_file.write(_getPngChunk(b'IDAT', data))
+            else:
+                self.m_file.write(_getPngChunk(b'fdAT', struct.pack('>I', self.m_sequence) + data))
+                self.m_sequence += 1
+        self.m_frame_index += 1
 
+    def close(self):
         """
-        width, height = self.m_picture.size
-        pixelated_picture = Image.new('RGB', (width, height))
-        for x in range(width):
-            for y in range(height):
-                red_total, green_total, blue_total, px_blur = 0, 0, 0, 0
-                for i in range(1, blur_nb+1):
-                    if x-1 >= 0:
-                        red_total, green_total, blue_total, px_blur = self.__totalPixelColor(
-                            red_total, green_total, blue_total, px_blur, x-i, y)
-                    if x+i < width:
-                        red_total, green_total, blue_total, px_blur = self.__totalPixelColor(
-                            red_total, green_total, blue_total, px_blur, x+i, y)
-                    if y-i >= 0:
-                        red_total, green_total, blue_total, px_blur = self.__totalPixelColor(
-                            red_total, green_total, blue_total, px_blur, x, y-i)
-                    if y+i < height:
-                        red_total, green_total, blue_total, px_blur = self.__totalPixelColor(
-                            red_total, green_total, blue_total, px_blur, x, y+i)
-                for x_ref in range(blur_nb):
-                    y_ref = int((math.sqrt(1-(x_ref/blur_nb)**2))*blur_nb)
-                    coef = (math.sqrt(x_ref**2+y_ref**2))
-                    if x - x_ref >= 0 and y - y_ref >= 0:
-                        red_total, green_total, blue_total, px_blur = self.__totalPixelColor(
-                            red_total, green_total, blue_total, px_blur, x-x_ref, y-y_ref, coef)
-                    if x + x_ref < width and y + y_ref < height:
-                        red_total, green_total, blue_total, px_blur = self.__totalPixelColor(
-                            red_total, green_total, blue_total, px_blur, x+x_ref, y+y_ref, coef)
-                    if y - y_ref >= 0 and x + x_ref < width:
-                        red_total, green_total, blue_total, px_blur = self.__totalPixelColor(
-                            red_total, green_total, blue_total, px_blur, x+x_ref, y-y_ref, coef)
-                    if x - x_ref >= 0 and y + y_ref < height:
-                        red_total, green_total, blue_total, px_blur = self.__totalPixelColor(
-                            red_total, green_total, blue_total, px_blur, x-x_ref, y+y_ref, coef)
-                red_avg, green_avg, blue_avg = self.__averagePixelColor(
-                    red_total, green_total, blue_total, px_blur)
-                pixelated_picture.putpixel(
-                    (x, y), (int(red_avg), int(green_avg), int(blue_avg)))
-        return pixelated_picture
+        Termine l'animation et ferme le fichier.
+        """
+        self.m_file.write(b';' if self.m_gif else _getPngChunk(b'IEND', b''))
+        self.m_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
 
-    def __even(self, numbre: int) -> bool:
+class _FrameSequence(Image.Image):
+
+    def __init__(self, frame_iterator, frame_nb: int):
         """
-        Vérifie si un nombre est pair.
+        Image à plusieurs images dont chaque image n'est calculée qu'au moment où PIL s'y place avec seek.
+        Elle permet d'écrire une animation WebP avec PIL sans construire toutes les images à l'avance :
+        seule l'image courante est gardée.
 
         Args:
-            numbre (int): Le nombre à vérifier.
-
-        Returns:
-            bool: True si le nombre est pair, False sinon.
+            frame_iterator: Un itérateur sur les images de l'animation.
+            frame_nb (int): Le nombre d'images.
         """
-        return numbre / 2 == numbre // 2
+        super().__init__()
+        self.m_frame_iterator = frame_iterator
+        self.m_frame_index = 0
+        self.n_frames = frame_nb
+        self.is_animated = frame_nb > 1
+        self.__setFrame(next(frame_iterator))
 
-    def __totalPixelColorEnhanceInner(self, enhance_picture: Image, nb_pixel, red_total, green_total, blue_total, x, y) -> tuple[int, int, int, int]:
+    def __setFrame(self, frame: Image):
         """
-        Cette méthode calcule la somme des valeurs de rouge, vert et bleu des pixels voisins du pixel de coordonnées (x, y) sur l'image d'amélioration.
+        Remplace l'image courante.
 
         Args:
-            enhance_picture (Image): L'image d'amélioration sur laquelle on veut appliquer l'effet de flou.
-            nb_pixel (int): Le nombre de pixels voisins déjà considérés.
-            red_total (int): La somme des valeurs de rouge des pixels voisins déjà considérés.
-            green_total (int): La somme des valeurs de vert des pixels voisins déjà considérés.
-            blue_total (int): La somme des valeurs de bleu des pixels voisins déjà considérés.
-            x (int): La coordonnée x du pixel central pour lequel on veut calculer la somme des couleurs de ses voisins.
-            y (int): La coordonnée y du pixel central pour lequel on veut calculer la somme des couleurs de ses voisins.
+            frame (Image): L'image.
+        """
+        self.im = frame.im
+        self._size = frame.size
+        self._mode = frame.mode
+        self.palette = frame.palette
+        self.info = frame.info
 
-        Returns:
-            tuple[int, int, int, int]: Un tuple contenant la somme des valeurs de rouge, vert et bleu des pixels voisins et le nombre total de pixels voisins considérés.
+    def seek(self, frame: int):
+        # PIL parcourt les images dans l'ordre puis revient à la première : les retours en arrière sont ignorés
+        while self.m_frame_index < frame:
+            self.__setFrame(next(self.m_frame_iterator))
+            self.m_frame_index += 1
+
+    def tell(self) -> int:
+        return self.m_frame_index
+
+
+class ResultCache():
+
+    def __init__(self, max_bytes: int = 256 * 2**20, cache_dir: str = None):
         """
-        width, height = enhance_picture.size
-        if not (x < 0 or y < 0 or x > width-1 or y > height-1):
-            r, g, b = enhance_picture.getpixel((x, y))
-            red_total += r
-            green_total += g
-            blue_total += b
-            nb_pixel += 1
-        return red_total, green_total, blue_total, nb_pixel
+        Cache des images produites, indexé par le contenu de l'image d'origine, la méthode et ses paramètres.
+        Les images récentes sont gardées en mémoire dans la limite de max_bytes octets, les moins récemment
+        utilisées étant évincées en premier ; avec cache_dir, chaque image est aussi enregistrée sur le
+        disque, où elle reste disponible après une éviction ou d'un processus à l'autre.
 
-    def __totalPixelColorEnhance(self, enhance_picture: Image, x, y) -> tuple[int, int, int, int]:
+        Args:
+            max_bytes (int, optionnel): La taille maximale des images gardées en mémoire, en octets.
+                Defaults to 256 Mio.
+            cache_dir (str, optionnel): Le dossier du cache sur le disque. Par défaut, pas de cache disque.
         """
-        Retourne un tuple contenant la somme des valeurs de rouge, de vert, de bleu et du nombre de pixels pour les pixels voisins.
+        self.m_max_bytes = max_bytes
+        self.m_cache_dir = cache_dir
+        self.m_entry_dict = OrderedDict()
+        self.m_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
 
-        :param enhance_picture: Une instance de la classe Image représentant l'image.
-        :type enhance_picture: Image
-        :param x: La position x du pixel.
-        :type x: int
-        :param y: La position y du pixel.
-        :type y: int
-        :return: Un tuple contenant la somme des valeurs de rouge, de vert, de bleu et du nombre de pixels.
-        :rtype: tuple[int, int, int, int]
-        """
-        red_total, green_total, blue_total, px_blur = 0, 0, 0, 0
-        if not self.__even(x) and self.__even(y):
-            red_total, green_total, blue_total, px_blur = self.__totalPixelColorEnhanceInner(
-                enhance_picture, px_blur, red_total, green_total, blue_total, x-1, y)
-            red_total, green_total, blue_total, px_blur = self.__totalPixelColorEnhanceInner(
-                enhance_picture, px_blur, red_total, green_total, blue_total, x+1, y)
-        if not self.__even(y) and self.__even(x):
-            red_total, green_total, blue_total, px_blur = self.__totalPixelColorEnhanceInner(
-                enhance_picture, px_blur, red_total, green_total, blue_total, x, y-1)
-            red_total, green_total, blue_total, px_blur = self.__totalPixelColorEnhanceInner(
-                enhance_picture, px_blur, red_total, green_total, blue_total, x, y+1)
-        elif not self.__even(x) and not self.__even(y):
-            red_total, green_total, blue_total, px_blur = self.__totalPixelColorEnhanceInner(
-                enhance_picture, px_blur, red_total, green_total, blue_total, x-1, y-1)
-            red_total, green_total, blue_total, px_blur = self.__totalPixelColorEnhanceInner(
-                enhance_picture, px_blur, red_total, green_total, blue_total, x-1, y+1)
-            red_total, green_total, blue_total, px_blur = self.__totalPixelColorEnhanceInner(
-                enhance_picture, px_blur, red_total, green_total, blue_total, x+1, y-1)
-            red_total, green_total, blue_total, px_blur = self.__totalPixelColorEnhanceInner(
-                enhance_picture, px_blur, red_total, green_total, blue_total, x+1, y+1)
-        return red_total, green_total, blue_total, px_blur
-
-    def __averagePixelColorEnhance(self, red_total, green_total, blue_total, nb_pixel) -> tuple[int, int, int]:
+    @staticmethod
+    def getPictureDigest(picture) -> str:
         """
-        Calcule la couleur moyenne d'un ensemble de pixels.
+        Calcule l'empreinte du contenu d'une image : son mode, sa taille, ses pixels et, pour les images à
+        palette, la palette et la couleur transparente.
 
         Args:
-            red_total (int): somme des valeurs de rouge des pixels
-            green_total (int): somme des valeurs de vert des pixels
-            blue_total (int): somme des valeurs de bleu des pixels
-            nb_pixel (int): nombre de pixels dans l'ensemble
+            picture: Une image PIL ou un tableau NumPy (hauteur, largeur, composantes).
 
         Returns:
-            tuple[int, int, int]: la couleur moyenne sous forme de tuple (rouge, vert, bleu)
+            str: L'empreinte, en hexadécimal.
         """
-        nb_pixel = nb_pixel // 2
-        if nb_pixel > 0:
-            r = red_total//nb_pixel
-            g = green_total//nb_pixel
-            b = blue_total//nb_pixel
-            return r, g, b
-        return 0, 0, 0
+        digest = hashlib.blake2b(digest_size=20)
+        if isinstance(picture, Image.Image):
+            digest.update(f"{picture.mode} {picture.size}".encode())
+            digest.update(picture.tobytes())
+            if picture.mode in ('P', 'PA'):
+                digest.update(f"{picture.getpalette()} {picture.info.get('transparency')}".encode())
+        else:
+            digest.update(f"{picture.dtype} {picture.shape}".encode())
+            digest.update(np.ascontiguousarray(picture).data)
+        return digest.hexdigest()
 
-    def drawEnhancePicture(self) -> Image:
+    @staticmethod
+    def getKey(picture_digest: str, method: str, argument: dict) -> str:
         """
-        Crée une nouvelle image améliorée en appliquant une technique de flou.
-        Cette technique consiste à prendre quatre pixels voisins et à remplacer le pixel central par une couleur moyenne pondérée.
+        Calcule la clé d'une image produite.
+
+        Args:
+            picture_digest (str): L'empreinte de l'image d'origine, renvoyée par getPictureDigest.
+            method (str): La méthode : une clé de PixelMaster.METHOD_DICT.
+            argument (dict): Les paramètres de la méthode, par exemple {'division_nb': 4}. Les masques
+                (tableaux NumPy ou images PIL), dont repr ne montre qu'une partie, sont remplacés par leur
+                empreinte.
+
+        Returns:
+            str: La clé, en hexadécimal.
+        """
+        argument = {name: ResultCache.getPictureDigest(value)
+                    if isinstance(value, Image.Image) or (np is not None and isinstance(value, np.ndarray))
+                    else value for name, value in argument.items()}
+        description = repr((picture_digest, method, sorted(argument.items())))
+        return hashlib.blake2b(description.encode(), digest_size=20).hexdigest()
+
+    def __getPath(self, key: str) -> str:
+        """
+        Renvoie le chemin du fichier d'une clé dans le cache disque.
+
+        Args:
+            key (str): La clé.
+
+        Returns:
+            str: Le chemin du fichier.
+        """
+        return os.path.join(self.m_cache_dir, key[:2], key + '.png')
+
+    def __keep(self, key: str, picture: Image):
+        """
+        Garde une image en mémoire, en évinçant les images les moins récemment utilisées si nécessaire.
+
+        Args:
+            key (str): La clé de l'image.
+            picture (Image): L'image.
+        """
+        size = picture.width * picture.height * len(picture.getbands())
+        if size > self.m_max_bytes:
+            return
+        if key in self.m_entry_dict:
+            self.m_bytes -= self.m_entry_dict.pop(key)[1]
+        self.m_entry_dict[key] = (picture, size)
+        self.m_bytes += size
+        while self.m_bytes > self.m_max_bytes:
+            self.m_bytes -= self.m_entry_dict.popitem(last=False)[1][1]
+            self.evictions += 1
+
+    def get(self, key: str) -> Image:
+        """
+        Cherche une image en mémoire, puis sur le disque.
+
+        Args:
+            key (str): La clé de l'image, renvoyée par getKey.
+
+        Returns:
+            Image: Une copie de l'image, ou None si elle n'est pas dans le cache.
+        """
+        if key in self.m_entry_dict:
+            self.m_entry_dict.move_to_end(key)
+            self.hits += 1
+            return self.m_entry_dict[key][0].copy()
+        if self.m_cache_dir is not None and os.path.exists(self.__getPath(key)):
+            with Image.open(self.__getPath(key)) as picture:
+                picture.load()
+            self.__keep(key, picture)
+            self.hits += 1
+            self.disk_hits += 1
+            return picture.copy()
+        self.misses += 1
+        return None
+
+    def put(self, key: str, picture: Image):
+        """
+        Ajoute une image au cache.
+
+        Args:
+            key (str): La clé de l'image, renvoyée par getKey.
+            picture (Image): L'image. Une copie est gardée : l'image peut ensuite être modifiée.
+        """
+        self.__keep(key, picture.copy())
+        if self.m_cache_dir is not None:
+            path = self.__getPath(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Écriture dans un fichier temporaire puis renommage, pour qu'un autre processus ne lise jamais
+            # un fichier incomplet
+            temporary_path = f"{path}.{os.getpid()}.tmp"
+            picture.save(temporary_path, 'PNG')
+            os.replace(temporary_path, path)
+
+    def clear(self):
+        """
+        Vide le cache en mémoire. Le cache disque et les compteurs sont conservés.
+        """
+        self.m_entry_dict.clear()
+        self.m_bytes = 0
+
+    def getStats(self) -> dict:
+        """
+        Renvoie les compteurs du cache, pour le dimensionner.
+
+        Returns:
+            dict: Les nombres de succès (dont ceux trouvés sur le disque), d'échecs et d'évictions, ainsi que
+            le nombre d'images et d'octets gardés en mémoire.
+        """
+        return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses,
+                'evictions': self.evictions, 'entries': len(self.m_entry_dict), 'bytes': self.m_bytes}
+
+
+class RenderStats():
+
+    def __init__(self, history: int = 100):
+        """
+        Cumule les rapports d'instrumentation de PixelMaster : elle s'utilise comme fonction instrument et
+        garde les totaux par méthode ainsi que les derniers rapports reçus.
+
+        Args:
+            history (int, optionnel): Le nombre de rapports gardés. Defaults to 100.
+        """
+        self.m_report_list = deque(maxlen=history)
+        self.m_total_dict = {}
+
+    def __call__(self, report: dict):
+        """
+        Ajoute le rapport d'un appel d'une méthode draw.
+
+        Args:
+            report (dict): Le rapport, voir PixelMaster.
+        """
+        self.m_report_list.append(report)
+        total = self.m_total_dict.setdefault(report['method'], {
+            'calls': 0, 'duration': 0.0, 'stages': {}, 'pixels_read': 0, 'pixels_written': 0, 'cells': 0})
+        total['calls'] += 1
+        total['duration'] += report['duration']
+        for stage, duration in report['stages'].items():
+            total['stages'][stage] = total['stages'].get(stage, 0.0) + duration
+        for counter in ('pixels_read', 'pixels_written', 'cells'):
+            total[counter] += report[counter]
+
+    @property
+    def reports(self) -> list:
+        """
+        Renvoie les derniers rapports reçus, du plus ancien au plus récent.
+
+        Returns:
+            list: Les rapports.
+        """
+        return list(self.m_report_list)
+
+    def getSummary(self) -> dict:
+        """
+        Renvoie les totaux de chaque méthode : nombre d'appels, durée, durée de chaque étape et compteurs.
+
+        Returns:
+            dict: Les totaux, par méthode.
+        """
+        return {method: dict(total, stages=dict(total['stages'])) for method, total in self.m_total_dict.items()}
+
+
+def _drawMethod(method: str):
+    """
+    Décore une méthode draw de PixelMaster pour qu'elle consulte le cache de l'instance, s'il y en a un,
+    avant de calculer l'image, et qu'elle envoie le rapport de l'appel à l'instrumentation, si elle est
+    activée. Sans cache ni instrumentation, la méthode est appelée directement.
+
+    Args:
+        method (str): La méthode : une clé de PixelMaster.METHOD_DICT.
+
+    Returns:
+        Le décorateur.
+    """
+    def decorator(function):
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper(self, *args, **kwargs):
+            if self.m_cache is None and self.m_instrument is None:
+                return function(self, *args, **kwargs)
+            argument = signature.bind(self, *args, **kwargs)
+            argument.apply_defaults()
+            argument = dict(argument.arguments)
+            # Le nombre de processus ne change pas l'image produite
+            del argument['self']
+            argument.pop('workers', None)
+            report = None
+            if self.m_instrument is not None:
+                report = {'method': method, 'argument': argument, 'backend': self.m_backend, 'cache': None,
+                          'grid_cache': None, 'stages': {}, 'pixels_read': 0, 'pixels_written': 0, 'cells': 0}
+                self.m_report = report
+                self.m_stage_stack = []
+                self.m_counted_grid = set()
+                start = time.perf_counter()
+            try:
+                picture, key = None, None
+                if self.m_cache is not None:
+                    if self.m_picture_digest is None:
+                        self.m_picture_digest = ResultCache.getPictureDigest(
+                            self.m_picture if self.m_picture is not None else self.m_picture_array)
+                    key = ResultCache.getKey(self.m_picture_digest, method, argument)
+                    picture = self.m_cache.get(key)
+                    if report is not None:
+                        report['cache'] = 'miss' if picture is None else 'hit'
+                if picture is None:
+                    picture = function(self, *args, **kwargs)
+                    if key is not None:
+                        self.m_cache.put(key, picture)
+                    # Les moteurs vectorisés peignent chaque pixel une fois ; les autres comptent leurs putpixel
+                    if report is not None and self.m_backend == 'numpy':
+                        report['pixels_written'] = picture.width * picture.height
+            finally:
+                self.m_report = None
+            if report is not None:
+                report['duration'] = time.perf_counter() - start
+                report['stages']['other'] = max(report['duration'] - sum(report['stages'].values()), 0.0)
+                self.m_instrument(report)
+            return picture
+        return wrapper
+    return decorator
+
+
+def _getIntervalList(index_array) -> list:
+    """
+    Regroupe des positions triées en suites de positions consécutives.
+
+    Args:
+        index_array (numpy.ndarray): Les positions, triées et sans doublon.
+
+    Returns:
+        list: Les intervalles (début, fin) de chaque suite, fin exclue.
+    """
+    if len(index_array) == 0:
+        return []
+    break_index = np.flatnonzero(np.diff(index_array) != 1) + 1
+    start_array = index_array[np.concatenate(([0], break_index))]
+    end_array = index_array[np.concatenate((break_index - 1, [len(index_array) - 1]))] + 1
+    return [(int(start), int(end)) for start, end in zip(start_array, end_array)]
+
+
+def _mergeBoxList(box_list: list) -> list:
+    """
+    Fusionne des zones (gauche, haut, droite, bas) : d'abord celles d'une même bande de lignes qui se
+    touchent ou se chevauchent, puis celles des mêmes colonnes qui se touchent. Les zones restantes peuvent
+    encore se chevaucher, mais chaque pixel à calculer en fait partie.
+
+    Args:
+        box_list (list): Les zones.
+
+    Returns:
+        list: Les zones fusionnées.
+    """
+    row_list = []
+    for box in sorted(set(box_list), key=lambda box: (box[1], box[3], box[0])):
+        last = row_list[-1] if row_list else None
+        if last is not None and last[1] == box[1] and last[3] == box[3] and box[0] <= last[2]:
+            row_list[-1] = (last[0], last[1], max(last[2], box[2]), last[3])
+        else:
+            row_list.append(box)
+    merged_list = []
+    for box in sorted(row_list, key=lambda box: (box[0], box[2], box[1])):
+        last = merged_list[-1] if merged_list else None
+        if last is not None and last[0] == box[0] and last[2] == box[2] and box[1] <= last[3]:
+            merged_list[-1] = (last[0], last[1], last[2], max(last[3], box[3]))
+        else:
+            merged_list.append(box)
+    return merged_list
+
+
+def _getBlockBoxList(mask_array, block_size: int, nb_color: int = 1) -> list:
+    """
+    Découpe un masque en zones alignées sur des blocs de block_size pixels de côté : les lignes de blocs
+    vides sont écartées d'un seul parcours, puis les blocs non vides de chaque ligne de blocs sont regroupés
+    en zones.
+
+    Args:
+        mask_array (numpy.ndarray): Le masque booléen (hauteur, largeur * nb_color).
+        block_size (int): Le côté des blocs, en pixels.
+        nb_color (int, optionnel): Le nombre de valeurs par pixel du masque. Defaults to 1.
+
+    Returns:
+        list: Les zones (gauche, haut, droite, bas) qui contiennent un pixel du masque.
+    """
+    height, width = mask_array.shape[0], mask_array.shape[1] // nb_color
+    block_array = np.logical_or.reduceat(mask_array, np.arange(0, height, block_size), axis=0)
+    block_row = np.flatnonzero(block_array.any(axis=1))
+    if len(block_row) == 0:
+        return []
+    block_array = np.logical_or.reduceat(
+        block_array[block_row], np.arange(0, width, block_size) * nb_color, axis=1)
+    box_list = []
+    for position, block_y in enumerate(block_row):
+        for block_start, block_end in _getIntervalList(np.flatnonzero(block_array[position])):
+            box_list.append((block_start * block_size, int(block_y) * block_size,
+                             min(block_end * block_size, width), min((int(block_y) + 1) * block_size, height)))
+    return _mergeBoxList(box_list)
+
+
+class _DraftIntegral():
+
+    def __init__(self, integral_array, scale: int, size: tuple, edge: tuple = None):
+        """
+        Image intégrale d'une image décodée à résolution réduite, lue aux positions de l'image entière, pour
+        PixelMaster._renderDraft. Chaque pixel réduit est réparti uniformément sur les scale x scale pixels
+        qu'il représente (moins sur le dernier bloc de chaque axe) : la somme jusqu'à une position est
+        interpolée entre les sommes de l'image réduite. Seules les lectures par np.ix_ de
+        __getSectionAverage sont prises en charge. Avec edge, les sections de la dernière colonne et de la
+        dernière ligne de la grille, trop étroites pour l'image réduite, sont sommées sur les pixels de l'image
+        entière lus par readEdge.
+
+        Args:
+            integral_array (numpy.ndarray): L'image intégrale (hauteur + 1, largeur + 1, composantes) des
+                sommes des blocs de l'image entière que représentent les pixels réduits, dont la première
+                ligne et la première colonne sont nulles.
+            scale (int): Le facteur de réduction.
+            size (tuple): La largeur et la hauteur de l'image entière.
+            edge (tuple, optionnel): La première colonne lue par la dernière section de l'axe x, les pixels
+                de l'image entière à partir de cette colonne, puis de même pour la dernière ligne. Par
+                défaut, toutes les sections sont lues dans l'image réduite.
+        """
+        self.m_integral_array = integral_array
+        self.m_scale = scale
+        self.m_size = size
+        self.m_edge = edge
+
+    def readEdge(self, row, column):
+        """
+        Lit des pixels de l'image entière dans les colonnes lues par la dernière section de l'axe x ou dans
+        les lignes lues par la dernière section de l'axe y.
+
+        Args:
+            row (numpy.ndarray): Les lignes à lire.
+            column (numpy.ndarray): Les colonnes à lire.
+
+        Returns:
+            numpy.ndarray: Un tableau (lignes, colonnes, composantes).
+        """
+        x_edge, right_array, y_edge, bottom_array = self.m_edge
+        if row.min() >= y_edge:
+            return bottom_array[np.ix_(row - y_edge, column)]
+        return right_array[np.ix_(row, column - x_edge)]
+
+    def __getPosition(self, index, size: int, reduced_size: int) -> tuple:
+        """
+        Convertit des positions de l'axe étendu de __getGridIndex en positions de l'image réduite.
+
+        Args:
+            index (numpy.ndarray): Les positions sur l'axe étendu.
+            size (int): La taille de l'image entière sur cet axe.
+            reduced_size (int): La taille de l'image réduite sur cet axe.
+
+        Returns:
+            tuple: Le pixel réduit de chaque position et la fraction de ce pixel qui la précède.
+        """
+        # La position i de l'axe étendu suit le pixel i - 1 ; le pixel lu en plus par la première section
+        # est ignoré
+        position = np.clip(index - 1, 0, size)
+        pixel = np.minimum(position // self.m_scale, reduced_size - 1)
+        start = pixel * self.m_scale
+        extent = np.minimum(start + self.m_scale, size) - start
+        return pixel, ((position - start) / extent)[..., np.newaxis]
+
+    def __getitem__(self, index: tuple):
+        row, column = index
+        reduced_height, reduced_width = self.m_integral_array.shape[0] - 1, self.m_integral_array.shape[1] - 1
+        y, y_fraction = self.__getPosition(row, self.m_size[1], reduced_height)
+        x, x_fraction = self.__getPosition(column, self.m_size[0], reduced_width)
+        integral_array = self.m_integral_array
+        total_array = (integral_array[y, x] * (1 - y_fraction) * (1 - x_fraction)
+                       + integral_array[y + 1, x] * y_fraction * (1 - x_fraction)
+                       + integral_array[y, x + 1] * (1 - y_fraction) * x_fraction
+                       + integral_array[y + 1, x + 1] * y_fraction * x_fraction)
+        return total_array
+
+
+# Moteurs d'accès aux pixels, du plus rapide au plus lent
+BACKEND_DICT = {'numpy': None,
+                'pixelaccess': PixelAccessBackend,
+                'buffer': BufferBackend}
+
+
+class PixelMaster():
+
+    # Méthode draw de chaque effet
+    METHOD_DICT = {'square': 'drawSquarePicture',
+                   'triangle': 'drawTriangularPicture',
+                   'circle': 'drawCircularPicture',
+                   'blur': 'drawBlurredPicture',
+                   'enhance': 'drawEnhancePicture'}
+    # Octets de mémoire de travail par octet de l'image produite, approximativement, pour chaque effet
+    MEMORY_FACTOR = {'square': 16, 'triangle': 32, 'circle': 16, 'blur': 64, 'enhance': 8}
+    # Mode de l'image selon le type et le nombre de composantes d'un tableau NumPy
+    ARRAY_MODE = {('uint8', 1): 'L', ('uint8', 2): 'LA', ('uint8', 3): 'RGB', ('uint8', 4): 'RGBA',
+                  ('uint16', 1): 'I;16'}
+    # Mode dans lequel les pixels sont traités, pour les modes qui ne le sont pas directement : les images
+    # à deux niveaux en niveaux de gris, les couleurs indexées en RGB (RGBA avec une transparence). Les
+    # autres modes non listés dans ARRAY_MODE sont traités et rendus en RGB, ou en RGBA avec une couche alpha.
+    WORK_MODE = {'1': 'L', 'P': 'RGB', 'PA': 'RGBA'}
+    # Modes dont la dernière composante est l'alpha : les couleurs sont moyennées en proportion de l'alpha
+    ALPHA_MODE = ('LA', 'RGBA')
+    # Nombre de tuiles par processus lors d'un calcul en parallèle, pour équilibrer la charge
+    TILE_PER_WORKER = 4
+    # Côté des blocs, en pixels, dans lesquels un masque donné aux méthodes draw est découpé en zones
+    REGION_BLOCK_SIZE = 16
+    # Méthodes privées mesurées par l'instrumentation : étape et, pour les lectures, compteur de pixels
+    INSTRUMENTED_STAGE = {'__getPictureSeparation': ('separation', None),
+                          '__getMosaicGrid': ('grid', None),
+                          '__getGridIndex': ('grid', None),
+                          '__getIntegralArray': ('integral', None),
+                          '__getSectionAverage': ('accumulate', None),
+                          '__getTriangleAverage': ('accumulate', None),
+                          '__convolveDirect': ('accumulate', None),
+                          '__convolveSeparable': ('accumulate', None),
+                          '__convolveFFT': ('accumulate', None),
+                          '__enhanceArray': ('accumulate', None),
+                          '__totalPixelColor': ('accumulate', None),
+                          '__totalPixelColorEnhance': ('accumulate', None),
+                          '__paintSectionArray': ('paint', None),
+                          '__paintTriangularRegion': ('paint', None),
+                          '__paintCircularPicture': ('paint', None),
+                          '__readPictureArray': ('read', 'pixels_read'),
+                          '__readPictureRows': ('read', 'pixels_read')}
+
+    def __init__(self, picture: Image, backend: str = None, cache: ResultCache = None, instrument=None,
+                 size: tuple = None, mode: str = None):
+        """
+        Initialise une instance de PixelMaster avec l'image passée en argument.
+
+        Args:
+            picture (Image): une instance de la classe Image de la bibliothèque PIL, ou un tableau NumPy
+                (hauteur, largeur) ou (hauteur, largeur, composantes) d'octets (1 à 4 composantes) ou
+                d'entiers 16 bits (une composante), utilisé sans copie par le moteur 'numpy'. Les images
+                sont traitées dans leur mode, sans conversion en RGB, et les méthodes draw rendent des images
+                du même mode, voir WORK_MODE. Tout objet qui expose ses octets (bytearray, memoryview,
+                mmap...) est aussi accepté sans copie, avec size et mode, ou seul s'il décrit sa forme comme
+                un memoryview d'un tableau.
+            backend (str, optionnel): Le moteur d'accès aux pixels : 'numpy' (calculs vectorisés),
+                'pixelaccess' (Image.load()) ou 'buffer' (bytearray). Par défaut, le plus rapide disponible.
+            cache (ResultCache, optionnel): Le cache des images produites par les méthodes draw, qui peut être
+                partagé entre plusieurs instances. Par défaut, pas de cache.
+            instrument (optionnel): Une fonction instrument(report), par exemple un RenderStats, appelée après
+                chaque méthode draw avec son rapport : method, argument, backend, cache ('hit', 'miss' ou
+                None), grid_cache (de même pour la grille gardée par l'instance), duration, stages (durée
+                propre de chaque étape, en secondes : separation, grid, integral, accumulate, paint, read,
+                pixel_read, pixel_write et other), pixels_read, pixels_written et cells (le total des cellules
+                des grilles utilisées). Par défaut, aucune mesure n'est faite et rien n'est ajouté aux calculs.
+            size (tuple, optionnel): La largeur et la hauteur de l'image, pour un tampon d'octets.
+            mode (str, optionnel): Le mode de l'image, pour un tampon d'octets : une valeur de ARRAY_MODE. Par
+                défaut, un mode d'octets déduit de la taille du tampon.
+
+        Raises:
+            ValueError: Si le moteur demandé n'existe pas ou si le tableau ou le tampon n'est pas pris en
+                charge, voir ARRAY_MODE.
+            ImportError: Si le moteur 'numpy' est demandé, ou un tampon donné, alors que NumPy n'est pas
+                installé.
+        """
+        if backend is None:
+            backend = 'numpy' if np is not None else 'pixelaccess'
+        if backend not in BACKEND_DICT:
+            raise ValueError(f"Moteur d'accès aux pixels inconnu : {backend}")
+        if backend == 'numpy' and np is None:
+            raise ImportError("Le moteur 'numpy' nécessite NumPy")
+        self.m_picture_array = None
+        self.m_integral_array = None
+        # Grilles de __getMosaicGrid, par nombre de divisions et proportionnalité
+        self.m_grid_dict = {}
+        # Positions de chaque pixel dans la table des triangles, pour la dernière grille (__getTriangleIndex)
+        self.m_triangle_dict = {}
+        self.m_palette = None
+        if not isinstance(picture, Image.Image) and not (np is not None and isinstance(picture, np.ndarray)):
+            picture = self.__getBufferArray(picture, size, mode)
+        if np is not None and isinstance(picture, np.ndarray):
+            if picture.ndim == 2:
+                picture = picture[:, :, np.newaxis]
+            array_mode = None
+            if picture.ndim == 3:
+                array_mode = self.ARRAY_MODE.get((picture.dtype.name, picture.shape[2]))
+            if array_mode is None or not picture.dtype.isnative:
+                raise ValueError(f"Tableau non pris en charge : {picture.dtype} {picture.shape}")
+            self.m_picture_array = picture
+            self.m_size = (picture.shape[1], picture.shape[0])
+            self.m_mode = self.m_work_mode = array_mode
+            # Seuls les moteurs pixel par pixel ont besoin d'une image PIL
+            picture = None if backend == 'numpy' else Image.fromarray(
+                picture[:, :, 0] if picture.shape[2] == 1 else picture)
+        else:
+            self.m_size = picture.size
+            self.m_mode = picture.mode
+            self.m_work_mode = self.__getWorkMode(picture)
+            if picture.mode in ('P', 'PA'):
+                # Une image d'un pixel garde la palette, sur laquelle les images produites sont ramenées
+                self.m_palette = Image.new('P', (1, 1))
+                self.m_palette.putpalette(picture.getpalette())
+        self.m_dtype = None if np is None else np.dtype(np.uint16 if self.m_work_mode == 'I;16' else np.uint8)
+        self.m_picture = picture
+        self.m_backend = backend
+        self.m_reader = None
+        if backend != 'numpy':
+            self.m_reader = BACKEND_DICT[backend](self.__toWorkMode(picture))
+        self.m_cache = cache
+        self.m_picture_digest = None
+        # Vrai dès que updatePicture a remplacé les pixels donnés à la construction par une copie
+        self.m_updated = False
+        self.m_instrument = instrument
+        self.m_report = None
+        self.m_stage_stack = []
+        # Grilles dont les cellules sont déjà comptées dans le rapport en cours
+        self.m_counted_grid = set()
+        if instrument is not None:
+            self.__installInstrumentation()
+        # Lecture des pixels additionnés par les boucles pixel par pixel
+        self.m_read_pixel = None if self.m_reader is None else self.__getWeightedReader(self.m_reader.getpixel)
+
+    def __getBufferArray(self, buffer, size: tuple, mode: str):
+        """
+        Présente un tampon d'octets comme un tableau NumPy, sans copie.
+
+        Args:
+            buffer: L'objet qui expose ses octets (bytearray, memoryview, mmap...).
+            size (tuple): La largeur et la hauteur de l'image, ou None si le tampon décrit sa forme.
+            mode (str): Le mode de l'image, ou None pour le déduire de la taille du tampon.
+
+        Returns:
+            numpy.ndarray: Un tableau qui partage la mémoire du tampon.
+
+        Raises:
+            ValueError: Si la taille du tampon ne correspond pas à size et mode, ou si le mode n'est pas pris
+                en charge.
+            ImportError: Si NumPy n'est pas installé.
+        """
+        if np is None:
+            raise ImportError("Les tampons d'octets nécessitent NumPy")
+        if size is None:
+            # Un tampon qui décrit sa forme, par exemple le memoryview d'un tableau
+            return np.asarray(memoryview(buffer))
+        width, height = size
+        if mode is None:
+            band_nb, remainder = divmod(memoryview(buffer).nbytes, width * height)
+            mode = self.ARRAY_MODE.get(('uint8', band_nb)) if remainder == 0 else None
+            if mode is None:
+                raise ValueError(f"Tampon de {memoryview(buffer).nbytes} octets non pris en charge pour {size}")
+        if mode not in self.ARRAY_MODE.values():
+            raise ValueError(f"Mode non pris en charge pour un tampon : {mode}")
+        dtype = np.dtype(np.uint16 if mode == 'I;16' else np.uint8)
+        band_nb = Image.getmodebands(mode)
+        if memoryview(buffer).nbytes != width * height * band_nb * dtype.itemsize:
+            raise ValueError(f"Tampon de {memoryview(buffer).nbytes} octets non pris en charge pour {size} {mode}")
+        return np.frombuffer(buffer, dtype=dtype).reshape(height, width, band_nb)
+
+    def __getWorkMode(self, picture: Image) -> str:
+        """
+        Renvoie le mode dans lequel les pixels d'une image sont traités.
+
+        Args:
+            picture (Image): L'image.
+
+        Returns:
+            str: Le mode de l'image s'il est traité directement, sinon celui de WORK_MODE, RGB ou RGBA.
+        """
+        if picture.mode in self.ARRAY_MODE.values():
+            return picture.mode
+        if picture.mode == 'P' and 'transparency' in picture.info:
+            return 'RGBA'
+        if picture.mode in self.WORK_MODE:
+            return self.WORK_MODE[picture.mode]
+        return 'RGBA' if 'A' in picture.getbands() else 'RGB'
+
+    def __toWorkMode(self, picture: Image) -> Image:
+        """
+        Convertit une image, ou une partie de l'image d'origine, dans le mode de travail.
+
+        Args:
+            picture (Image): L'image.
+
+        Returns:
+            Image: L'image elle-même si elle est déjà dans le mode de travail, sinon une copie convertie.
+        """
+        if picture.mode == self.m_work_mode:
+            return picture
+        return picture.convert(self.m_work_mode)
+
+    def __toSourceMode(self, picture: Image) -> Image:
+        """
+        Ramène une image produite dans le mode de travail au mode de l'image d'origine : les couleurs
+        indexées sont ramenées sur la palette d'origine, sans tramage, les pixels presque transparents
+        prenant la couleur transparente, et les images à deux niveaux sont seuillées à mi-hauteur.
+
+        Args:
+            picture (Image): L'image produite.
+
+        Returns:
+            Image: L'image dans le mode de l'image d'origine, ou dans le mode de travail pour les modes qui
+            ne sont pas traités directement.
+        """
+        if self.m_mode == self.m_work_mode:
+            return picture
+        if self.m_mode == '1':
+            return picture.convert('1', dither=Image.Dither.NONE)
+        if self.m_palette is None:
+            return picture
+        indexed_picture = picture.convert('RGB').quantize(palette=self.m_palette, dither=Image.Dither.NONE)
+        if self.m_mode == 'PA':
+            return Image.merge('PA', (indexed_picture, picture.getchannel('A')))
+        transparency = self.m_picture.info.get('transparency')
+        if transparency is not None:
+            if isinstance(transparency, int):
+                transparent_index = transparency
+            else:
+                transparent_index = min(range(len(transparency)), key=transparency.__getitem__)
+            transparent_mask = picture.getchannel('A').point(lambda alpha: 255 if alpha < 128 else 0)
+            indexed_picture.paste(transparent_index, mask=transparent_mask)
+            indexed_picture.info['transparency'] = transparency
+        return indexed_picture
+
+    def __toPicture(self, pixelated_array) -> Image:
+        """
+        Construit l'image produite à partir de ses pixels, dans le mode de l'image d'origine.
+
+        Args:
+            pixelated_array (numpy.ndarray): Les pixels (hauteur, largeur, composantes) dans le mode de travail.
+
+        Returns:
+            Image: L'image.
+        """
+        if pixelated_array.shape[2] == 1:
+            pixelated_array = pixelated_array[:, :, 0]
+        return self.__toSourceMode(Image.fromarray(pixelated_array))
+
+    def __getBackground(self, background) -> tuple:
+        """
+        Convertit une couleur de fond dans le mode de travail. Une couleur qui a le nombre de composantes de
+        ce mode est gardée telle quelle ; une valeur de gris ou une couleur RGB ou RGBA est convertie comme
+        le fait PIL (opaque pour les modes avec alpha, sur 16 bits pour 'I;16').
+
+        Args:
+            background: La couleur : un entier ou un tuple de 1 à 4 composantes.
+
+        Returns:
+            tuple: La couleur, une valeur par composante du mode de travail.
+
+        Raises:
+            ValueError: Si la couleur n'a pas entre 1 et 4 composantes.
+        """
+        if isinstance(background, int):
+            background = (background,)
+        background = tuple(background)
+        if len(background) == Image.getmodebands(self.m_work_mode):
+            return background
+        color_mode = {1: 'L', 2: 'LA', 3: 'RGB', 4: 'RGBA'}.get(len(background))
+        if color_mode is None:
+            raise ValueError(f"Couleur non prise en charge : {background}")
+        color_picture = Image.new(color_mode, (1, 1), background)
+        if self.m_work_mode == 'I;16':
+            return (color_picture.convert('L').getpixel((0, 0)) * 257,)
+        color = color_picture.convert(self.m_work_mode).getpixel((0, 0))
+        return color if isinstance(color, tuple) else (color,)
+
+    def __getWeightedReader(self, getpixel):
+        """
+        Renvoie la fonction qui lit les pixels à additionner dans les boucles pixel par pixel : pour les modes
+        avec alpha, chaque couleur est multipliée par l'alpha, qui est gardé en dernière composante.
+
+        Args:
+            getpixel: La fonction getpixel d'un moteur d'accès aux pixels.
+
+        Returns:
+            La fonction getpixel elle-même pour les modes sans alpha, sinon une fonction qui renvoie le pixel
+            pondéré.
+        """
+        if self.m_work_mode not in self.ALPHA_MODE:
+            return getpixel
+
+        def readPixel(xy: tuple) -> tuple:
+            *color, alpha = getpixel(xy)
+            return tuple(value * alpha for value in color) + (alpha,)
+        return readPixel
+
+    def __newCanvas(self, size: tuple, color: tuple = 0):
+        """
+        Crée une nouvelle image, dans le mode de travail, à peindre pixel par pixel avec le moteur d'accès
+        aux pixels choisi.
+
+        Args:
+            size (tuple): La largeur et la hauteur de l'image.
+            color (tuple, optionnel): La couleur de fond de l'image. Par défaut, toutes les composantes à 0.
+
+        Returns:
+            L'image à peindre, avec des méthodes getpixel, putpixel et toPicture.
+        """
+        canvas = BACKEND_DICT[self.m_backend](Image.new(self.m_work_mode, size, color))
+        if self.m_instrument is not None:
+            canvas.getpixel = self.__getInstrumentedCall(canvas.getpixel, 'pixel_read', 'pixels_read')
+            canvas.putpixel = self.__getInstrumentedCall(canvas.putpixel, 'pixel_write', 'pixels_written')
+        return canvas
+
+    def __getInstrumentedCall(self, function, stage: str, counter: str = None):
+        """
+        Enveloppe une fonction pour que l'instrumentation mesure sa durée propre, c'est-à-dire sans celle des
+        autres fonctions mesurées qu'elle appelle, et compte les pixels qu'elle lit ou écrit.
+
+        Args:
+            function: La fonction.
+            stage (str): L'étape à laquelle ajouter sa durée.
+            counter (str, optionnel): Le compteur de pixels : augmenté de 1 par appel pour getpixel et
+                putpixel, du nombre de pixels renvoyés pour les autres fonctions.
+
+        Returns:
+            La fonction enveloppée, qui n'ajoute qu'un test tant qu'aucun appel n'est mesuré.
+        """
+        def wrapper(*args, **kwargs):
+            report = self.m_report
+            if report is None:
+                return function(*args, **kwargs)
+            stage_stack = self.m_stage_stack
+            stage_stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                child_duration = stage_stack.pop()
+                report['stages'][stage] = report['stages'].get(stage, 0.0) + duration - child_duration
+                if stage_stack:
+                    stage_stack[-1] += duration
+            if counter is not None:
+                report[counter] += 1 if stage.startswith('pixel_') else result.shape[0] * result.shape[1]
+            if stage == 'separation':
+                self.__countCells(result)
+            return result
+        return wrapper
+
+    def __installInstrumentation(self):
+        """
+        Remplace, pour cette instance seulement, les méthodes privées de INSTRUMENTED_STAGE et les accès aux
+        pixels de l'image d'origine par leurs versions mesurées. Les instances sans instrumentation gardent
+        les méthodes de la classe.
+        """
+        for name, (stage, counter) in self.INSTRUMENTED_STAGE.items():
+            attribute = '_PixelMaster' + name
+            setattr(self, attribute, self.__getInstrumentedCall(getattr(self, attribute), stage, counter))
+        if self.m_reader is not None:
+            self.m_reader.getpixel = self.__getInstrumentedCall(
+                self.m_reader.getpixel, 'pixel_read', 'pixels_read')
+
+    def __countCells(self, separation: tuple):
+        """
+        Ajoute les cellules d'une grille au rapport de l'instrumentation, une seule fois par grille : les
+        zones d'un même calcul relisent la même grille.
+
+        Args:
+            separation (tuple): Le résultat de __getPictureSeparation.
+        """
+        if self.m_report is None:
+            return
+        width_list, height_list = separation[:2]
+        grid_key = (len(width_list), len(height_list), tuple(width_list[:2]), tuple(height_list[:2]))
+        if grid_key not in self.m_counted_grid:
+            self.m_counted_grid.add(grid_key)
+            self.m_report['cells'] += len(width_list) // 2 * (len(height_list) // 2)
+
+    def __countPixel(self, pixel_nb: int):
+        """
+        Ajoute des pixels lus directement dans le tableau de l'image au rapport de l'instrumentation.
+
+        Args:
+            pixel_nb (int): Le nombre de pixels lus.
+        """
+        if self.m_report is not None:
+            self.m_report['pixels_read'] += pixel_nb
+
+    def __getPictureSeparation(self, division_nb: int, proportional: bool = True) -> tuple[list, list, int, int]:
+        """
+        Divise l'image en sections carrées de taille égale, en fonction du nombre de divisions souhaitées et
+        renvoie les coordonnées de chaque section ainsi que la largeur et la hauteur de l'image.
+
+        Args:
+            division_nb (int): Le nombre de sections carrées souhaitées pour diviser l'image.
+            proportional (bool, optionnel): Si True, divise l'image de manière proportionnelle. Si False, divise
+                l'image de sorte que la taille des sections soit la même quelle que soit la direction.
+                Defaults to True.
+
+        Returns:
+            tuple[list, list, int, int]: Un tuple contenant deux listes d'entiers, représentant les coordonnées
+            x et y de chaque section de l'image, ainsi que la largeur et la hauteur de l'image.
+        """
+        width, height = self.m_size
+        if proportional:
+            nb_pixel_width = width//division_nb
+            nb_pixel_height = height//division_nb
+        else:
+            if width <= height:
+                nb_pixel_width, nb_pixel_height = width//division_nb, width//division_nb
+            else:
+                nb_pixel_width, nb_pixel_height = height//division_nb, height//division_nb
+        width_list = []
+        height_list = []
+
+        width_index = 0
+        while width >= nb_pixel_width * (width_index + 1):
+            width_list.append(nb_pixel_width * width_index)
+            width_list.append(nb_pixel_width*(width_index+1)-1)
+            width_index += 1
+        height_index = 0
+        while height >= nb_pixel_height * (height_index + 1):
+            height_list.append(nb_pixel_height * height_index)
+            height_list.append(nb_pixel_height*(height_index+1)-1)
+            height_index += 1
+        if proportional:
+            if width_list[-1] < width:
+                width_list.append(nb_pixel_width*width_index)
+                width_list.append(width)
+            if height_list[-1] < height:
+                height_list.append(nb_pixel_height*height_index)
+                height_list.append(height)
+
+        return width_list, height_list, width, height
+
+    def __getGridIndex(self, bound_list: list, size: int) -> tuple:
+        """
+        Convertit une liste de bornes renvoyée par __getPictureSeparation en index exploitables par NumPy
+        pour un axe de l'image.
+
+        Les boucles historiques parcourent chaque section de start - 1 à end - 1 : la première section lit
+        donc la dernière ligne (ou colonne) de l'image. On travaille sur un axe "étendu" où l'index i
+        correspond au pixel (i - 1) % size, ce qui rend chaque section contiguë.
+
+        Args:
+            bound_list (list): La liste des bornes (début, fin) de chaque section sur l'axe.
+            size (int): La taille de l'image sur cet axe.
+
+        Returns:
+            tuple: Un tuple contenant les index de la source pour l'axe étendu, le début et la longueur de
+            chaque section sur l'axe étendu, la section qui peint en dernier chaque pixel (-1 si aucune
+            section ne le peint) et la position de chaque pixel dans cette section.
+        """
+        start_array = np.asarray(bound_list[0::2], dtype=np.intp)
+        length_array = np.asarray(bound_list[1::2], dtype=np.intp) - start_array + 1
+        extended_size = int(start_array[-1] + length_array[-1])
+        source_index = (np.arange(extended_size) - 1) % size
+        section_index = np.repeat(np.arange(len(start_array)), length_array)
+        # La dernière section peinte l'emporte : l'index étendu 0 (pixel size - 1) est écrasé par
+        # l'index étendu size lorsqu'il existe
+        section_offset = np.arange(extended_size) - start_array[section_index]
+        owner = np.full(size, -1, dtype=np.intp)
+        owner_offset = np.zeros(size, dtype=np.intp)
+        owner[source_index[0]] = section_index[0]
+        owner_offset[source_index[0]] = section_offset[0]
+        owner[source_index[1:]] = section_index[1:]
+        owner_offset[source_index[1:]] = section_offset[1:]
+        return source_index, start_array, length_array, owner, owner_offset
+
+    def __getPictureArray(self):
+        """
+        Renvoie les pixels de l'image sous forme de tableau NumPy. Le tableau est construit au premier appel
+        puis conservé pour les appels suivants.
+
+        Returns:
+            numpy.ndarray: Un tableau de forme (hauteur, largeur, composantes), dans le mode de travail.
+        """
+        if self.m_picture_array is None:
+            picture_array = np.asarray(self.__toWorkMode(self.m_picture))
+            if picture_array.ndim == 2:
+                picture_array = picture_array[:, :, np.newaxis]
+            self.m_picture_array = picture_array
+        return self.m_picture_array
+
+    def __getWeightedArray(self, picture_array):
+        """
+        Prépare des pixels pour les sommes : pour les modes avec alpha, chaque couleur est multipliée par
+        l'alpha, qui est gardé en dernière composante, pour que les pixels transparents ne colorent pas les
+        moyennes.
+
+        Args:
+            picture_array (numpy.ndarray): Les pixels (..., composantes).
+
+        Returns:
+            numpy.ndarray: Les pixels eux-mêmes pour les modes sans alpha, sinon les pixels pondérés.
+        """
+        if self.m_work_mode not in self.ALPHA_MODE:
+            return picture_array
+        alpha_array = picture_array[..., -1:].astype(np.uint16)
+        weighted_array = picture_array.astype(np.uint16)
+        weighted_array[..., :-1] *= alpha_array
+        return weighted_array
+
+    def __getAverageArray(self, total_array, nb_pixel_array):
+        """
+        Calcule des moyennes à partir de sommes de pixels préparés par __getWeightedArray. Pour les modes
+        avec alpha, les couleurs sont divisées par la somme des alphas (0 si elle est nulle) et l'alpha par le
+        nombre de pixels.
+
+        Args:
+            total_array (numpy.ndarray): Les sommes entières (..., composantes).
+            nb_pixel_array (numpy.ndarray): Les nombres de pixels, de forme (..., 1) ou compatible.
+
+        Returns:
+            numpy.ndarray: Les moyennes (..., composantes), arrondies à l'entier inférieur.
+        """
+        if self.m_work_mode not in self.ALPHA_MODE:
+            return total_array // nb_pixel_array
+        divisor_array = np.broadcast_to(nb_pixel_array, total_array.shape).astype(total_array.dtype)
+        divisor_array[..., :-1] = total_array[..., -1:]
+        average_array = np.zeros_like(total_array)
+        np.floor_divide(total_array, divisor_array, out=average_array, where=divisor_array > 0)
+        return average_array
+
+    def __getIntegralArray(self):
+        """
+        Renvoie l'image intégrale (table des sommes cumulées) de chaque composante de l'image, calculée sur
+        l'axe étendu décrit par __getGridIndex. Elle est construite au premier appel puis conservée : la somme
+        de n'importe quelle section rectangulaire coûte ensuite quatre lectures, quel que soit division_nb.
+
+        Returns:
+            numpy.ndarray: Un tableau de forme (hauteur + 2, largeur + 2, composantes) dont la première ligne
+            et la première colonne sont nulles.
+        """
+        if self.m_integral_array is None:
+            picture_array = self.__getWeightedArray(self.__getPictureArray())
+            height, width = picture_array.shape[:2]
+            # Des entiers 32 bits sans signe, quelle que soit la taille de l'image : les sommes qui débordent
+            # sont gardées modulo 2**32, et la différence des quatre coins d'une section reste exacte tant que
+            # la somme de la section tient sur 32 bits, voir __fitsIntegral
+            integral_array = np.empty(
+                (height + 2, width + 2) + picture_array.shape[2:], dtype=np.uint32)
+            integral_array[0] = 0
+            integral_array[1:, 0] = 0
+            # L'axe étendu est recopié par tranches : la dernière ligne et la dernière colonne de l'image
+            # viennent avant la première, puis les sommes sont cumulées sur place
+            integral_array[1, 1] = picture_array[-1, -1]
+            integral_array[1, 2:] = picture_array[-1]
+            integral_array[2:, 1] = picture_array[:, -1]
+            integral_array[2:, 2:] = picture_array
+            np.cumsum(integral_array[1:, 1:], axis=0, dtype=np.uint32,
+                      out=integral_array[1:, 1:])
+            np.cumsum(integral_array[1:, 1:], axis=1, dtype=np.uint32,
+                      out=integral_array[1:, 1:])
+            self.m_integral_array = integral_array
+            self.__countPixel(width * height)
+        return self.m_integral_array
+
+    def __fitsIntegral(self, pixel_nb: int) -> bool:
+        """
+        Indique si la somme de pixel_nb pixels se lit exactement dans l'image intégrale, dont les sommes sont
+        gardées modulo 2**32 : la plus grande somme possible doit tenir sur 32 bits. L'image intégrale en
+        nombres flottants d'une image réduite (_DraftIntegral) convient toujours.
+
+        Args:
+            pixel_nb (int): Le nombre de pixels de la plus grande zone lue.
+
+        Returns:
+            bool: True si la somme est exacte.
+        """
+        if isinstance(self.m_integral_array, _DraftIntegral):
+            return True
+        # Les couleurs pondérées par l'alpha atteignent 255 * 255
+        max_value = 255 * 255 if self.m_work_mode in self.ALPHA_MODE else int(np.iinfo(self.m_dtype).max)
+        return pixel_nb * max_value <= np.iinfo(np.uint32).max
+
+    def __getMosaicGrid(self, division_nb: int, proportional: bool = True) -> tuple:
+        """
+        Calcule la grille d'une image pixelisée. Elle ne dépend que de la taille de l'image : elle est gardée
+        pour les appels suivants, par exemple pour chaque zone d'un même calcul.
+
+        Args:
+            division_nb (int): Le nombre de divisions de l'image.
+            proportional (bool, optionnel): Transmis à __getPictureSeparation. Defaults to True.
+
+        Returns:
+            tuple: Un tuple contenant le résultat de __getPictureSeparation et celui de __getGridIndex pour
+            l'axe x puis pour l'axe y.
+        """
+        grid = self.m_grid_dict.get((division_nb, proportional))
+        report = self.m_report
+        if report is not None and report['grid_cache'] != 'miss':
+            report['grid_cache'] = 'miss' if grid is None else 'hit'
+        if grid is None:
+            separation = self.__getPictureSeparation(division_nb, proportional)
+            width_list, height_list, width, height = separation
+            grid = separation, self.__getGridIndex(width_list, width), self.__getGridIndex(height_list, height)
+            self.m_grid_dict[(division_nb, proportional)] = grid
+        # Une grille gardée ne repasse pas par __getPictureSeparation, qui compte les cellules
+        self.__countCells(grid[0])
+        return grid
+
+    def __getSectionIndex(self, grid: tuple, section) -> tuple:
+        """
+        Renvoie les pixels de la source lus par un ensemble de sections d'un axe, mis bout à bout.
+
+        Args:
+            grid (tuple): Le résultat de __getGridIndex pour l'axe.
+            section (numpy.ndarray): Les numéros des sections.
+
+        Returns:
+            tuple: Un tuple contenant les index des pixels de la source et la position du début de chaque
+            section dans ces index.
+        """
+        source_index, start_array, length_array = grid[:3]
+        length = length_array[section]
+        local_start = np.concatenate(([0], np.cumsum(length)[:-1])).astype(np.intp)
+        extended_index = np.arange(length.sum()) + np.repeat(start_array[section] - local_start, length)
+        return source_index[extended_index], local_start
+
+    def __getRegionSection(self, owner, section_nb: int) -> tuple:
+        """
+        Renvoie les sections qui peignent une partie d'un axe, et la position de chacune parmi elles.
+
+        Args:
+            owner (numpy.ndarray): La section qui peint chaque pixel de la partie (-1 si aucune).
+            section_nb (int): Le nombre de sections de l'axe.
+
+        Returns:
+            tuple: Un tuple contenant les numéros des sections et, pour chaque pixel de la partie, la position
+            de sa section parmi elles (len(section) si aucune section ne le peint).
+        """
+        section = np.unique(owner[owner >= 0])
+        lookup = np.full(section_nb + 1, len(section), dtype=np.intp)
+        lookup[section] = np.arange(len(section))
+        return section, lookup[owner]
+
+    def __getSectionAverage(self, x_grid: tuple, y_grid: tuple, x_section=None, y_section=None, reader=None):
+        """
+        Calcule la couleur moyenne de sections de l'image, à partir de l'image intégrale ou, si reader est
+        donné, en lisant seulement les pixels de ces sections.
+
+        Args:
+            x_grid (tuple): Le résultat de __getGridIndex pour l'axe x.
+            y_grid (tuple): Le résultat de __getGridIndex pour l'axe y.
+            x_section (numpy.ndarray, optionnel): Les sections voulues sur l'axe x. Par défaut, toutes.
+            y_section (numpy.ndarray, optionnel): Les sections voulues sur l'axe y. Par défaut, toutes.
+            reader (optionnel): Une fonction reader(row, column) qui renvoie les pixels de la source aux
+                lignes et colonnes demandées. Par défaut, l'image intégrale est utilisée.
+
+        Returns:
+            numpy.ndarray: Un tableau (sections en y, sections en x, composantes) des couleurs moyennes.
+        """
+        if x_section is None:
+            x_section = np.arange(len(x_grid[1]))
+        if y_section is None:
+            y_section = np.arange(len(y_grid[1]))
+        if len(x_section) == 0 or len(y_section) == 0:
+            # Une zone sans section, par exemple le fond au-delà des derniers cercles
+            return np.zeros((len(y_section), len(x_section), Image.getmodebands(self.m_work_mode)), dtype=np.int64)
+        x_start, x_length = x_grid[1][x_section], x_grid[2][x_section]
+        y_start, y_length = y_grid[1][y_section], y_grid[2][y_section]
+        if reader is None and not self.__fitsIntegral(int(x_length.max()) * int(y_length.max())):
+            # Des sections trop grandes pour l'image intégrale sont sommées sur leurs pixels
+            reader = self.__readPictureArray
+        if reader is None:
+            integral_array = self.__getIntegralArray()
+            x_end = x_start + x_length
+            y_end = y_start + y_length
+            total_array = (integral_array[np.ix_(y_end, x_end)]
+                           - integral_array[np.ix_(y_start, x_end)]
+                           - integral_array[np.ix_(y_end, x_start)]
+                           + integral_array[np.ix_(y_start, x_start)]).astype(np.int64)
+            if isinstance(integral_array, _DraftIntegral) and integral_array.m_edge is not None:
+                # Les sections de la dernière colonne et de la dernière ligne sont lues à pleine résolution
+                x_edge = np.flatnonzero(x_section == len(x_grid[1]) - 1)
+                y_edge = np.flatnonzero(y_section == len(y_grid[1]) - 1)
+                if len(x_edge):
+                    total_array[:, x_edge] = self.__getSectionTotal(
+                        x_grid, y_grid, x_section[x_edge], y_section, integral_array.readEdge)
+                if len(y_edge):
+                    total_array[y_edge] = self.__getSectionTotal(
+                        x_grid, y_grid, x_section, y_section[y_edge], integral_array.readEdge)
+        else:
+            total_array = self.__getSectionTotal(x_grid, y_grid, x_section, y_section, reader)
+        nb_pixel_array = np.outer(y_length, x_length)[:, :, np.newaxis]
+        return self.__getAverageArray(total_array, nb_pixel_array)
+
+    def __getSectionTotal(self, x_grid: tuple, y_grid: tuple, x_section, y_section, reader):
+        """
+        Calcule la somme des pixels de chaque section en ne lisant que les pixels des sections.
+
+        Args:
+            x_grid (tuple): Le résultat de __getGridIndex pour l'axe x.
+            y_grid (tuple): Le résultat de __getGridIndex pour l'axe y.
+            x_section (numpy.ndarray): Les sections voulues sur l'axe x.
+            y_section (numpy.ndarray): Les sections voulues sur l'axe y.
+            reader: Une fonction reader(row, column) qui renvoie les pixels de la source aux lignes et colonnes
+                demandées.
+
+        Returns:
+            numpy.ndarray: Un tableau (sections en y, sections en x, composantes) des sommes.
+        """
+        row, y_local_start = self.__getSectionIndex(y_grid, y_section)
+        column, x_local_start = self.__getSectionIndex(x_grid, x_section)
+        total_array = np.add.reduceat(
+            self.__getWeightedArray(reader(row, column)), y_local_start, axis=0, dtype=np.int64)
+        return np.add.reduceat(total_array, x_local_start, axis=1)
+
+    def __totalPixelColor(self, total: tuple, nb_pixel: int, x: int, y: int, coef: int = 1, a: int = 0, b: int = 0, c: int = 0, d: int = 0) -> tuple[tuple, int]:
+        """
+        Calcule la somme des valeurs de chaque composante de tous les pixels dans une zone donnée.
+
+        Args:
+            total (tuple): La somme actuelle des valeurs de chaque composante de tous les pixels dans la zone,
+                les couleurs étant pondérées par l'alpha pour les modes avec alpha.
+            nb_pixel (int): Le nombre actuel de pixels dans la zone.
+            x (int): La coordonnée x du pixel courant dans la zone.
+            y (int): La coordonnée y du pixel courant dans la zone.
+            coef (int, optional): Le coefficient de zoom appliqué à la zone. Par défaut, 1.
+            a (int, optional): La coordonnée de début en x de la zone de zoom. Par défaut, 0.
+            b (int, optional): La coordonnée de fin en x de la zone de zoom. Par défaut, 0.
+            c (int, optional): La coordonnée de début en y de la zone de zoom. Par défaut, 0.
+            d (int, optional): La coordonnée de fin en y de la zone de zoom. Par défaut, 0.
+
+        Returns:
+            tuple[tuple, int]: Un tuple contenant la nouvelle somme des valeurs de chaque composante et le
+            nouveau nombre de pixels dans la zone.
+
+        Raises:
+            None
+        """
+        if a <= b and c <= d:
+            pixel = self.m_read_pixel((x, y))
+            total = tuple(value_total + value*coef for value_total, value in zip(total, pixel))
+            if coef == 1:
+                nb_pixel += 1
+            else:
+                nb_pixel += 1 + coef
+        return total, nb_pixel
+
+    def __averagePixelColor(self, total: tuple, nb_pixel: int) -> tuple:
+        """
+        Calcule la couleur moyenne d'un ensemble de pixels. Pour les modes avec alpha, les couleurs sont
+        pondérées par l'alpha : elles sont divisées par la somme des alphas, l'alpha par le nombre de pixels.
+
+        Args:
+            total (tuple): somme de chaque composante de chaque pixel
+            nb_pixel (int): nombre total de pixels considérés
+
+        Returns:
+            tuple: un tuple contenant la valeur moyenne de chaque composante.
+
+        Raises:
+            Aucune exception n'est levée.
+        """
+        if nb_pixel == 0:
+            return (0,) * len(total)
+        if self.m_work_mode in self.ALPHA_MODE:
+            alpha_total = total[-1]
+            return tuple(value_total // alpha_total if alpha_total else 0
+                         for value_total in total[:-1]) + (alpha_total // nb_pixel,)
+        return tuple(value_total // nb_pixel for value_total in total)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def __getTriangleMask(x_length: int, y_length: int) -> tuple:
+        """
+        Construit, pour une forme de section donnée, l'appartenance de chaque pixel aux triangles haut, gauche,
+        droit et bas, avec exactement les mêmes comparaisons que drawTriangularPicture. Le résultat est mis
+        en cache : la plupart des sections ont la même forme.
+
+        Args:
+            x_length (int): La largeur de la section sur l'axe étendu.
+            y_length (int): La hauteur de la section sur l'axe étendu.
+
+        Returns:
+            tuple: Un tuple contenant un tableau (4, y_length * x_length) indiquant si chaque pixel est
+            compté dans chacun des triangles, le nombre de pixels de chaque triangle et un tableau
+            (y_length, x_length) du triangle qui peint chaque pixel (0 haut, 1 gauche, 2 droit, 3 bas).
+        """
+        if y_length > 1:
+            ratio = (x_length - 1) / (y_length - 1)
+        else:
+            ratio = 1
+        left_gap = np.arange(-1, x_length - 1)[np.newaxis, :]
+        right_gap = np.arange(x_length, 0, -1)[np.newaxis, :]
+        height_gap = (np.arange(-1, y_length - 1) * ratio)[:, np.newaxis]
+        triangle_t = (height_gap <= left_gap) & (height_gap <= right_gap)
+        triangle_l = (left_gap <= height_gap) & (height_gap <= right_gap)
+        triangle_r = (height_gap <= left_gap) & (right_gap <= height_gap)
+        triangle_d = (left_gap <= height_gap) & (right_gap <= height_gap)
+        triangle_mask = np.stack(
+            (triangle_t, triangle_l, triangle_r, triangle_d)).reshape(4, -1)
+        triangle_label = np.select(
+            (triangle_t, triangle_l, triangle_r), (0, 1, 2), 3).astype(np.intp)
+        return triangle_mask.astype(np.float64), triangle_mask.sum(axis=1), triangle_label
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def __getTriangleInterval(x_length: int, y_length: int) -> tuple:
+        """
+        Décrit les triangles de __getTriangleMask ligne par ligne : sur chaque ligne de la section, chaque
+        triangle couvre des pixels consécutifs, dont la somme se lit dans l'image intégrale.
+
+        Args:
+            x_length (int): La largeur de la section sur l'axe étendu.
+            y_length (int): La hauteur de la section sur l'axe étendu.
+
+        Returns:
+            tuple: Deux tableaux (4, y_length) : la première colonne de chaque triangle sur chaque ligne et la
+            colonne qui suit la dernière, égales si le triangle n'a aucun pixel sur la ligne.
+        """
+        triangle_mask = PixelMaster.__getTriangleMask(x_length, y_length)[0].reshape(4, y_length, x_length) > 0
+        has_pixel = triangle_mask.any(axis=2)
+        start_array = np.where(has_pixel, triangle_mask.argmax(axis=2), 0)
+        end_array = np.where(has_pixel, x_length - triangle_mask[:, :, ::-1].argmax(axis=2), 0)
+        return start_array, end_array
+
+    def __getTriangleAverage(self, x_grid: tuple, y_grid: tuple, x_section, y_section, reader=None,
+                             with_average: bool = False):
+        """
+        Calcule la couleur moyenne des quatre triangles de sections de l'image. Sans reader, la somme de
+        chaque triangle est celle de ses morceaux de lignes, lus dans l'image intégrale : elle est réutilisée
+        d'un nombre de divisions à l'autre. Avec reader, seuls les pixels des sections sont lus et leurs
+        sommes sont obtenues par un produit matriciel avec les masques de __getTriangleMask, une ligne de
+        sections à la fois. Avec with_average, la moyenne de chaque section est aussi calculée.
+
+        Args:
+            x_grid (tuple): Le résultat de __getGridIndex pour l'axe x.
+            y_grid (tuple): Le résultat de __getGridIndex pour l'axe y.
+            x_section (numpy.ndarray): Les sections voulues sur l'axe x.
+            y_section (numpy.ndarray): Les sections voulues sur l'axe y.
+            reader (optionnel): Une fonction reader(row, column) qui renvoie les pixels de la source. Par
+                défaut, l'image intégrale est utilisée.
+            with_average (bool, optionnel): Si True, renvoie aussi la moyenne de chaque section. Defaults to False.
+
+        Returns:
+            numpy.ndarray: Un tableau (sections en y + 1, sections en x + 1, 4, composantes) des couleurs des
+            triangles, dont la dernière ligne et la dernière colonne sont noires. Avec with_average, un tuple
+            contenant aussi un tableau (sections en y, sections en x, composantes) des moyennes des sections.
+        """
+        x_index, x_start, x_length = x_grid[:3]
+        y_index, y_start, y_length = y_grid[:3]
+        nb_color = Image.getmodebands(self.m_work_mode)
+        # La dernière ligne et la dernière colonne restent noires pour les pixels qu'aucune section ne peint
+        color_array = np.zeros(
+            (len(y_section) + 1, len(x_section) + 1, 4, nb_color), dtype=self.m_dtype)
+        section_average = np.zeros((len(y_section), len(x_section), nb_color), dtype=np.int64)
+        x_group = [(int(x_length_value), np.flatnonzero(x_length[x_section] == x_length_value))
+                   for x_length_value in np.unique(x_length[x_section])]
+        if reader is None and not self.__fitsIntegral(int(x_length.max())):
+            # Les morceaux de lignes trop longs pour l'image intégrale sont sommés sur leurs pixels
+            reader = self.__readPictureArray
+        if reader is None:
+            integral_array = self.__getIntegralArray()
+            y_group = [(int(y_length_value), np.flatnonzero(y_length[y_section] == y_length_value))
+                       for y_length_value in np.unique(y_length[y_section])]
+            for y_length_value, y_group_position in y_group:
+                for x_length_value, x_group_section in x_group:
+                    start_array, end_array = self.__getTriangleInterval(x_length_value, y_length_value)
+                    px_triangle = (end_array - start_array).sum(axis=1)
+                    group_start = x_start[x_section[x_group_section]][:, np.newaxis, np.newaxis]
+                    start_column, end_column = group_start + start_array, group_start + end_array
+                    # Par paquets de lignes de sections, pour limiter la mémoire
+                    chunk_size = max(1, 2**20 // start_column.size)
+                    for chunk_start in range(0, len(y_group_position), chunk_size):
+                        position = y_group_position[chunk_start:chunk_start + chunk_size]
+                        row = (y_start[y_section[position]][:, np.newaxis] + np.arange(y_length_value))
+                        row = row[:, np.newaxis, np.newaxis, :]
+                        # Somme de chaque morceau de ligne : différence des sommes de la ligne jusqu'à sa fin
+                        # et jusqu'à son début, exacte même si un calcul intermédiaire passe sous zéro dans
+                        # les entiers non signés de la table
+                        line_array = (integral_array[row + 1, end_column] - integral_array[row, end_column]
+                                      - integral_array[row + 1, start_column] + integral_array[row, start_column])
+                        color_array[position[:, np.newaxis], x_group_section[np.newaxis, :]] = self.__getAverageArray(
+                            line_array.sum(axis=3, dtype=np.int64), np.maximum(px_triangle, 1)[:, np.newaxis])
+            if with_average:
+                return color_array, self.__getSectionAverage(x_grid, y_grid, x_section, y_section)
+            return color_array
+        column, x_local_start = self.__getSectionIndex(x_grid, x_section)
+        # Accumulation, une ligne de sections à la fois pour limiter la mémoire
+        for position, index_y in enumerate(y_section):
+            y_length_value = int(y_length[index_y])
+            row_array = self.__getWeightedArray(reader(
+                y_index[y_start[index_y]:y_start[index_y] + y_length_value], column))
+            for x_length_value, x_group_section in x_group:
+                triangle_mask, px_triangle, triangle_label = self.__getTriangleMask(
+                    x_length_value, y_length_value)
+                if with_average:
+                    # Une cinquième ligne couvre toute la section
+                    triangle_mask = np.vstack((triangle_mask, np.ones(triangle_mask.shape[1])))
+                column_index = x_local_start[x_group_section][:, np.newaxis] + np.arange(x_length_value)
+                section_array = row_array[:, column_index].astype(np.float64)
+                section_array = section_array.transpose(1, 0, 2, 3).reshape(
+                    len(x_group_section), -1, nb_color)
+                total_array = np.matmul(triangle_mask, section_array).astype(np.int64)
+                color_array[position, x_group_section] = self.__getAverageArray(
+                    total_array[:, :4], np.maximum(px_triangle, 1)[:, np.newaxis])
+                if with_average:
+                    section_average[position, x_group_section] = self.__getAverageArray(
+                        total_array[:, 4], x_length_value * y_length_value)
+        if with_average:
+            return color_array, section_average
+        return color_array
+
+    def __getTriangleIndex(self, x_grid: tuple, y_grid: tuple, box: tuple, x_section, y_section, x_position,
+                           y_position):
+        """
+        Calcule, pour chaque pixel d'une zone, la position de la couleur du triangle qui le peint dans la
+        table renvoyée par __getTriangleAverage, mise à plat. Ces positions ne dépendent que de la grille.
+
+        Args:
+            x_grid (tuple): Le résultat de __getGridIndex pour l'axe x.
+            y_grid (tuple): Le résultat de __getGridIndex pour l'axe y.
+            box (tuple): La zone (gauche, haut, droite, bas) à peindre.
+            x_section (numpy.ndarray): Les sections de la table sur l'axe x.
+            y_section (numpy.ndarray): Les sections de la table sur l'axe y.
+            x_position (numpy.ndarray): La position dans la table de la section de chaque colonne de la zone.
+            y_position (numpy.ndarray): La position dans la table de la section de chaque ligne de la zone.
+
+        Returns:
+            numpy.ndarray: Un tableau (hauteur, largeur) des positions dans la table mise à plat.
+        """
+        left, top, right, bottom = box
+        x_length, x_offset = x_grid[2], x_grid[4]
+        y_length, y_offset = y_grid[2], y_grid[4]
+        table_size = (len(y_section) + 1) * (len(x_section) + 1) * 4
+        dtype = np.int32 if table_size <= np.iinfo(np.int32).max else np.intp
+        index_array = (y_position[:, np.newaxis] * (len(x_section) + 1) + x_position[np.newaxis, :]) * 4
+        index_array = index_array.astype(dtype)
+        x_shape = np.append(x_length[x_section], 0)[x_position]
+        y_shape = np.append(y_length[y_section], 0)[y_position]
+        # Triangle de chaque pixel, par forme de section
+        for x_length_value in np.unique(x_shape[x_shape > 0]):
+            column = np.flatnonzero(x_shape == x_length_value)
+            for y_length_value in np.unique(y_shape[y_shape > 0]):
+                row = np.flatnonzero(y_shape == y_length_value)
+                triangle_label = self.__getTriangleMask(
+                    int(x_length_value), int(y_length_value))[2]
+                index_array[np.ix_(row, column)] += triangle_label[np.ix_(
+                    y_offset[top:bottom][row], x_offset[left:right][column])].astype(dtype)
+        return index_array
+
+    def __paintTriangularRegion(self, color_array, index_array):
+        """
+        Peint une zone de l'image pixelisée en forme de triangles, en lisant pour chaque pixel la couleur du
+        triangle qui le peint dans la table renvoyée par __getTriangleAverage.
+
+        Args:
+            color_array (numpy.ndarray): Les couleurs des triangles, renvoyées par __getTriangleAverage.
+            index_array (numpy.ndarray): Les positions renvoyées par __getTriangleIndex.
+
+        Returns:
+            numpy.ndarray: Les pixels de la zone.
+        """
+        return np.take(color_array.reshape(-1, color_array.shape[3]), index_array, axis=0)
+
+    def __renderTriangularRegion(self, division_nb: int, box: tuple = None, reader=None):
+        """
+        Version vectorisée de drawTriangularPicture, limitée à une zone de l'image : les quatre couleurs de
+        chaque section sont calculées par __getTriangleAverage, puis la zone est peinte en lisant une table
+        des couleurs de chaque section. Pour toute l'image, la position de chaque pixel dans cette table est
+        gardée pour les appels suivants avec le même nombre de divisions.
+
+        Args:
+            division_nb (int): Le nombre de divisions de l'image.
+            box (tuple, optionnel): La zone (gauche, haut, droite, bas) à calculer. Par défaut, toute l'image.
+            reader (optionnel): Une fonction reader(row, column) qui renvoie les pixels de la source. Par
+                défaut, l'image intégrale est utilisée.
+
+        Returns:
+            numpy.ndarray: Les pixels de la zone.
+        """
+        separation, x_grid, y_grid = self.__getMosaicGrid(division_nb)
+        picture_box = (0, 0, separation[2], separation[3])
+        box = box or picture_box
+        left, top, right, bottom = box
+        x_section, x_position = self.__getRegionSection(
+            x_grid[3][left:right], len(x_grid[1]))
+        y_section, y_position = self.__getRegionSection(
+            y_grid[3][top:bottom], len(y_grid[1]))
+        color_array = self.__getTriangleAverage(x_grid, y_grid, x_section, y_section, reader)
+        if box != picture_box:
+            index_array = self.__getTriangleIndex(
+                x_grid, y_grid, box, x_section, y_section, x_position, y_position)
+        else:
+            # Elles ont la taille de l'image : seules celles de la dernière grille sont gardées
+            index_array = self.m_triangle_dict.get(division_nb)
+            if index_array is None:
+                index_array = self.__getTriangleIndex(
+                    x_grid, y_grid, box, x_section, y_section, x_position, y_position)
+                self.m_triangle_dict = {division_nb: index_array}
+        return self.__paintTriangularRegion(color_array, index_array)
+
+    @_drawMethod('triangle')
+    def drawTriangularPicture(self, division_nb: int, workers: int = None, region=None) -> Image:
+        """
+        Génère une image pixelisée en forme de triangles.
+
+        Args:
+            division_nb (int): Le nombre de divisions de l'image.
+            workers (int, optionnel): Le nombre de processus qui calculent l'image en parallèle (moteur
+                'numpy'). Par défaut, un seul.
+            region (optionnel): Les zones à traiter : une liste de zones (gauche, haut, droite, bas) ou un
+                masque de la taille de l'image (tableau NumPy ou image PIL, non nul dans les zones), sur la
+                grille de toute l'image. Les autres pixels sont ceux de l'image d'origine. Par défaut, toute
+                l'image.
+
+        Returns:
+            Image: L'image pixelisée en forme de triangles.
+
+        Raises:
+            ValueError: Si workers est inférieur à 1, ou supérieur à 1 avec un autre moteur que 'numpy'.
+        """
+        if self.m_backend == 'numpy' or region is not None:
+            return self.__renderPicture('triangle', {'division_nb': division_nb}, workers, region)
+        self.__checkWorkers(workers)
+        width_list, height_list, width, height = self.__getPictureSeparation(
+            division_nb)
+        pixelated_picture = self.__newCanvas((width, height))
+        nb_color = Image.getmodebands(self.m_work_mode)
+        index_x = 0
+        for i in range(len(width_list)//2):
+            index_y = 0
+            for i in range(len(height_list)//2):
+                start_x = width_list[index_x]
+                start_y = height_list[index_y]
+                end_x = width_list[index_x+1]
+                end_y = height_list[index_y+1]
+                zero = (0,) * nb_color
+                total_t, px_triangle_t = zero, 0
+                total_l, px_triangle_l = zero, 0
+                total_r, px_triangle_r = zero, 0
+                total_d, px_triangle_d = zero, 0
+                if end_y - start_y != 0:
+                    ratio = (end_x - start_x) / (end_y - start_y)
+                else:
+                    ratio = 1
+                for x in range(start_x - 1, end_x):
+                    for y in range(start_y-1, end_y):
+                        total_t, px_triangle_t = self.__totalPixelColor(
+                            total_t, px_triangle_t, x, y, 1, (y-start_y)*ratio, (x-start_x), (y-start_y)*ratio, (end_x-x))
+                        total_l, px_triangle_l = self.__totalPixelColor(
+                            total_l, px_triangle_l, x, y, 1, (x-start_x), (y-start_y)*ratio, (y-start_y)*ratio, (end_x-x))
+                        total_r, px_triangle_r = self.__totalPixelColor(
+                            total_r, px_triangle_r, x, y, 1, (y-start_y)*ratio, (x-start_x), (end_x-x), (y-start_y)*ratio)
+                        total_d, px_triangle_d = self.__totalPixelColor(
+                            total_d, px_triangle_d, x, y, 1, (x-start_x), (y-start_y)*ratio, (end_x-x), (y-start_y)*ratio)
+
+                avg_t = self.__averagePixelColor(total_t, px_triangle_t)
+                avg_l = self.__averagePixelColor(total_l, px_triangle_l)
+                avg_r = self.__averagePixelColor(total_r, px_triangle_r)
+                avg_d = self.__averagePixelColor(total_d, px_triangle_d)
+
+                for x in range(start_x - 1, end_x):
+                    for y in range(start_y-1, end_y):
+                        if (x-start_x) >= (y-start_y)*ratio and (end_x-x) >= (y-start_y)*ratio:
+                            pixelated_picture.putpixel((x, y), avg_t)
+                        elif (x-start_x) <= (y-start_y)*ratio and (end_x-x) >= (y-start_y)*ratio:
+                            pixelated_picture.putpixel((x, y), avg_l)
+                        elif (x-start_x) >= (y-start_y)*ratio and (end_x-x) <= (y-start_y)*ratio:
+                            pixelated_picture.putpixel((x, y), avg_r)
+                        elif (x-start_x) <= (y-start_y)*ratio and (end_x-x) <= (y-start_y)*ratio:
+                            pixelated_picture.putpixel((x, y), avg_d)
+                index_y += 2
+            index_x += 2
+        return self.__toSourceMode(pixelated_picture.toPicture())
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def __getDiscMask(width_pixel: int, height_pix: int):
+        """
+        Trace une seule fois le cercle d'une section de taille donnée, avec exactement les mêmes points que
+        drawCircularPicture. Le résultat est mis en cache : toutes les sections ont la même taille.
+
+        Args:
+            width_pixel (int): La différence entre les coordonnées de fin et de début de la section en x.
+            height_pix (int): La différence entre les coordonnées de fin et de début de la section en y.
+
+        Returns:
+            numpy.ndarray: Un tableau booléen (height_pix + 1, width_pixel + 1) indiquant les pixels de la
+            section qui appartiennent au cercle.
+        """
+        disc_mask = np.zeros((height_pix + 1, width_pixel + 1), dtype=bool)
+        x_loc_zone = (width_pixel + 1) // 2
+        y_loc_zone = (height_pix + 1) // 2
+        # Chaque arc de rayon i (ligne) passe par les abscisses 0 <= x < i (colonnes) ; les hauteurs sont
+        # calculées avec les mêmes opérations flottantes que la boucle d'origine
+        arc_list = []
+        for loc_zone in (x_loc_zone, y_loc_zone):
+            radius, position = np.ogrid[1:loc_zone, 0:max(loc_zone - 1, 0)]
+            inside = position < radius
+            radius = np.broadcast_to(radius, inside.shape)[inside]
+            position = np.broadcast_to(position, inside.shape)[inside]
+            arc_list.append((position, (np.sqrt(1 - (position / radius)**2) * radius).astype(np.intp)))
+        (x_first, y_first), (y_second, x_second) = arc_list
+        x_array = np.concatenate((x_first, x_second))
+        y_array = np.concatenate((y_first, y_second))
+        for x_point in (x_loc_zone + x_array, x_loc_zone - x_array):
+            for y_point in (y_loc_zone + y_array, y_loc_zone - y_array):
+                # Pour une section carrée le cercle ne sort jamais de la section
+                inside = (0 <= x_point) & (x_point <= width_pixel) & (0 <= y_point) & (y_point <= height_pix)
+                disc_mask[y_point[inside], x_point[inside]] = True
+        return disc_mask
+
+    def __paintCircularPicture(self, separation: tuple, section_average, background: tuple):
+        """
+        Peint toute l'image circulaire à partir de la couleur moyenne de chaque section. Les composantes sont
+        regroupées avec les colonnes pour que chaque ligne soit un bloc contigu ; la grille est vue comme un
+        tableau (sections en y, pixels, sections en x, pixels) et les cercles sont peints en une seule
+        affectation à l'aide du masque de __getDiscMask.
+
+        Args:
+            separation (tuple): Le résultat de __getPictureSeparation sans proportionnalité.
+            section_average (numpy.ndarray): Les moyennes (sections en y, sections en x, composantes).
+            background (tuple): La couleur des pixels situés hors des cercles.
+
+        Returns:
+            numpy.ndarray: Les pixels de l'image.
+        """
+        width_list, height_list, width, height = separation
+        # Sans proportionnalité toutes les sections sont des carrés identiques accolés depuis (0, 0)
+        section_size = width_list[1] - width_list[0] + 1
+        disc_mask = self.__getDiscMask(section_size - 1, section_size - 1)
+        nb_color = section_average.shape[2]
+        pixelated_array = np.empty((height, width * nb_color), dtype=self.m_dtype)
+        pixelated_array[:] = np.tile(np.asarray(background, dtype=self.m_dtype), width)
+        nb_section_x = len(width_list) // 2
+        nb_section_y = len(height_list) // 2
+        grid_array = pixelated_array[:nb_section_y * section_size, :nb_section_x * section_size * nb_color].reshape(
+            nb_section_y, section_size, nb_section_x, section_size * nb_color)
+        section_color = np.tile(section_average.astype(self.m_dtype), (1, 1, section_size))
+        np.copyto(grid_array, section_color[:, np.newaxis, :, :],
+                  where=np.repeat(disc_mask, nb_color, axis=1)[np.newaxis, :, np.newaxis, :])
+        return pixelated_array.reshape(height, width, nb_color)
+
+    def __renderCircularRegion(self, division_nb: int, background: tuple = (0, 0, 0), box: tuple = None, reader=None):
+        """
+        Version vectorisée de drawCircularPicture, limitée à une zone de l'image : la moyenne de chaque
+        section est lue dans l'image intégrale (ou dans les pixels renvoyés par reader), puis les cercles
+        sont peints en une seule affectation à l'aide du masque de __getDiscMask répété sur la grille.
+
+        Args:
+            division_nb (int): Le nombre de divisions de l'image circulaire.
+            background (tuple, optionnel): La couleur des pixels situés hors des cercles. Defaults to (0, 0, 0).
+            box (tuple, optionnel): La zone (gauche, haut, droite, bas) à calculer. Par défaut, toute l'image.
+            reader (optionnel): Une fonction reader(row, column) qui renvoie les pixels de la source. Par
+                défaut, l'image intégrale est utilisée.
+
+        Returns:
+            numpy.ndarray: Les pixels de la zone.
+        """
+        background = self.__getBackground(background)
+        separation, x_grid, y_grid = self.__getMosaicGrid(division_nb, False)
+        if box is None and reader is None:
+            return self.__paintCircularPicture(
+                separation, self.__getSectionAverage(x_grid, y_grid), background)
+        width_list, height_list, width, height = separation
+        left, top, right, bottom = box or (0, 0, width, height)
+        # Sans proportionnalité toutes les sections sont des carrés identiques accolés depuis (0, 0)
+        section_size = width_list[1] - width_list[0] + 1
+        disc_mask = self.__getDiscMask(section_size - 1, section_size - 1)
+        # Section qui contient chaque pixel de la zone (-1 au-delà de la dernière section)
+        x_pixel = np.arange(left, right)
+        y_pixel = np.arange(top, bottom)
+        x_owner = np.where(x_pixel < len(width_list) // 2 * section_size, x_pixel // section_size, -1)
+        y_owner = np.where(y_pixel < len(height_list) // 2 * section_size, y_pixel // section_size, -1)
+        x_section, x_position = self.__getRegionSection(x_owner, len(width_list) // 2)
+        y_section, y_position = self.__getRegionSection(y_owner, len(height_list) // 2)
+        section_average = self.__getSectionAverage(
+            x_grid, y_grid, x_section, y_section, reader)
+        nb_color = section_average.shape[2]
+        average_array = np.empty(
+            (len(y_section) + 1, len(x_section) + 1, nb_color), dtype=self.m_dtype)
+        average_array[:] = background
+        average_array[:-1, :-1] = section_average
+        picture_mask = disc_mask[np.ix_(y_pixel % section_size, x_pixel % section_size)]
+        picture_mask &= (y_owner >= 0)[:, np.newaxis] & (x_owner >= 0)[np.newaxis, :]
+        pixelated_array = np.empty((bottom - top, right - left, nb_color), dtype=self.m_dtype)
+        pixelated_array[:] = background
+        section_color = average_array[y_position][:, x_position]
+        np.copyto(pixelated_array, section_color, where=picture_mask[:, :, np.newaxis])
+        return pixelated_array
+
+    @_drawMethod('circle')
+    def drawCircularPicture(self, division_nb: int, background: tuple = (0, 0, 0), workers: int = None,
+                            region=None) -> Image:
+        """
+        Dessine une image circulaire divisée en plusieurs sections, chaque section étant remplie avec la même couleur moyenne
+        de pixels.
+
+        Args:
+            division_nb (int): Le nombre de divisions de l'image circulaire. Plus la valeur est grande, plus l'image aura de 
+            sections.
+            background (tuple, optionnel): La couleur des pixels situés hors des cercles, convertie dans le
+                mode de l'image si elle n'a pas son nombre de composantes. Defaults to (0, 0, 0).
+            workers (int, optionnel): Le nombre de processus qui calculent l'image en parallèle (moteur
+                'numpy'). Par défaut, un seul.
+            region (optionnel): Les zones à traiter : une liste de zones (gauche, haut, droite, bas) ou un
+                masque de la taille de l'image (tableau NumPy ou image PIL, non nul dans les zones), sur la
+                grille de toute l'image. Les autres pixels sont ceux de l'image d'origine. Par défaut, toute
+                l'image.
+
+        Returns:
+            Image: L'image dessinée.
+
+        Raises:
+            ValueError: Si workers est inférieur à 1, ou supérieur à 1 avec un autre moteur que 'numpy'.
+
+        """
+        background = self.__getBackground(background)
+        if self.m_backend == 'numpy' or region is not None:
+            return self.__renderPicture(
+                'circle', {'division_nb': division_nb, 'background': background}, workers, region)
+        self.__checkWorkers(workers)
+        # Obtenir les coordonnées de séparation de chaque section de l'image
+        width_list, height_list, width, height = self.__getPictureSeparation(
+            division_nb, False)
+        # Créer une nouvelle image pixelisée avec la taille de l'image d'origine
+        pixelated_picture = self.__newCanvas((width, height), background)
+        nb_color = len(background)
+        index_x = 0
+        # Parcourir chaque section horizontale de l'image
+        for i in range(len(width_list)//2):
+            index_y = 0
+            # Parcourir chaque section verticale de l'image
+            for i in range(len(height_list)//2):
+                # Obtenir les coordonnées de début et de fin de la section actuelle
+                start_x = width_list[index_x]
+                start_y = height_list[index_y]
+                end_x = width_list[index_x+1]
+                end_y = height_list[index_y+1]
+                width_pixel = end_x - start_x
+                height_pix = end_y - start_y
+                x_loc_zone = (width_pixel + 1) // 2
+                y_loc_zone = (height_pix + 1) // 2
+                x_loc = start_x + x_loc_zone
+                y_loc = start_y + y_loc_zone
+                # Calculer la couleur moyenne de pixels de la section actuelle
+                total, px_circle = (0,) * nb_color, 0
+                for x in range(start_x - 1, end_x):
+                    for y in range(start_y-1, end_y):
+                        total, px_circle = self.__totalPixelColor(
+                            total, px_circle, x, y)
+                avg = self.__averagePixelColor(total, px_circle)
+                # Dessiner un cercle rempli de la couleur moyenne dans la section actuelle
+                for i_width in range(x_loc_zone):
+                    for x in range(i_width):
+                        # Calculer la position en y du pixel à dessiner en fonction de sa position en x
+                        if i_width > 0:
+                            y = int((math.sqrt(1-(x/i_width)**2))*i_width)
+                        else:
+                            y = 0
+                        # Dessiner les pixels dans les quatre quarts du cercle
+                        pixelated_picture.putpixel(
+                            (x+x_loc, y+y_loc), avg)
+                        pixelated_picture.putpixel(
+                            (x+x_loc, y_loc-y), avg)
+                        pixelated_picture.putpixel(
+                            (x_loc-x, y+y_loc), avg)
+                        pixelated_picture.putpixel(
+                            (x_loc-x, y_loc-y), avg)
+                for i_height in range(y_loc_zone):
+                    for y in range(i_height):
+                        # Calculer la position en x du prochain cercle en fonction de sa position en y
+                        if i_height > 0:
+                            x = int((math.sqrt(1-(y/i_height)**2))*i_height)
+                        else:
+                            x = 0
+                        pixelated_picture.putpixel(
+                            (x+x_loc, y+y_loc), avg)
+                        pixelated_picture.putpixel(
+                            (x+x_loc, y_loc-y), avg)
+                        pixelated_picture.putpixel(
+                            (x_loc-x, y+y_loc), avg)
+                        pixelated_picture.putpixel(
+                            (x_loc-x, y_loc-y), avg)
+                index_y += 2
+            index_x += 2
+        return self.__toSourceMode(pixelated_picture.toPicture())
+
+    def __paintSectionArray(self, average_array, x_position, y_position):
+        """
+        Peint une zone en donnant à chaque pixel la couleur de sa section. Les lignes d'une même ligne de
+        sections sont identiques : chacune n'est construite qu'une fois puis répétée, ce qui coûte bien
+        moins qu'une lecture indexée par pixel.
+
+        Args:
+            average_array (numpy.ndarray): Les couleurs (sections en y, sections en x, composantes).
+            x_position (numpy.ndarray): La section de chaque colonne de la zone dans average_array.
+            y_position (numpy.ndarray): La section de chaque ligne de la zone dans average_array.
+
+        Returns:
+            numpy.ndarray: Les pixels de la zone.
+        """
+        # Suites de lignes consécutives de la même section
+        run_start = np.flatnonzero(np.diff(y_position, prepend=y_position[0] - 1))
+        run_length = np.diff(np.append(run_start, len(y_position)))
+        row_array = average_array[y_position[run_start]][:, x_position]
+        return np.repeat(row_array, run_length, axis=0)
+
+    def __renderSquareRegion(self, division_nb: int, box: tuple = None, reader=None):
+        """
+        Version vectorisée de drawSquarePicture, limitée à une zone de l'image : la moyenne de chaque section
+        est lue dans l'image intégrale (ou dans les pixels renvoyés par reader) et la zone est construite en
+        une seule étape.
+
+        Args:
+            division_nb (int): Le nombre de divisions à effectuer sur l'image.
+            box (tuple, optionnel): La zone (gauche, haut, droite, bas) à calculer. Par défaut, toute l'image.
+            reader (optionnel): Une fonction reader(row, column) qui renvoie les pixels de la source. Par
+                défaut, l'image intégrale est utilisée.
+
+        Returns:
+            numpy.ndarray: Les pixels de la zone.
+        """
+        separation, x_grid, y_grid = self.__getMosaicGrid(division_nb)
+        left, top, right, bottom = box or (0, 0, separation[2], separation[3])
+        x_section, x_position = self.__getRegionSection(
+            x_grid[3][left:right], len(x_grid[1]))
+        y_section, y_position = self.__getRegionSection(
+            y_grid[3][top:bottom], len(y_grid[1]))
+        section_average = self.__getSectionAverage(
+            x_grid, y_grid, x_section, y_section, reader)
+        # Une ligne et une colonne noires supplémentaires pour les pixels qu'aucune section ne peint
+        average_array = np.zeros(
+            (section_average.shape[0] + 1, section_average.shape[1] + 1, section_average.shape[2]), dtype=self.m_dtype)
+        average_array[:-1, :-1] = section_average
+        return self.__paintSectionArray(average_array, x_position, y_position)
+
+    @_drawMethod('square')
+    def drawSquarePicture(self, division_nb: int, workers: int = None, region=None) -> Image:
+        """
+        Crée une nouvelle image en utilisant des carrés de pixels pour réduire la résolution de l'image.
+
+        Args:
+            division_nb (int): Le nombre de divisions à effectuer sur l'image.
+            workers (int, optionnel): Le nombre de processus qui calculent l'image en parallèle (moteur
+                'numpy'). Par défaut, un seul.
+            region (optionnel): Les zones à traiter : une liste de zones (gauche, haut, droite, bas) ou un
+                masque de la taille de l'image (tableau NumPy ou image PIL, non nul dans les zones), sur la
+                grille de toute l'image. Les autres pixels sont ceux de l'image d'origine. Par défaut, toute
+                l'image.
+
+        Returns:
+            Image: L'image réduite créée en utilisant des carrés de pixels.
+
+        Raises:
+            ValueError: Si workers est inférieur à 1, ou supérieur à 1 avec un autre moteur que 'numpy'.
+        """
+        if self.m_backend == 'numpy' or region is not None:
+            return self.__renderPicture('square', {'division_nb': division_nb}, workers, region)
+        self.__checkWorkers(workers)
+        width_list, height_list, width, height = self.__getPictureSeparation(
+            division_nb)
+        pixelated_picture = self.__newCanvas((width, height))
+        nb_color = Image.getmodebands(self.m_work_mode)
+        index_x = 0
+        for i in range(len(width_list)//2):
+            index_y = 0
+            for i in range(len(height_list)//2):
+                start_x = width_list[index_x]
+                start_y = height_list[index_y]
+                end_x = width_list[index_x+1]
+                end_y = height_list[index_y+1]
+                total, px_square = (0,) * nb_color, 0
+                for x in range(start_x - 1, end_x):
+                    for y in range(start_y-1, end_y):
+                        total, px_square = self.__totalPixelColor(
+                            total, px_square, x, y)
+                avg = self.__averagePixelColor(total, px_square)
+                for x in range(start_x - 1, end_x):
+                    for y in range(start_y-1, end_y):
+                        pixelated_picture.putpixel((x, y), avg)
+                index_y += 2
+            index_x += 2
+        return self.__toSourceMode(pixelated_picture.toPicture())
+
+    def drawMosaicPictures(self, division_nb: int, styles: tuple = ('square', 'triangle', 'circle'),
+                           proportional: bool = True, background: tuple = (0, 0, 0)) -> dict:
+        """
+        Dessine plusieurs images pixelisées de la même image en ne calculant qu'une fois les couleurs des
+        sections de chaque grille : un seul passage sur l'image d'origine par grille, puis une peinture
+        par style. Les carrés et les triangles utilisent la grille choisie par proportional, les cercles
+        toujours la grille de sections carrées de drawCircularPicture ; avec proportional=False les trois
+        styles partagent donc un seul passage.
+
+        Args:
+            division_nb (int): Le nombre de divisions de l'image.
+            styles (tuple, optionnel): Les styles voulus parmi 'square', 'triangle' et 'circle'. Par défaut,
+                les trois.
+            proportional (bool, optionnel): La grille des carrés et des triangles, voir
+                __getPictureSeparation. Defaults to True, comme drawSquarePicture et drawTriangularPicture.
+            background (tuple, optionnel): La couleur des pixels situés hors des cercles. Defaults to (0, 0, 0).
+
+        Returns:
+            dict: L'image de chaque style demandé, identique à celle de la méthode draw correspondante.
+
+        Raises:
+            ValueError: Si un style n'existe pas, ou si proportional vaut False avec un autre moteur que 'numpy'.
+        """
+        for style in styles:
+            if style not in ('square', 'triangle', 'circle'):
+                raise ValueError(f"Style inconnu : {style}")
+        if self.m_backend != 'numpy':
+            if not proportional:
+                raise ValueError("Une grille non proportionnelle nécessite le moteur 'numpy'")
+            argument_dict = {'square': (), 'triangle': (), 'circle': (background,)}
+            return {style: getattr(self, self.METHOD_DICT[style])(division_nb, *argument_dict[style])
+                    for style in styles}
+        # Les styles de chaque grille, avec la valeur de proportional qui la définit
+        grid_dict = {}
+        for style in styles:
+            grid_dict.setdefault(proportional and style != 'circle', []).append(style)
+        picture_dict = {}
+        for grid_proportional, grid_style in grid_dict.items():
+            separation, x_grid, y_grid = self.__getMosaicGrid(division_nb, grid_proportional)
+            x_section = np.arange(len(x_grid[1]))
+            y_section = np.arange(len(y_grid[1]))
+            if 'triangle' in grid_style:
+                # Les triangles demandent un passage sur les pixels, qui donne aussi les moyennes des sections
+                color_array, section_average = self.__getTriangleAverage(
+                    x_grid, y_grid, x_section, y_section, self.__readPictureArray, True)
+            else:
+                section_average = self.__getSectionAverage(x_grid, y_grid)
+            for style in grid_style:
+                if style == 'square':
+                    # Une ligne et une colonne noires pour les pixels qu'aucune section ne peint (section -1)
+                    average_array = np.zeros(
+                        (len(y_section) + 1, len(x_section) + 1, section_average.shape[2]), dtype=self.m_dtype)
+                    average_array[:-1, :-1] = section_average
+                    pixelated_array = self.__paintSectionArray(average_array, x_grid[3], y_grid[3])
+                elif style == 'triangle':
+                    index_array = self.__getTriangleIndex(
+                        x_grid, y_grid, (0, 0, separation[2], separation[3]), x_section, y_section,
+                        np.where(x_grid[3] >= 0, x_grid[3], len(x_section)),
+                        np.where(y_grid[3] >= 0, y_grid[3], len(y_section)))
+                    pixelated_array = self.__paintTriangularRegion(color_array, index_array)
+                else:
+                    pixelated_array = self.__paintCircularPicture(
+                        separation, section_average, self.__getBackground(background))
+                picture_dict[style] = self.__toPicture(pixelated_array)
+        return picture_dict
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def __getBlurKernel(blur_nb: int, kernel: str = 'cross') -> tuple:
+        """
+        Construit une seule fois la liste des pixels voisins pris en compte par le flou et leurs poids.
+
+        Args:
+            blur_nb (int): Le rayon du flou en pixels.
+            kernel (str, optionnel): La forme du noyau : 'cross' (la croix et l'arc de cercle historiques),
+                'box' (un carré uniforme) ou 'gaussian' (un carré pondéré par une gaussienne).
+                Defaults to 'cross'.
+
+        Returns:
+            tuple: Un tuple de quadruplets (décalage en x, décalage en y, poids de la couleur, poids dans le
+            nombre de pixels), dans l'ordre où les voisins sont additionnés.
+
+        Raises:
+            ValueError: Si le noyau demandé n'existe pas.
+        """
+        if kernel == 'cross':
+            kernel_list = []
+            for i in range(1, blur_nb+1):
+                kernel_list += [(-i, 0, 1, 1), (i, 0, 1, 1),
+                                (0, -i, 1, 1), (0, i, 1, 1)]
+            for x_ref in range(blur_nb):
+                y_ref = int((math.sqrt(1-(x_ref/blur_nb)**2))*blur_nb)
+                coef = (math.sqrt(x_ref**2+y_ref**2))
+                nb_pixel = 1 if coef == 1 else 1 + coef
+                kernel_list += [(-x_ref, -y_ref, coef, nb_pixel), (x_ref, y_ref, coef, nb_pixel),
+                                (x_ref, -y_ref, coef, nb_pixel), (-x_ref, y_ref, coef, nb_pixel)]
+            return tuple(kernel_list)
+        if kernel == 'box':
+            return tuple((x, y, 1, 1) for y in range(-blur_nb, blur_nb+1) for x in range(-blur_nb, blur_nb+1))
+        if kernel == 'gaussian':
+            sigma = max(blur_nb, 1) / 2
+            return tuple((x, y, math.exp(-(x**2+y**2)/(2*sigma**2)), math.exp(-(x**2+y**2)/(2*sigma**2)))
+                         for y in range(-blur_nb, blur_nb+1) for x in range(-blur_nb, blur_nb+1))
+        raise ValueError(f"Noyau de flou inconnu : {kernel}")
+
+    def __convolveDirect(self, picture_array, kernel_list: tuple) -> tuple:
+        """
+        Applique le noyau en additionnant l'image décalée pour chaque voisin, dans l'ordre du noyau.
+        Les opérations sont ainsi exactement celles de la boucle pixel par pixel.
+
+        Args:
+            picture_array (numpy.ndarray): Les pixels de l'image.
+            kernel_list (tuple): Le noyau renvoyé par __getBlurKernel.
+
+        Returns:
+            tuple: La somme pondérée des couleurs et le nombre pondéré de pixels pris en compte pour chaque pixel.
+        """
+        height, width = picture_array.shape[:2]
+        total_array = np.zeros(picture_array.shape, dtype=np.float64)
+        nb_pixel_array = np.zeros((height, width), dtype=np.float64)
+        for x, y, coef, nb_pixel in kernel_list:
+            if abs(x) >= width or abs(y) >= height:
+                continue
+            target = (slice(max(0, -y), min(height, height-y)),
+                      slice(max(0, -x), min(width, width-x)))
+            source = (slice(max(0, y), min(height, height+y)),
+                      slice(max(0, x), min(width, width+x)))
+            if coef == 1:
+                total_array[target] += picture_array[source]
+            else:
+                total_array[target] += picture_array[source] * coef
+            nb_pixel_array[target] += nb_pixel
+        return total_array, nb_pixel_array
+
+    def __convolveSeparable(self, picture_array, blur_nb: int, kernel: str) -> tuple:
+        """
+        Applique un noyau séparable ('box' ou 'gaussian') en deux passes à une dimension. Le noyau 'box' est
+        calculé par sommes glissantes, dont le coût par pixel ne dépend pas du rayon.
+
+        Args:
+            picture_array (numpy.ndarray): Les pixels de l'image.
+            blur_nb (int): Le rayon du flou en pixels.
+            kernel (str): 'box' ou 'gaussian'.
+
+        Returns:
+            tuple: La somme pondérée des couleurs et le nombre pondéré de pixels pris en compte pour chaque pixel.
+        """
+        if kernel == 'box':
+            line_kernel = None
+            total_array = picture_array.astype(np.int64)
+        else:
+            sigma = max(blur_nb, 1) / 2
+            line_kernel = np.exp(-np.arange(-blur_nb, blur_nb+1)**2 / (2*sigma**2))
+            total_array = picture_array.astype(np.float64)
+        nb_pixel_list = []
+        for axis in (0, 1):
+            size = total_array.shape[axis]
+            if line_kernel is None:
+                # Sommes glissantes sur une fenêtre de 2 * blur_nb + 1 pixels, bornée par l'image
+                cumulative_array = np.cumsum(total_array, axis=axis)
+                zero_shape = list(cumulative_array.shape)
+                zero_shape[axis] = 1
+                cumulative_array = np.concatenate(
+                    (np.zeros(zero_shape, dtype=cumulative_array.dtype), cumulative_array), axis=axis)
+                index = np.arange(size)
+                upper = np.minimum(index + blur_nb + 1, size)
+                lower = np.maximum(index - blur_nb, 0)
+                total_array = np.take(cumulative_array, upper, axis=axis) - \
+                    np.take(cumulative_array, lower, axis=axis)
+                nb_pixel_list.append((upper - lower).astype(np.float64))
+            else:
+                line_array = np.zeros(total_array.shape, dtype=np.float64)
+                nb_pixel_line = np.zeros(size, dtype=np.float64)
+                for shift in range(-min(blur_nb, size-1), min(blur_nb, size-1)+1):
+                    target = [slice(None)] * total_array.ndim
+                    source = [slice(None)] * total_array.ndim
+                    target[axis] = slice(max(0, -shift), min(size, size-shift))
+                    source[axis] = slice(max(0, shift), min(size, size+shift))
+                    line_array[tuple(target)] += total_array[tuple(source)] * line_kernel[shift+blur_nb]
+                    nb_pixel_line[target[axis]] += line_kernel[shift+blur_nb]
+                total_array = line_array
+                nb_pixel_list.append(nb_pixel_line)
+        return total_array, np.outer(nb_pixel_list[0], nb_pixel_list[1])
+
+    @staticmethod
+    def __getFastSize(length: int) -> int:
+        """
+        Renvoie la plus petite taille supérieure ou égale à length dont les seuls facteurs premiers sont 2, 3
+        et 5, pour laquelle la transformée de Fourier est la plus rapide.
+
+        Args:
+            length (int): La taille minimale.
+
+        Returns:
+            int: La taille à utiliser pour la transformée de Fourier.
+        """
+        while True:
+            rest = length
+            for factor in (2, 3, 5):
+                while rest % factor == 0:
+                    rest //= factor
+            if rest == 1:
+                return length
+            length += 1
+
+    def __convolveFFT(self, picture_array, kernel_list: tuple) -> tuple:
+        """
+        Applique le noyau par transformée de Fourier, dont le coût par pixel ne dépend pas du rayon.
+
+        Args:
+            picture_array (numpy.ndarray): Les pixels de l'image.
+            kernel_list (tuple): Le noyau renvoyé par __getBlurKernel.
+
+        Returns:
+            tuple: La somme pondérée des couleurs et le nombre pondéré de pixels pris en compte pour chaque pixel.
+        """
+        height, width = picture_array.shape[:2]
+        blur_nb = max(max(abs(x), abs(y)) for x, y, coef, nb_pixel in kernel_list)
+        size = 2 * blur_nb + 1
+        # Le noyau est retourné : la somme des voisins est une corrélation
+        coef_kernel = np.zeros((size, size))
+        nb_pixel_kernel = np.zeros((size, size))
+        for x, y, coef, nb_pixel in kernel_list:
+            coef_kernel[blur_nb - y, blur_nb - x] += coef
+            nb_pixel_kernel[blur_nb - y, blur_nb - x] += nb_pixel
+        shape = tuple(self.__getFastSize(length) for length in (height + size - 1, width + size - 1))
+        area = (slice(blur_nb, blur_nb + height), slice(blur_nb, blur_nb + width))
+        picture_spectrum = np.fft.rfft2(picture_array, shape, axes=(0, 1))
+        total_array = np.fft.irfft2(picture_spectrum * np.fft.rfft2(coef_kernel, shape)[:, :, np.newaxis],
+                                    shape, axes=(0, 1))[area]
+        nb_pixel_array = np.fft.irfft2(np.fft.rfft2(np.ones((height, width)), shape)
+                                       * np.fft.rfft2(nb_pixel_kernel, shape), shape)[area]
+        return total_array, nb_pixel_array
+
+    def __getBlurMethod(self, blur_nb: int, kernel: str, width: int, height: int) -> str:
+        """
+        Choisit la méthode la moins coûteuse pour appliquer un noyau de flou à une image.
+
+        Args:
+            blur_nb (int): Le rayon du flou en pixels.
+            kernel (str): La forme du noyau, voir __getBlurKernel.
+            width (int): La largeur de l'image.
+            height (int): La hauteur de l'image.
+
+        Returns:
+            str: 'direct', 'separable' ou 'fft'.
+        """
+        # Coût approximatif par pixel de chaque méthode
+        fft_cost = math.log2((height + 2*blur_nb + 1) * (width + 2*blur_nb + 1))
+        if kernel == 'box':
+            return 'separable'
+        if kernel == 'gaussian':
+            return 'separable' if 2 * (2*blur_nb + 1) <= fft_cost else 'fft'
+        return 'direct' if len(self.__getBlurKernel(blur_nb, kernel)) <= fft_cost else 'fft'
+
+    def __renderBlurredRegion(self, blur_nb: int, kernel: str = 'cross', box: tuple = None, reader=None):
+        """
+        Version vectorisée de drawBlurredPicture, limitée à une zone de l'image. Le noyau est calculé une
+        seule fois, puis appliqué soit directement (peu de voisins), soit en deux passes (noyaux séparables),
+        soit par transformée de Fourier (grands rayons), selon la méthode la moins coûteuse pour ce rayon et
+        cette image. Seuls les pixels de la zone et une marge de blur_nb pixels autour sont lus.
+
+        Args:
+            blur_nb (int): Le rayon du flou en pixels.
+            kernel (str, optionnel): La forme du noyau, voir __getBlurKernel. Defaults to 'cross'.
+            box (tuple, optionnel): La zone (gauche, haut, droite, bas) à calculer. Par défaut, toute l'image.
+            reader (optionnel): Une fonction reader(row, column) qui renvoie les pixels de la source. Par
+                défaut, les pixels de l'image.
+
+        Returns:
+            numpy.ndarray: Les pixels de la zone.
+        """
+        kernel_list = self.__getBlurKernel(blur_nb, kernel)
+        width, height = self.m_size
+        left, top, right, bottom = box or (0, 0, width, height)
+        method = self.__getBlurMethod(blur_nb, kernel, width, height)
+        window_left, window_top = max(left - blur_nb, 0), max(top - blur_nb, 0)
+        window_right, window_bottom = min(right + blur_nb, width), min(bottom + blur_nb, height)
+        if reader is None:
+            picture_array = self.__getPictureArray()[window_top:window_bottom, window_left:window_right]
+            self.__countPixel(picture_array.shape[0] * picture_array.shape[1])
+        else:
+            picture_array = reader(np.arange(window_top, window_bottom),
+                                   np.arange(window_left, window_right))
+        picture_array = self.__getWeightedArray(picture_array)
+        if method == 'separable':
+            total_array, nb_pixel_array = self.__convolveSeparable(
+                picture_array, blur_nb, kernel)
+        elif method == 'direct':
+            total_array, nb_pixel_array = self.__convolveDirect(
+                picture_array, kernel_list)
+        else:
+            total_array, nb_pixel_array = self.__convolveFFT(
+                picture_array.astype(np.float64), kernel_list)
+        area = (slice(top - window_top, bottom - window_top),
+                slice(left - window_left, right - window_left))
+        total_array, nb_pixel_array = total_array[area], nb_pixel_array[area]
+        # La somme directe reprend exactement les calculs de la boucle ; les autres méthodes arrondissent
+        # les flottants, d'où une petite tolérance avant la division entière
+        tolerance = 0 if method == 'direct' or kernel == 'box' else 1e-6
+        divisor_array = np.broadcast_to(nb_pixel_array[:, :, np.newaxis], total_array.shape)
+        if self.m_work_mode in self.ALPHA_MODE:
+            # Les couleurs pondérées par l'alpha sont divisées par la somme des alphas
+            divisor_array = np.array(divisor_array)
+            divisor_array[:, :, :-1] = total_array[:, :, -1:]
+        average_array = np.zeros(total_array.shape, dtype=np.float64)
+        if tolerance == 0:
+            # Comme l'opérateur // de la boucle, même quand le quotient arrondi tombe sur l'entier supérieur
+            np.floor_divide(total_array, divisor_array, out=average_array, where=divisor_array > 0)
+        else:
+            np.divide(total_array, divisor_array, out=average_array, where=divisor_array > tolerance)
+            average_array = np.floor(average_array + tolerance)
+        return np.clip(average_array, 0, np.iinfo(self.m_dtype).max).astype(self.m_dtype)
+
+    @_drawMethod('blur')
+    def drawBlurredPicture(self, blur_nb: int, kernel: str = 'cross', workers: int = None, region=None) -> Image:
+        """
+        Cette fonction floute une image.
+
+        Args:
+            blur_nb (int): Le nombre de pixels à prendre en compte pour le flou.
+            kernel (str, optionnel): La forme du noyau : 'cross' (une croix et un arc de cercle de rayon
+                blur_nb), 'box' ou 'gaussian'. Defaults to 'cross'.
+            workers (int, optionnel): Le nombre de processus qui calculent l'image en parallèle (moteur
+                'numpy'). Par défaut, un seul.
+            region (optionnel): Les zones à traiter : une liste de zones (gauche, haut, droite, bas) ou un
+                masque de la taille de l'image (tableau NumPy ou image PIL, non nul dans les zones), sur la
+                grille de toute l'image. Les autres pixels sont ceux de l'image d'origine. Par défaut, toute
+                l'image.
+
+        Returns:
+            Image : L'image floutée.
+
+        Raises:
+            ValueError: Si workers est inférieur à 1, ou supérieur à 1 avec un autre moteur que 'numpy'.
+
+        """
+        kernel_list = self.__getBlurKernel(blur_nb, kernel)
+        if self.m_backend == 'numpy' or region is not None:
+            return self.__renderPicture('blur', {'blur_nb': blur_nb, 'kernel': kernel}, workers, region)
+        self.__checkWorkers(workers)
+        width, height = self.m_size
+        pixelated_picture = self.__newCanvas((width, height))
+        nb_color = Image.getmodebands(self.m_work_mode)
+        for x in range(width):
+            for y in range(height):
+                total, px_blur = (0,) * nb_color, 0
+                for x_ref, y_ref, coef, nb_pixel in kernel_list:
+                    if 0 <= x + x_ref < width and 0 <= y + y_ref < height:
+                        pixel = self.m_read_pixel((x + x_ref, y + y_ref))
+                        total = tuple(value_total + value*coef for value_total, value in zip(total, pixel))
+                        px_blur += nb_pixel
+                avg = self.__averagePixelColor(total, px_blur)
+                pixelated_picture.putpixel(
+                    (x, y), tuple(int(value) for value in avg))
+        return self.__toSourceMode(pixelated_picture.toPicture())
+
+    def __even(self, numbre: int, factor: int = 2) -> bool:
+        """
+        Vérifie si un nombre est pair, ou plus généralement multiple de factor.
+
+        Args:
+            numbre (int): Le nombre à vérifier.
+            factor (int, optionnel): Le diviseur. Defaults to 2.
+
+        Returns:
+            bool: True si le nombre est un multiple de factor, False sinon.
+        """
+        return numbre % factor == 0
+
+    def __totalPixelColorEnhanceInner(self, read_pixel, size: tuple, nb_pixel, total: tuple, x, y) -> tuple[tuple, int]:
+        """
+        Cette méthode ajoute les valeurs de chaque composante du pixel de coordonnées (x, y) de l'image d'amélioration à la somme des pixels voisins.
+
+        Args:
+            read_pixel: La fonction qui lit un pixel de l'image d'amélioration, renvoyée par __getWeightedReader.
+            size (tuple): La largeur et la hauteur de l'image d'amélioration.
+            nb_pixel (int): Le nombre de pixels voisins déjà considérés.
+            total (tuple): La somme des valeurs de chaque composante des pixels voisins déjà considérés.
+            x (int): La coordonnée x du pixel voisin.
+            y (int): La coordonnée y du pixel voisin.
+
+        Returns:
+            tuple[tuple, int]: Un tuple contenant la somme des valeurs de chaque composante des pixels voisins et le nombre total de pixels voisins considérés.
+        """
+        width, height = size
+        if not (x < 0 or y < 0 or x > width-1 or y > height-1):
+            total = tuple(value_total + value for value_total, value in zip(total, read_pixel((x, y))))
+            nb_pixel += 1
+        return total, nb_pixel
+
+    def __totalPixelColorEnhance(self, enhance_picture, x, y, factor: int = 2, read_pixel=None) -> tuple[tuple, int]:
+        """
+        Retourne un tuple contenant la somme des valeurs de chaque composante et le nombre de pixels pour les pixels voisins.
+
+        :param enhance_picture: L'image d'amélioration en cours de peinture.
+        :type enhance_picture: Image
+        :param x: La position x du pixel.
+        :type x: int
+        :param y: La position y du pixel.
+        :type y: int
+        :param factor: Le facteur d'agrandissement de l'image.
+        :type factor: int
+        :param read_pixel: La fonction qui lit un pixel de l'image d'amélioration. Par défaut, sa méthode getpixel.
+        :return: Un tuple contenant la somme des valeurs de chaque composante et le nombre de pixels.
+        :rtype: tuple[tuple, int]
+        """
+        if read_pixel is None:
+            read_pixel = enhance_picture.getpixel
+        size = enhance_picture.size
+        total, px_blur = (0,) * Image.getmodebands(self.m_work_mode), 0
+        if not self.__even(x, factor) and self.__even(y, factor):
+            total, px_blur = self.__totalPixelColorEnhanceInner(
+                read_pixel, size, px_blur, total, x-1, y)
+            total, px_blur = self.__totalPixelColorEnhanceInner(
+                read_pixel, size, px_blur, total, x+1, y)
+        if not self.__even(y, factor) and self.__even(x, factor):
+            total, px_blur = self.__totalPixelColorEnhanceInner(
+                read_pixel, size, px_blur, total, x, y-1)
+            total, px_blur = self.__totalPixelColorEnhanceInner(
+                read_pixel, size, px_blur, total, x, y+1)
+        elif not self.__even(x, factor) and not self.__even(y, factor):
+            total, px_blur = self.__totalPixelColorEnhanceInner(
+                read_pixel, size, px_blur, total, x-1, y-1)
+            total, px_blur = self.__totalPixelColorEnhanceInner(
+                read_pixel, size, px_blur, total, x-1, y+1)
+            total, px_blur = self.__totalPixelColorEnhanceInner(
+                read_pixel, size, px_blur, total, x+1, y-1)
+            total, px_blur = self.__totalPixelColorEnhanceInner(
+                read_pixel, size, px_blur, total, x+1, y+1)
+        return total, px_blur
+
+    def __averagePixelColorEnhance(self, total: tuple, nb_pixel) -> tuple:
+        """
+        Calcule la couleur moyenne d'un ensemble de pixels.
+
+        Args:
+            total (tuple): somme des valeurs de chaque composante des pixels
+            nb_pixel (int): nombre de pixels dans l'ensemble
+
+        Returns:
+            tuple: la couleur moyenne, une valeur par composante
+        """
+        return self.__averagePixelColor(total, nb_pixel // 2)
+
+    def __getNeighborAverage(self, first_array, second_array, divisor: int):
+        """
+        Calcule, comme __averagePixelColorEnhance, la couleur de pixels agrandis à partir de deux voisins
+        peints, les autres voisins étant encore noirs : la somme des deux voisins est divisée par divisor
+        (la moitié du nombre de voisins dans l'image) et bornée par la valeur maximale du mode.
+
+        Args:
+            first_array (numpy.ndarray): Le premier voisin de chaque pixel (..., composantes).
+            second_array (numpy.ndarray): Le second voisin de chaque pixel.
+            divisor (int): Le diviseur, 1 ou 2.
+
+        Returns:
+            numpy.ndarray: Les couleurs des pixels.
+        """
+        max_value = np.iinfo(first_array.dtype).max
+        if self.m_work_mode in self.ALPHA_MODE:
+            total_array = self.__getWeightedArray(first_array).astype(np.uint32) + \
+                self.__getWeightedArray(second_array)
+            average_array = self.__getAverageArray(total_array, divisor)
+        else:
+            total_dtype = np.uint16 if first_array.dtype == np.uint8 else np.uint32
+            average_array = (first_array.astype(total_dtype) + second_array) // divisor
+        if divisor == 1:
+            average_array = np.minimum(average_array, max_value)
+        return average_array
+
+    def __enhanceArray(self, picture_array, factor: int):
+        """
+        Agrandit un tableau de pixels. Les pixels d'origine sont recopiés en bloc, puis chaque colonne
+        intermédiaire est calculée d'un coup à partir de la colonne précédente, ce qui donne exactement le
+        résultat du parcours pixel par pixel de drawEnhancePicture.
+
+        Args:
+            picture_array (numpy.ndarray): Les pixels à agrandir.
+            factor (int): Le facteur d'agrandissement.
+
+        Returns:
+            numpy.ndarray: Les pixels agrandis.
+        """
+        if factor == 1:
+            return picture_array.copy()
+        height, width = picture_array.shape[:2]
+        new_width, new_height = width * factor, height * factor
+        enhance_array = np.empty(
+            (new_height, new_width) + picture_array.shape[2:], dtype=picture_array.dtype)
+        # Lignes et colonnes des pixels d'origine : le pixel d'origine est recopié, sauf sur le dernier pixel
+        # de l'image dont le voisin suivant n'existe pas
+        enhance_array[0::factor] = np.repeat(picture_array, factor, axis=1)
+        enhance_array[0::factor, -1] = 0
+        enhance_array[:, 0::factor] = np.repeat(picture_array, factor, axis=0)
+        enhance_array[-1, 0::factor] = 0
+        # Autres pixels : moyenne des voisins en diagonale dans la colonne précédente, celle d'après n'étant
+        # pas encore peinte (donc noire)
+        row = np.flatnonzero(np.arange(new_height - 1) % factor != 0)
+        for i_width in range(1, factor):
+            previous_array = enhance_array[:, i_width-1::factor]
+            enhance_array[row, i_width::factor] = self.__getNeighborAverage(
+                previous_array[row-1], previous_array[row+1], 2)
+            enhance_array[-1, i_width::factor] = previous_array[-2]
+        enhance_array[row, -1] = self.__getNeighborAverage(
+            previous_array[row-1, -1], previous_array[row+1, -1], 1)
+        enhance_array[-1, -1] = 0
+        if self.m_work_mode in self.ALPHA_MODE:
+            # Les pixels recopiés d'un seul voisin sont des moyennes pondérées par son alpha : un voisin
+            # transparent ne donne pas de couleur. Les pixels d'origine et les moyennes de deux voisins
+            # gardent la leur.
+            x_original = np.arange(new_width) % factor == 0
+            y_original = np.arange(new_height) % factor == 0
+            y_average = ~y_original
+            y_average[-1] = False
+            copy_mask = ~(y_original[:, np.newaxis] & x_original) & ~(y_average[:, np.newaxis] & ~x_original)
+            enhance_array[copy_mask & (enhance_array[:, :, -1] == 0), :-1] = 0
+        return enhance_array
+
+    def __renderEnhanceRegion(self, factor: int = 2, box: tuple = None, reader=None):
+        """
+        Version vectorisée de drawEnhancePicture, limitée à une zone de l'image agrandie. Chaque pixel agrandi
+        ne dépend que du pixel d'origine correspondant et de ses voisins directs : seuls ces pixels sont lus,
+        avec une marge d'un pixel pour que les bords de la zone ne soient pas traités comme ceux de l'image.
+
+        Args:
+            factor (int, optionnel): Le facteur d'agrandissement. Defaults to 2.
+            box (tuple, optionnel): La zone (gauche, haut, droite, bas) de l'image agrandie à calculer. Par
+                défaut, toute l'image.
+            reader (optionnel): Une fonction reader(row, column) qui renvoie les pixels de la source. Par
+                défaut, les pixels de l'image.
+
+        Returns:
+            numpy.ndarray: Les pixels de la zone.
+        """
+        width, height = self.m_size
+        left, top, right, bottom = box or (0, 0, width * factor, height * factor)
+        window_left, window_top = max(left // factor - 1, 0), max(top // factor - 1, 0)
+        window_right = min((right - 1) // factor + 2, width)
+        window_bottom = min((bottom - 1) // factor + 2, height)
+        if reader is None:
+            picture_array = self.__getPictureArray()[window_top:window_bottom, window_left:window_right]
+            self.__countPixel(picture_array.shape[0] * picture_array.shape[1])
+        else:
+            picture_array = reader(np.arange(window_top, window_bottom),
+                                   np.arange(window_left, window_right))
+        enhance_array = self.__enhanceArray(picture_array, factor)
+        return enhance_array[top - window_top * factor:bottom - window_top * factor,
+                             left - window_left * factor:right - window_left * factor]
+
+    @_drawMethod('enhance')
+    def drawEnhancePicture(self, factor: int = 2, workers: int = None, region=None) -> Image:
+        """
+        Crée une nouvelle image améliorée en appliquant une technique de flou.
+        Cette technique consiste à prendre quatre pixels voisins et à remplacer le pixel central par une couleur moyenne pondérée.
+
+        Args:
+            factor (int, optionnel): Le facteur d'agrandissement de l'image. Defaults to 2.
+            workers (int, optionnel): Le nombre de processus qui calculent l'image en parallèle (moteur
+                'numpy'). Par défaut, un seul.
+            region (optionnel): Les zones de l'image d'origine à traiter : une liste de zones (gauche, haut,
+                droite, bas) ou un masque de la taille de l'image (tableau NumPy ou image PIL, non nul dans les
+                zones). Les autres pixels sont ceux de l'image d'origine agrandie. Par défaut, toute l'image.
+
+        Returns:
+            Image: l'image améliorée
+
+        Raises:
+            ValueError: Si factor est inférieur à 1, ou si workers est inférieur à 1, ou supérieur à 1 avec
+                un autre moteur que 'numpy'.
+        """
+        if factor < 1:
+            raise ValueError(f"Le facteur d'agrandissement doit être au moins 1 : {factor}")
+        if self.m_backend == 'numpy' or region is not None:
+            return self.__renderPicture('enhance', {'factor': factor}, workers, region)
+        self.__checkWorkers(workers)
+        width, height = self.m_size
+        enhance_picture = self.__newCanvas((width*factor, height*factor))
+        read_pixel = self.__getWeightedReader(enhance_picture.getpixel)
+        new_width, new_height = enhance_picture.size
+        for x in range(new_width):
+            for y in range(new_height):
+                if self.__even(x, factor) and self.__even(y, factor):
+                    enhance_picture.putpixel((x, y), self.m_reader.getpixel((x//factor, y//factor)))
+                else:
+                    total, px_blur = self.__totalPixelColorEnhance(
+                        enhance_picture, x, y, factor, read_pixel)
+                    enhance_picture.putpixel(
+                        (x, y), self.__averagePixelColorEnhance(total, px_blur))
+        return self.__toSourceMode(enhance_picture.toPicture())
+
+    def __readPictureArray(self, row, column):
+        """
+        Lit des pixels de l'image dans le tableau de __getPictureArray.
+
+        Args:
+            row (numpy.ndarray): Les lignes à lire.
+            column (numpy.ndarray): Les colonnes à lire.
+
+        Returns:
+            numpy.ndarray: Un tableau (lignes, colonnes, composantes).
+        """
+        return self.__getPictureArray()[np.ix_(row, column)]
+
+    def __readPictureRows(self, row, column):
+        """
+        Lit des pixels de l'image en ne convertissant que les bandes de lignes demandées, sans construire le
+        tableau de toute l'image.
+
+        Args:
+            row (numpy.ndarray): Les lignes à lire.
+            column (numpy.ndarray): Les colonnes à lire.
+
+        Returns:
+            numpy.ndarray: Un tableau (lignes, colonnes, composantes).
+        """
+        left, right = int(column.min()), int(column.max()) + 1
+        band_list = []
+        # Une bande par suite de lignes consécutives
+        for band_row in np.split(row, np.flatnonzero(np.diff(row) != 1) + 1):
+            band = self.__toWorkMode(self.m_picture.crop(
+                (left, int(band_row[0]), right, int(band_row[-1]) + 1)))
+            band_array = np.asarray(band)
+            band_list.append(band_array[:, :, np.newaxis] if band_array.ndim == 2 else band_array)
+        return np.concatenate(band_list)[:, column - left]
+
+    def __getDrawArgument(self, method: str, args: tuple, kwargs: dict) -> dict:
+        """
+        Associe les arguments donnés pour une méthode aux paramètres de la méthode draw correspondante.
+
+        Args:
+            method (str): La méthode : une clé de METHOD_DICT.
+            args (tuple): Les arguments positionnels de la méthode draw.
+            kwargs (dict): Les arguments nommés de la méthode draw.
+
+        Returns:
+            dict: Les valeurs de tous les paramètres de la méthode draw, y compris les valeurs par défaut.
+
+        Raises:
+            ValueError: Si la méthode n'existe pas.
+        """
+        if method not in self.METHOD_DICT:
+            raise ValueError(f"Méthode inconnue : {method}")
+        argument = inspect.signature(getattr(self, self.METHOD_DICT[method])).bind(*args, **kwargs)
+        argument.apply_defaults()
+        argument = dict(argument.arguments)
+        # Le nombre de processus ne concerne que les méthodes draw
+        argument.pop('workers', None)
+        if argument.pop('region', None) is not None:
+            raise ValueError("Les zones ne sont acceptées que par les méthodes draw")
+        return argument
+
+    def __renderRegion(self, method: str, argument: dict, box: tuple = None, reader=None):
+        """
+        Calcule une zone de l'image produite par une méthode, avec les moteurs vectorisés.
+
+        Args:
+            method (str): La méthode : une clé de METHOD_DICT.
+            argument (dict): Les paramètres de la méthode draw, renvoyés par __getDrawArgument.
+            box (tuple, optionnel): La zone (gauche, haut, droite, bas) à calculer. Par défaut, toute l'image.
+            reader (optionnel): Une fonction reader(row, column) qui renvoie les pixels de la source.
+
+        Returns:
+            numpy.ndarray: Les pixels de la zone.
+        """
+        render_dict = {'square': self.__renderSquareRegion,
+                       'triangle': self.__renderTriangularRegion,
+                       'circle': self.__renderCircularRegion,
+                       'blur': self.__renderBlurredRegion,
+                       'enhance': self.__renderEnhanceRegion}
+        return render_dict[method](**argument, box=box, reader=reader)
+
+    def __getOutputSize(self, method: str, argument: dict) -> tuple:
+        """
+        Renvoie la taille de l'image produite par une méthode.
+
+        Args:
+            method (str): La méthode : une clé de METHOD_DICT.
+            argument (dict): Les paramètres de la méthode draw, renvoyés par __getDrawArgument.
+
+        Returns:
+            tuple: La largeur et la hauteur de l'image produite.
+        """
+        width, height = self.m_size
+        if method == 'enhance':
+            return width * argument['factor'], height * argument['factor']
+        return width, height
+
+    def __getBoundList(self, method: str, argument: dict, axis: int) -> list:
+        """
+        Renvoie les positions d'un axe de l'image produite où une bande ou une tuile peut commencer sans
+        couper une section : les lignes (ou colonnes) de sections pour les images pixelisées, chaque ligne
+        pour le flou et chaque ligne d'ancrage pour l'agrandissement.
+
+        Args:
+            method (str): La méthode : une clé de METHOD_DICT.
+            argument (dict): Les paramètres de la méthode draw, renvoyés par __getDrawArgument.
+            axis (int): L'axe : 0 pour les colonnes, 1 pour les lignes.
+
+        Returns:
+            list: Les positions triées, de 0 à la taille de l'image sur cet axe comprises.
+        """
+        size = self.__getOutputSize(method, argument)[axis]
+        if method in ('square', 'triangle'):
+            # Une section commence un pixel plus tôt dans l'image (décalage de lecture de -1)
+            grid = self.__getMosaicGrid(argument['division_nb'])[1 + axis]
+            return sorted(set(grid[1][1:] - 1) | {0, size})
+        if method == 'circle':
+            separation = self.__getPictureSeparation(argument['division_nb'], False)
+            return sorted(set(separation[axis][0::2]) | {0, size})
+        step = argument['factor'] if method == 'enhance' else 1
+        return list(range(0, size, step)) + [size]
+
+    def __groupBound(self, bound_list: list, length: int) -> list:
+        """
+        Regroupe des positions consécutives de __getBoundList en intervalles d'au plus length pixels, ou
+        d'un seul écart entre deux positions lorsqu'il est plus grand.
+
+        Args:
+            bound_list (list): Les positions renvoyées par __getBoundList.
+            length (int): La longueur visée de chaque intervalle.
+
+        Returns:
+            list: La liste des intervalles (début, fin), dans l'ordre.
+        """
+        interval_list = []
+        start = 0
+        for index, bound in enumerate(bound_list[1:], 1):
+            if bound == bound_list[-1] or bound_list[index + 1] - start > length:
+                interval_list.append((start, bound))
+                start = bound
+        return interval_list
+
+    def __getStripList(self, method: str, argument: dict, memory_limit: int) -> list:
+        """
+        Découpe l'image produite par une méthode en bandes horizontales dont le calcul tient à peu près dans
+        memory_limit octets. Pour les images pixelisées, les bandes suivent les lignes de sections.
+
+        Args:
+            method (str): La méthode : une clé de METHOD_DICT.
+            argument (dict): Les paramètres de la méthode draw, renvoyés par __getDrawArgument.
+            memory_limit (int): La mémoire de travail visée, en octets.
+
+        Returns:
+            list: La liste des bandes (haut, bas), de haut en bas.
+        """
+        width, height = self.__getOutputSize(method, argument)
+        nb_byte = Image.getmodebands(self.m_work_mode) * self.m_dtype.itemsize
+        row_nb = max(1, memory_limit // (width * nb_byte * self.MEMORY_FACTOR[method]))
+        if method == 'blur':
+            row_nb = max(1, row_nb - 2 * argument['blur_nb'])
+        return self.__groupBound(self.__getBoundList(method, argument, 1), row_nb)
+
+    def __getTileList(self, method: str, argument: dict, tile_nb: int) -> list:
+        """
+        Découpe l'image produite par une méthode en environ tile_nb tuiles qui suivent les sections : des
+        bandes horizontales, elles-mêmes coupées en colonnes s'il n'y a pas assez de lignes de sections.
+
+        Args:
+            method (str): La méthode : une clé de METHOD_DICT.
+            argument (dict): Les paramètres de la méthode draw, renvoyés par __getDrawArgument.
+            tile_nb (int): Le nombre de tuiles visé.
+
+        Returns:
+            list: La liste des tuiles (gauche, haut, droite, bas).
+        """
+        width, height = self.__getOutputSize(method, argument)
+        y_bound = self.__getBoundList(method, argument, 1)
+        row_tile_nb = min(tile_nb, len(y_bound) - 1)
+        column_tile_nb = math.ceil(tile_nb / row_tile_nb)
+        x_interval = [(0, width)]
+        if column_tile_nb > 1:
+            x_interval = self.__groupBound(
+                self.__getBoundList(method, argument, 0), math.ceil(width / column_tile_nb))
+        return [(left, top, right, bottom)
+                for top, bottom in self.__groupBound(y_bound, math.ceil(height / row_tile_nb))
+                for left, right in x_interval]
+
+    def __getAffectedInterval(self, method: str, argument: dict, axis: int, start: int, end: int) -> list:
+        """
+        Renvoie les parties d'un axe de l'image produite qui dépendent des pixels start à end - 1 de l'image
+        d'origine sur cet axe : les pixels peints par les sections qui lisent ces pixels pour les images
+        pixelisées, une marge de blur_nb pixels pour le flou et d'un pixel d'origine pour l'agrandissement.
+
+        Args:
+            method (str): La méthode : une clé de METHOD_DICT.
+            argument (dict): Les paramètres de la méthode draw, renvoyés par __getDrawArgument.
+            axis (int): L'axe : 0 pour les colonnes, 1 pour les lignes.
+            start (int): Le premier pixel modifié.
+            end (int): Le pixel qui suit le dernier pixel modifié.
+
+        Returns:
+            list: Les intervalles (début, fin) de l'image produite, dans l'ordre.
+        """
+        size = self.__getOutputSize(method, argument)[axis]
+        if method == 'blur':
+            return [(max(start - argument['blur_nb'], 0), min(end + argument['blur_nb'], size))]
+        if method == 'enhance':
+            factor = argument['factor']
+            return [(max((start - 1) * factor, 0), min((end + 1) * factor, size))]
+        source_index, start_array, length_array, owner = self.__getMosaicGrid(
+            argument['division_nb'], method != 'circle')[1 + axis][:4]
+        # Sections qui lisent les pixels modifiés, sur l'axe étendu de __getGridIndex
+        extended_section = np.repeat(np.arange(len(start_array)), length_array)
+        section = np.unique(extended_section[(source_index >= start) & (source_index < end)])
+        if method == 'circle':
+            # Sans proportionnalité, la section i peint les pixels i * taille à (i + 1) * taille - 1
+            section_size = int(length_array[0])
+            return [(section_start * section_size, section_end * section_size)
+                    for section_start, section_end in _getIntervalList(section)]
+        return _getIntervalList(np.flatnonzero(np.isin(owner, section)))
+
+    def __getAffectedBoxList(self, method: str, argument: dict, box: tuple) -> list:
+        """
+        Renvoie les zones de l'image produite qui dépendent d'une zone de l'image d'origine. La première
+        section d'un axe lit aussi le dernier pixel : une modification sur un bord peut donc toucher deux
+        zones par axe.
+
+        Args:
+            method (str): La méthode : une clé de METHOD_DICT.
+            argument (dict): Les paramètres de la méthode draw, renvoyés par __getDrawArgument.
+            box (tuple): La zone (gauche, haut, droite, bas) modifiée de l'image d'origine.
+
+        Returns:
+            list: Les zones (gauche, haut, droite, bas) de l'image produite à recalculer.
+        """
+        left, top, right, bottom = box
+        x_interval = self.__getAffectedInterval(method, argument, 0, left, right)
+        y_interval = self.__getAffectedInterval(method, argument, 1, top, bottom)
+        return [(x_start, y_start, x_end, y_end)
+                for y_start, y_end in y_interval for x_start, x_end in x_interval]
+
+    def __getChangedBoxList(self, previous_array, block_size: int) -> list:
+        """
+        Compare les pixels de l'image à ceux d'une image précédente de même taille, par blocs de block_size
+        pixels de côté, voir _getBlockBoxList.
+
+        Args:
+            previous_array (numpy.ndarray): Les pixels de l'image précédente, dans le mode de travail.
+            block_size (int): Le côté des blocs comparés, en pixels.
+
+        Returns:
+            list: Les zones (gauche, haut, droite, bas) modifiées, alignées sur les blocs.
+        """
+        picture_array = self.__getPictureArray()
+        height, width, nb_color = picture_array.shape
+        self.__countPixel(2 * width * height)
+        return _getBlockBoxList((picture_array != previous_array).reshape(height, width * nb_color),
+                                block_size, nb_color)
+
+    def _renderFrame(self, method: str, args: tuple, kwargs: dict, previous, output_array, block_size: int) -> tuple:
+        """
+        Calcule l'image produite pour une image d'une suite, pour SequenceRenderer : seules les zones qui
+        dépendent des blocs modifiés depuis l'image précédente sont recalculées, en lisant les pixels de leurs
+        sections, et recopiées dans les pixels produits pour l'image précédente. Toute l'image est recalculée
+        pour la première image, après un changement de taille ou de mode, ou lorsque les zones à recalculer
+        couvrent plus de la moitié de l'image.
+
+        Args:
+            method (str): La méthode : une clé de METHOD_DICT.
+            args (tuple): Les arguments positionnels de la méthode draw.
+            kwargs (dict): Les arguments nommés de la méthode draw.
+            previous (PixelMaster): L'instance de l'image précédente, ou None.
+            output_array (numpy.ndarray): Les pixels produits pour l'image précédente, modifiés sur place, ou
+                None.
+            block_size (int): Le côté des blocs comparés, en pixels.
+
+        Returns:
+            tuple: L'image produite, ses pixels dans le mode de travail et la liste des zones recalculées.
+        """
+        argument = self.__getDrawArgument(method, args, kwargs)
+        width, height = self.__getOutputSize(method, argument)
+        full_box = (0, 0, width, height)
+        box_list = [full_box]
+        if previous is not None and output_array is not None and previous.m_work_mode == self.m_work_mode \
+                and previous.m_size == self.m_size:
+            box_list = []
+            for box in self.__getChangedBoxList(previous.__getPictureArray(), block_size):
+                box_list.extend(self.__getAffectedBoxList(method, argument, box))
+            box_list = _mergeBoxList(box_list)
+            if sum((right - left) * (bottom - top) for left, top, right, bottom in box_list) > width * height // 2:
+                box_list = [full_box]
+        if box_list == [full_box]:
+            output_array = self.__renderRegion(method, argument)
+        else:
+            for box in box_list:
+                left, top, right, bottom = box
+                output_array[top:bottom, left:right] = self.__renderRegion(
+                    method, argument, box, self.__readPictureArray)
+        # L'image produite ne doit pas partager les pixels modifiés pour les images suivantes
+        return self.__toPicture(output_array.copy()), output_array, box_list
+
+    def __reduceArray(self, picture_array, scale: int):
+        """
+        Réduit des pixels d'un facteur entier : chaque pixel réduit est la moyenne d'un carré de scale pixels
+        de côté (plus petit sur les bords), pondérée par l'alpha comme les sections.
+
+        Args:
+            picture_array (numpy.ndarray): Les pixels (hauteur, largeur, composantes), dans le mode de travail.
+            scale (int): Le facteur de réduction.
+
+        Returns:
+            numpy.ndarray: Les pixels réduits (ceil(hauteur / scale), ceil(largeur / scale), composantes).
+        """
+        height, width = picture_array.shape[:2]
+        row, column = np.arange(0, height, scale), np.arange(0, width, scale)
+        total_array = np.add.reduceat(np.add.reduceat(
+            self.__getWeightedArray(picture_array), row, axis=0, dtype=np.int64), column, axis=1)
+        nb_pixel_array = np.diff(np.append(row, height))[:, np.newaxis, np.newaxis] \
+            * np.diff(np.append(column, width))[np.newaxis, :, np.newaxis]
+        return self.__getAverageArray(total_array, nb_pixel_array).astype(self.m_dtype)
+
+    def _renderLazy(self, method: str, argument: dict, box: tuple, scale: int = 1,
+                    memory_limit: int = 64 * 2**20) -> Image:
+        """
+        Calcule une zone de l'image produite, pour LazyPicture, en lisant les seuls pixels de ses sections.
+        Une zone réduite est calculée par bandes d'environ memory_limit octets de mémoire de travail, chaque
+        bande étant réduite dans le mode de travail avant de calculer la suivante.
+
+        Args:
+            method (str): La méthode : une clé de METHOD_DICT.
+            argument (dict): Les paramètres de la méthode draw, renvoyés par __getDrawArgument.
+            box (tuple): La zone (gauche, haut, droite, bas) de l'image produite.
+            scale (int, optionnel): Le facteur de réduction. Defaults to 1.
+            memory_limit (int, optionnel): La mémoire de travail visée, en octets. Defaults to 64 Mio.
+
+        Returns:
+            Image: La zone, réduite, dans le mode des méthodes draw.
+        """
+        reader = self.__readPictureArray if self.m_picture_array is not None else self.__readPictureRows
+        if scale == 1:
+            return self.__toPicture(self.__renderRegion(method, argument, box, reader))
+        left, top, right, bottom = box
+        nb_byte = Image.getmodebands(self.m_work_mode) * self.m_dtype.itemsize
+        # Des bandes d'un multiple de scale lignes, pour que les carrés réduits ne soient pas coupés
+        row_nb = max(1, memory_limit // ((right - left) * nb_byte * self.MEMORY_FACTOR[method]) // scale) * scale
+        strip_list = []
+        for strip_top in range(top, bottom, row_nb):
+            strip_array = self.__renderRegion(
+                method, argument, (left, strip_top, right, min(strip_top + row_nb, bottom)), reader)
+            strip_list.append(self.__reduceArray(strip_array, scale))
+        return self.__toPicture(np.concatenate(strip_list))
+
+    def _renderDraft(self, method: str, args: tuple, kwargs: dict, size: tuple, scale: int,
+                     edge_picture: Image = None) -> Image:
+        """
+        Calcule, pour renderFile, l'image produite à la taille size d'une image dont cette instance n'a que
+        la version réduite d'un facteur scale : les sections sont celles de l'image entière et leurs sommes
+        sont lues dans l'image intégrale de l'image réduite, voir _DraftIntegral. Seules les méthodes qui
+        lisent l'image intégrale ('square' et 'circle') sont prises en charge, et l'instance ne doit plus
+        servir ensuite.
+
+        Args:
+            method (str): La méthode : 'square' ou 'circle'.
+            args (tuple): Les arguments positionnels de la méthode draw.
+            kwargs (dict): Les arguments nommés de la méthode draw.
+            size (tuple): La largeur et la hauteur de l'image entière.
+            scale (int): Le facteur de réduction de l'image de cette instance.
+            edge_picture (Image, optionnel): L'image entière, dont les pixels lus par la dernière colonne et
+                la dernière ligne de sections de la grille proportionnelle ('square') sont sommés
+                exactement. Par défaut, ces sections sont aussi lues dans l'image réduite.
+
+        Returns:
+            Image: L'image produite, à la taille de l'image entière.
+        """
+        argument = self.__getDrawArgument(method, args, kwargs)
+        weighted_array = self.__getWeightedArray(self.__getPictureArray())
+        height, width, nb_color = weighted_array.shape
+        # Chaque pixel réduit compte pour le nombre de pixels de son bloc, plus petit en fin d'axe
+        column_array = np.minimum(np.arange(1, width + 1) * scale, size[0]) - np.arange(width) * scale
+        row_array = np.minimum(np.arange(1, height + 1) * scale, size[1]) - np.arange(height) * scale
+        integral_array = np.zeros((height + 1, width + 1, nb_color), dtype=np.float64)
+        integral_array[1:, 1:] = weighted_array
+        integral_array[1:, 1:] *= np.outer(row_array, column_array)[..., np.newaxis]
+        np.cumsum(integral_array[1:, 1:], axis=0, out=integral_array[1:, 1:])
+        np.cumsum(integral_array[1:, 1:], axis=1, out=integral_array[1:, 1:])
+        self.__countPixel(width * height)
+        # La grille et les sommes sont désormais celles de l'image entière
+        self.m_size = size
+        self.m_grid_dict = {}
+        self.m_triangle_dict = {}
+        edge = None
+        if edge_picture is not None:
+            x_grid, y_grid = self.__getMosaicGrid(argument['division_nb'])[1:]
+            # La première colonne et la première ligne lues par la dernière section de chaque axe
+            x_edge, y_edge = int(x_grid[0][x_grid[1][-1]]), int(y_grid[0][y_grid[1][-1]])
+            edge = []
+            for edge_start, box in ((x_edge, (x_edge, 0) + size), (y_edge, (0, y_edge) + size)):
+                edge_array = np.asarray(self.__toWorkMode(edge_picture.crop(box)))
+                edge.extend((edge_start, edge_array.reshape(edge_array.shape[:2] + (-1,))))
+            edge = tuple(edge)
+        self.m_integral_array = _DraftIntegral(integral_array, scale, size, edge)
+        return self.__toPicture(self.__renderRegion(method, argument))
+
+    def __checkWorkers(self, workers: int):
+        """
+        Vérifie le nombre de processus demandé à une méthode draw.
+
+        Args:
+            workers (int): Le nombre de processus, ou None.
+
+        Raises:
+            ValueError: Si workers est inférieur à 1, ou supérieur à 1 avec un autre moteur que 'numpy'.
+        """
+        if workers is None:
+            return
+        if workers < 1:
+            raise ValueError(f"Le nombre de processus doit être au moins 1 : {workers}")
+        if workers > 1 and self.m_backend != 'numpy':
+            raise ValueError("Le calcul en parallèle nécessite le moteur 'numpy'")
+
+    def __renderPicture(self, method: str, argument: dict, workers: int = None, region=None) -> Image:
+        """
+        Calcule toute l'image produite par une méthode avec les moteurs vectorisés, dans ce processus ou
+        dans workers processus, ou seulement ses zones region.
+
+        Args:
+            method (str): La méthode : une clé de METHOD_DICT.
+            argument (dict): Les paramètres de la méthode, sans box ni reader.
+            workers (int, optionnel): Le nombre de processus. Par défaut, un seul.
+            region (optionnel): Les zones à calculer, voir __renderRegionPicture. Par défaut, toute l'image.
+
+        Returns:
+            Image: L'image produite.
+        """
+        self.__checkWorkers(workers)
+        if region is not None:
+            return self.__renderRegionPicture(method, argument, region)
+        if workers is None or workers == 1:
+            return self.__toPicture(self.__renderRegion(method, argument))
+        return self.__renderParallel(method, argument, workers)
+
+    def __getRegionBoxList(self, region) -> tuple:
+        """
+        Lit les zones à traiter données à une méthode draw.
+
+        Args:
+            region: Une liste de zones (gauche, haut, droite, bas), ou un masque de la taille de l'image :
+                tableau NumPy (hauteur, largeur) ou image PIL, non nul dans les zones.
+
+        Returns:
+            tuple: Les zones, limitées à l'image et non vides, et le masque booléen (None pour une liste de
+            zones). Les zones d'un masque sont les blocs de REGION_BLOCK_SIZE pixels qui en contiennent un
+            pixel.
+
+        Raises:
+            ValueError: Si le masque n'a pas la taille de l'image ou si une zone n'a pas quatre coordonnées.
+        """
+        width, height = self.m_size
+        if isinstance(region, Image.Image) or isinstance(region, np.ndarray):
+            if isinstance(region, Image.Image):
+                region = np.asarray(region if region.mode in ('1', 'L') else region.convert('L'))
+            if region.shape != (height, width):
+                raise ValueError(f"Le masque {region.shape} n'a pas la taille de l'image {(height, width)}")
+            mask_array = region if region.dtype == bool else region != 0
+            return _getBlockBoxList(mask_array, self.REGION_BLOCK_SIZE), mask_array
+        box_list = []
+        for box in region:
+            if len(box) != 4:
+                raise ValueError(f"Zone non prise en charge : {box}")
+            left, top, right, bottom = (int(value) for value in box)
+            left, top, right, bottom = max(left, 0), max(top, 0), min(right, width), min(bottom, height)
+            if left < right and top < bottom:
+                box_list.append((left, top, right, bottom))
+        return box_list, None
+
+    def __renderRegionPicture(self, method: str, argument: dict, region) -> Image:
+        """
+        Calcule l'image produite par une méthode dans les seules zones region et la compose avec une copie de
+        l'image d'origine (agrandie pour enhance). Les sections restent celles de toute l'image : chaque pixel
+        d'une zone est celui de l'image produite entière. Seuls les pixels des sections qui touchent une
+        zone sont lus : hors la copie, le coût suit la surface des zones.
+
+        Args:
+            method (str): La méthode : une clé de METHOD_DICT.
+            argument (dict): Les paramètres de la méthode, sans box ni reader.
+            region: Les zones, voir __getRegionBoxList.
+
+        Returns:
+            Image: L'image produite, dans le mode des autres méthodes draw.
+
+        Raises:
+            ImportError: Si NumPy n'est pas installé.
+        """
+        if np is None:
+            raise ImportError("Le traitement de zones nécessite NumPy")
+        box_list, mask_array = self.__getRegionBoxList(region)
+        factor = argument['factor'] if method == 'enhance' else 1
+        if self.m_picture is None:
+            picture = self.__toPicture(self.m_picture_array.copy())
+        elif self.m_mode == self.m_work_mode or self.m_mode in self.WORK_MODE:
+            picture = self.m_picture.copy()
+        else:
+            # Les modes qui ne sont pas traités directement sont rendus dans le mode de travail
+            picture = self.__toWorkMode(self.m_picture)
+        if factor > 1:
+            picture = picture.resize(self.__getOutputSize(method, argument), Image.Resampling.NEAREST)
+        # Un tableau déjà construit est lu directement, sinon seules les lignes utiles sont converties
+        reader = self.__readPictureArray if self.m_picture_array is not None else self.__readPictureRows
+        for left, top, right, bottom in box_list:
+            output_box = (left * factor, top * factor, right * factor, bottom * factor)
+            mask = None
+            if mask_array is not None:
+                box_mask_array = mask_array[top:bottom, left:right]
+                if factor > 1:
+                    box_mask_array = box_mask_array.repeat(factor, axis=0).repeat(factor, axis=1)
+                mask = Image.fromarray(box_mask_array)
+            picture.paste(self.__toPicture(self.__renderRegion(method, argument, output_box, reader)),
+                          output_box[:2], mask)
+        return picture
+
+    def __renderParallel(self, method: str, argument: dict, workers: int) -> Image:
+        """
+        Calcule l'image produite par une méthode en la découpant en tuiles réparties entre plusieurs
+        processus. L'image d'origine et l'image produite sont placées en mémoire partagée : chaque processus
+        lit les pixels dont sa tuile a besoin et y écrit directement, sans copie ni sérialisation des pixels.
+
+        Args:
+            method (str): La méthode : une clé de METHOD_DICT.
+            argument (dict): Les paramètres de la méthode, sans box ni reader.
+            workers (int): Le nombre de processus.
+
+        Returns:
+            Image: L'image produite.
+        """
+        picture_array = self.__getPictureArray()
+        width, height = self.__getOutputSize(method, argument)
+        output_shape = (height, width, picture_array.shape[2])
+        tile_list = self.__getTileList(method, argument, workers * self.TILE_PER_WORKER)
+        dtype = picture_array.dtype
+        source = shared_memory.SharedMemory(create=True, size=picture_array.nbytes)
+        output = shared_memory.SharedMemory(
+            create=True, size=height * width * picture_array.shape[2] * dtype.itemsize)
+        try:
+            source_array = np.ndarray(picture_array.shape, dtype=dtype, buffer=source.buf)
+            source_array[:] = picture_array
+            del source_array
+            task_list = [(source.name, picture_array.shape, output.name, output_shape, dtype.name,
+                          self.m_work_mode, method, argument, box)
+                         for box in tile_list]
+            with ProcessPoolExecutor(max_workers=min(workers, len(tile_list))) as executor:
+                for _ in executor.map(PixelMaster._renderSharedTile, task_list):
+                    pass
+            output_array = np.ndarray(output_shape, dtype=dtype, buffer=output.buf)
+            pixelated_picture = self.__toPicture(output_array.copy())
+            del output_array
+        finally:
+            source.close()
+            source.unlink()
+            output.close()
+            output.unlink()
+        return pixelated_picture
+
+    @staticmethod
+    def _renderSharedTile(task: tuple):
+        """
+        Calcule une tuile pour __renderParallel, dans un processus du pool : l'image d'origine est lue et la
+        tuile écrite dans les blocs de mémoire partagée.
+
+        Args:
+            task (tuple): Le nom et la forme du bloc de l'image d'origine, le nom et la forme du bloc de
+                l'image produite, le type des pixels, le mode de travail, la méthode, ses paramètres et la
+                tuile (gauche, haut, droite, bas).
+        """
+        source_name, source_shape, output_name, output_shape, dtype, work_mode, method, argument, box = task
+        source = shared_memory.SharedMemory(name=source_name)
+        output = shared_memory.SharedMemory(name=output_name)
+        try:
+            master = PixelMaster(np.ndarray(source_shape, dtype=dtype, buffer=source.buf))
+            # Le tableau seul ne distingue pas, par exemple, une image RGBA d'une image à quatre composantes
+            # sans alpha
+            master.m_work_mode = work_mode
+            left, top, right, bottom = box
+            output_array = np.ndarray(output_shape, dtype=dtype, buffer=output.buf)
+            # Lecture des seuls pixels de la tuile, sans construire l'image intégrale de toute l'image
+            output_array[top:bottom, left:right] = master.__renderRegion(
+                method, argument, box, master.__readPictureArray)
+            # Les vues doivent disparaître avant de fermer les blocs
+            del master, output_array
+        finally:
+            source.close()
+            output.close()
+
+    def streamPicture(self, method: str, output, *args, memory_limit: int = 64 * 2**20, **kwargs):
+        """
+        Calcule l'image produite par une méthode bande par bande et écrit chaque bande terminée, sans jamais
+        construire l'image entière ni les tableaux de toute l'image. La mémoire de travail reste de l'ordre
+        de memory_limit ; seule l'image d'origine est gardée en mémoire par PIL.
+
+        Args:
+            method (str): La méthode : 'square', 'triangle', 'circle', 'blur' ou 'enhance'.
+            output: Le chemin du fichier à écrire (.png, .ppm, .pgm ou .pnm), ou une fonction
+                output(top, strip) appelée avec la ligne du haut et l'image de chaque bande, dans l'ordre.
+            *args: Les arguments de la méthode draw correspondante, par exemple division_nb.
+            memory_limit (int, optionnel): La mémoire de travail visée, en octets. Defaults to 64 Mio.
+            **kwargs: Les arguments nommés de la méthode draw correspondante.
+
+        Raises:
+            ValueError: Si la méthode ou le format de sortie n'est pas pris en charge.
+            ImportError: Si NumPy n'est pas installé.
+        """
+        if np is None:
+            raise ImportError("streamPicture nécessite NumPy")
+        argument = self.__getDrawArgument(method, args, kwargs)
+        width, height = self.__getOutputSize(method, argument)
+        writer = None
+        if not callable(output):
+            # Le mode des images produites
+            mode = self.__toSourceMode(Image.new(self.m_work_mode, (1, 1))).mode
+            transparency = None if self.m_picture is None else self.m_picture.info.get('transparency')
+            writer = StripWriter(output, (width, height), mode,
+                                 None if self.m_palette is None else self.m_palette.getpalette(), transparency)
+        try:
+            # Un tableau donné à la construction est déjà en mémoire : il est lu directement
+            reader = self.__readPictureRows if self.m_picture is not None else self.__readPictureArray
+            for top, bottom in self.__getStripList(method, argument, memory_limit):
+                strip = self.__toPicture(self.__renderRegion(
+                    method, argument, (0, top, width, bottom), reader))
+                if writer is None:
+                    output(top, strip)
+                else:
+                    raw = strip.tobytes()
+                    writer.write(raw, len(raw) // strip.height)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def updatePicture(self, patch, position: tuple = (0, 0)) -> tuple:
+        """
+        Remplace une zone de l'image d'origine par de nouveaux pixels, par exemple un coup de pinceau dans
+        un éditeur. L'image ou le tableau donné à la construction n'est pas modifié : il est copié à la
+        première mise à jour. Les images produites ensuite par les méthodes draw tiennent compte de la zone
+        remplacée ; refreshPicture met à jour une image produite auparavant sans tout recalculer.
+
+        Args:
+            patch: Les nouveaux pixels : une image PIL, ramenée au mode de l'image d'origine (une image en
+                couleurs indexées du même mode est supposée partager sa palette), ou un tableau NumPy dans le
+                mode de travail, voir ARRAY_MODE.
+            position (tuple, optionnel): La position (gauche, haut) de la zone. Defaults to (0, 0).
+
+        Returns:
+            tuple: La zone (gauche, haut, droite, bas) remplacée, à donner à refreshPicture.
+
+        Raises:
+            ValueError: Si la zone sort de l'image ou si le tableau n'a pas le type et le nombre de
+                composantes du mode de travail.
+        """
+        left, top = position
+        if np is not None and isinstance(patch, np.ndarray):
+            patch_array = patch[:, :, np.newaxis] if patch.ndim == 2 else patch
+            if patch_array.ndim != 3 or patch_array.dtype != self.m_dtype \
+                    or patch_array.shape[2] != Image.getmodebands(self.m_work_mode):
+                raise ValueError(f"Tableau non pris en charge : {patch.dtype} {patch.shape}")
+            size = (patch_array.shape[1], patch_array.shape[0])
+            source_patch = None
+            if self.m_picture is not None:
+                source_patch = self.__toSourceMode(
+                    Image.fromarray(patch_array[:, :, 0] if patch_array.shape[2] == 1 else patch_array))
+        else:
+            size = patch.size
+            # Une image du mode d'origine est gardée telle quelle, pour garder ses indices de couleur ; les
+            # autres sont ramenées au mode d'origine comme les images produites
+            source_patch = patch if patch.mode == self.m_mode else self.__toSourceMode(self.__toWorkMode(patch))
+            patch_array = None
+        if source_patch is not None and self.m_mode != self.m_work_mode:
+            # Les pixels de travail sont ceux que l'image d'origine garde, par exemple après la palette
+            patch_array = None
+        box = (left, top, left + size[0], top + size[1])
+        if left < 0 or top < 0 or box[2] > self.m_size[0] or box[3] > self.m_size[1]:
+            raise ValueError(f"La zone {box} sort de l'image {self.m_size}")
+        # Les pixels donnés à la construction appartiennent à l'appelant, et le tableau construit à partir
+        # d'une image PIL est en lecture seule
+        if not self.m_updated and self.m_picture is not None:
+            self.m_picture = self.m_picture.copy()
+        if self.m_picture is not None:
+            self.m_picture.paste(source_patch, (left, top))
+        if self.m_picture_array is not None:
+            if not self.m_updated or not self.m_picture_array.flags.writeable:
+                self.m_picture_array = self.m_picture_array.copy()
+            if patch_array is None:
+                patch_array = np.asarray(self.__toWorkMode(source_patch))
+                if patch_array.ndim == 2:
+                    patch_array = patch_array[:, :, np.newaxis]
+            self.m_picture_array[top:box[3], left:box[2]] = patch_array
+        self.m_updated = True
+        if self.m_reader is not None:
+            self.m_reader = BACKEND_DICT[self.m_backend](self.__toWorkMode(self.m_picture))
+            if self.m_instrument is not None:
+                self.m_reader.getpixel = self.__getInstrumentedCall(
+                    self.m_reader.getpixel, 'pixel_read', 'pixels_read')
+            self.m_read_pixel = self.__getWeightedReader(self.m_reader.getpixel)
+        # L'image intégrale et l'empreinte du cache dépendent de toute l'image
+        self.m_integral_array = None
+        self.m_picture_digest = None
+        return box
+
+    def refreshPicture(self, output: Image, box: tuple, method: str, *args, **kwargs) -> list:
+        """
+        Met à jour sur place une image produite par une méthode draw avant un appel à updatePicture : seules
+        les sections qui lisent la zone remplacée (avec la marge du flou pour blur, d'un pixel d'origine
+        pour enhance) sont recalculées, en lisant leurs seuls pixels, et collées dans l'image. Le coût suit la
+        taille de la zone remplacée plutôt que celle de l'image.
+
+        Args:
+            output (Image): L'image produite par la méthode avec les mêmes arguments, modifiée sur place.
+            box (tuple): La zone (gauche, haut, droite, bas) remplacée, renvoyée par updatePicture.
+            method (str): La méthode : 'square', 'triangle', 'circle', 'blur' ou 'enhance'.
+            *args: Les arguments de la méthode draw correspondante, par exemple division_nb.
+            **kwargs: Les arguments nommés de la méthode draw correspondante.
+
+        Returns:
+            list: Les zones (gauche, haut, droite, bas) de l'image produite qui ont été recalculées.
+
+        Raises:
+            ValueError: Si la méthode n'existe pas ou si l'image n'a pas la taille de l'image produite.
+            ImportError: Si NumPy n'est pas installé.
+        """
+        if np is None:
+            raise ImportError("refreshPicture nécessite NumPy")
+        argument = self.__getDrawArgument(method, args, kwargs)
+        size = self.__getOutputSize(method, argument)
+        if output.size != size:
+            raise ValueError(f"L'image {output.size} n'a pas la taille de l'image produite {size}")
+        box_list = _mergeBoxList(self.__getAffectedBoxList(method, argument, box))
+        for left, top, right, bottom in box_list:
+            output.paste(self.__toPicture(self.__renderRegion(
+                method, argument, (left, top, right, bottom), self.__readPictureArray)), (left, top))
+        return box_list
+
+    def renderArray(self, method: str, *args, out=None, **kwargs):
+        """
+        Calcule l'image produite par une méthode sous forme de tableau NumPy, sans passer par une image PIL
+        ni copier l'image produite. Pour un tableau ou un tampon donné à la construction, le tableau produit
+        a son type et son nombre de composantes ; les autres images sont rendues dans le mode de travail,
+        voir WORK_MODE. Ni le cache ni le calcul en parallèle ne sont utilisés.
+
+        Args:
+            method (str): La méthode : 'square', 'triangle', 'circle', 'blur' ou 'enhance'.
+            *args: Les arguments de la méthode draw correspondante, par exemple division_nb.
+            out (optionnel): Un tableau NumPy ou un tampon modifiable (bytearray, memoryview...) de la taille
+                et du type de l'image produite, dans lequel elle est écrite, par exemple le même à chaque
+                image d'une vidéo. Par défaut, un nouveau tableau.
+            **kwargs: Les arguments nommés de la méthode draw correspondante.
 
         Returns:
-            Image: l'image améliorée
+            numpy.ndarray: L'image produite (hauteur, largeur, composantes), ou (hauteur, largeur) pour une
+            seule composante. Avec out, un tableau qui partage sa mémoire.
+
+        Raises:
+            ValueError: Si la méthode n'existe pas, ou si out n'a pas la taille ou le type de l'image produite.
+            ImportError: Si NumPy n'est pas installé.
         """
-        width, height = self.m_picture.size
-        enhance_picture = Image.new('RGB', (width*2, height*2))
-        new_width, new_height = enhance_picture.size
-        for x in range(new_width):
-            for y in range(new_height):
-                if self.__even(x) and self.__even(y):
-                    r, g, b = self.m_picture.getpixel((x/2, y/2))
-                    enhance_picture.putpixel((x, y), (r, g, b))
+        if np is None:
+            raise ImportError("renderArray nécessite NumPy")
+        argument = self.__getDrawArgument(method, args, kwargs)
+        pixelated_array = self.__renderRegion(method, argument)
+        if pixelated_array.shape[2] == 1:
+            pixelated_array = pixelated_array[:, :, 0]
+        if out is None:
+            return pixelated_array
+        if isinstance(out, np.ndarray):
+            out_array = out[:, :, 0] if out.ndim == 3 and out.shape[2] == 1 and pixelated_array.ndim == 2 else out
+        else:
+            out_array = np.frombuffer(out, dtype=self.m_dtype)
+            if out_array.size == pixelated_array.size:
+                out_array = out_array.reshape(pixelated_array.shape)
+        if out_array.shape != pixelated_array.shape or out_array.dtype != self.m_dtype:
+            raise ValueError(f"Tableau de sortie non pris en charge : {out_array.dtype} {out_array.shape}, "
+                             f"{self.m_dtype} {pixelated_array.shape} attendu")
+        np.copyto(out_array, pixelated_array)
+        return out_array
+
+    def getLazyPicture(self, method: str, *args, **kwargs):
+        """
+        Renvoie l'image produite par une méthode sans la calculer : seules les parties demandées ensuite à
+        l'objet renvoyé (une zone, une tuile ou une miniature) sont calculées, voir LazyPicture.
+
+        Args:
+            method (str): La méthode : 'square', 'triangle', 'circle', 'blur' ou 'enhance'.
+            *args: Les arguments de la méthode draw correspondante, par exemple division_nb.
+            **kwargs: Les arguments nommés de la méthode draw correspondante.
+
+        Returns:
+            LazyPicture: L'image produite, à calculer.
+
+        Raises:
+            ValueError: Si la méthode n'existe pas.
+            ImportError: Si NumPy n'est pas installé.
+        """
+        if np is None:
+            raise ImportError("getLazyPicture nécessite NumPy")
+        argument = self.__getDrawArgument(method, args, kwargs)
+        return LazyPicture(self, method, argument, self.__getOutputSize(method, argument), args, kwargs)
+
+    def iterPictures(self, method: str, value_list, *args, **kwargs):
+        """
+        Calcule une suite d'images d'une méthode en faisant varier son premier paramètre (division_nb,
+        blur_nb ou factor), une image à la fois. Les calculs qui ne dépendent que de l'image d'origine
+        (image intégrale, masques, tableau des pixels) sont faits une seule fois pour toute la suite.
+
+        Args:
+            method (str): La méthode : 'square', 'triangle', 'circle', 'blur' ou 'enhance'.
+            value_list: Les valeurs successives du premier paramètre, par exemple range(2, 50).
+            *args: Les autres arguments de la méthode draw correspondante.
+            **kwargs: Les arguments nommés de la méthode draw correspondante.
+
+        Yields:
+            Image: L'image de chaque valeur, dans l'ordre.
+
+        Raises:
+            ValueError: Si la méthode n'existe pas.
+        """
+        if method not in self.METHOD_DICT:
+            raise ValueError(f"Méthode inconnue : {method}")
+        draw = getattr(self, self.METHOD_DICT[method])
+        for value in value_list:
+            yield draw(value, *args, **kwargs)
+
+    def saveAnimation(self, path: str, method: str, value_list, *args, duration: int = 100, loop: int = 0,
+                      **kwargs):
+        """
+        Enregistre une animation GIF, WebP ou APNG des images d'une méthode pour une suite de valeurs de son
+        premier paramètre, par exemple une pixelisation de plus en plus fine. Les images sont calculées
+        par iterPictures et écrites au fur et à mesure : une seule est gardée en mémoire à la fois.
+
+        Args:
+            path (str): Le chemin du fichier, dont l'extension (.gif, .webp, .png ou .apng) choisit le format.
+            method (str): La méthode : 'square', 'triangle', 'circle', 'blur' ou 'enhance'.
+            value_list: Les valeurs successives du premier paramètre, par exemple range(2, 50).
+            *args: Les autres arguments de la méthode draw correspondante.
+            duration (int, optionnel): La durée d'affichage de chaque image, en millisecondes. Defaults to 100.
+            loop (int, optionnel): Le nombre de répétitions, 0 pour répéter sans fin. Defaults to 0.
+            **kwargs: Les arguments nommés de la méthode draw correspondante.
+
+        Raises:
+            ValueError: Si la méthode ou le format n'est pas pris en charge, ou si value_list est vide.
+        """
+        value_list = list(value_list)
+        if not value_list:
+            raise ValueError("L'animation doit contenir au moins une image")
+        frame_iterator = self.iterPictures(method, value_list, *args, **kwargs)
+        if os.path.splitext(str(path))[1].lower() == '.webp':
+            _FrameSequence(map(_getEightBitPicture, frame_iterator), len(value_list)).save(
+                path, 'WEBP', save_all=True, duration=duration, loop=loop)
+            return
+        frame = next(frame_iterator)
+        # Les images en couleurs indexées partagent la palette de l'image d'origine
+        palette = frame.getpalette() if frame.mode == 'P' else None
+        with AnimationWriter(path, frame.size, frame.mode, len(value_list), duration, loop, palette,
+                             frame.info.get('transparency')) as writer:
+            writer.write(frame)
+            for frame in frame_iterator:
+                writer.write(frame)
+
+
+class SequenceRenderer():
+
+    def __init__(self, method: str, *args, block_size: int = 16, **kwargs):
+        """
+        Applique une méthode à une suite d'images, par exemple les images d'une vidéo à flouter, en tirant
+        parti de ce que deux images successives diffèrent peu : chaque image est comparée à la précédente par
+        blocs, et seules les sections qui lisent un bloc modifié sont recalculées puis recopiées dans l'image
+        produite précédente. Sur des images presque fixes, le coût suit la quantité de mouvement plutôt que
+        la résolution ; seule la comparaison parcourt toute l'image.
+
+        Args:
+            method (str): La méthode : 'square', 'triangle', 'circle', 'blur' ou 'enhance'.
+            *args: Les arguments de la méthode draw correspondante, par exemple division_nb.
+            block_size (int, optionnel): Le côté des blocs comparés, en pixels. Defaults to 16.
+            **kwargs: Les arguments nommés de la méthode draw correspondante.
+
+        Raises:
+            ValueError: Si la méthode n'existe pas ou si block_size est inférieur à 1.
+            ImportError: Si NumPy n'est pas installé.
+        """
+        if np is None:
+            raise ImportError("SequenceRenderer nécessite NumPy")
+        if method not in PixelMaster.METHOD_DICT:
+            raise ValueError(f"Méthode inconnue : {method}")
+        if block_size < 1:
+            raise ValueError(f"La taille des blocs doit être au moins 1 : {block_size}")
+        self.m_method = method
+        self.m_args = args
+        self.m_kwargs = kwargs
+        self.m_block_size = block_size
+        # Instance de l'image précédente et pixels produits pour elle, dans le mode de travail
+        self.m_master = None
+        self.m_output_array = None
+        self.frames = 0
+        self.full_frames = 0
+        self.pixels_rendered = 0
+        self.pixels_output = 0
+
+    def render(self, frame) -> Image:
+        """
+        Calcule l'image produite pour l'image suivante de la suite.
+
+        Args:
+            frame: L'image, image PIL ou tableau NumPy (voir PixelMaster). Un tableau est copié, pour que la
+                comparaison avec l'image suivante ne dépende pas d'un tampon réutilisé par l'appelant.
+
+        Returns:
+            Image: L'image produite, identique à celle de la méthode draw correspondante.
+        """
+        if isinstance(frame, np.ndarray):
+            frame = frame.copy()
+        master = PixelMaster(frame, 'numpy')
+        picture, self.m_output_array, box_list = master._renderFrame(
+            self.m_method, self.m_args, self.m_kwargs, self.m_master, self.m_output_array, self.m_block_size)
+        self.m_master = master
+        width, height = picture.size
+        self.frames += 1
+        if box_list == [(0, 0, width, height)]:
+            self.full_frames += 1
+        self.pixels_rendered += sum((right - left) * (bottom - top) for left, top, right, bottom in box_list)
+        self.pixels_output += width * height
+        return picture
+
+    def reset(self):
+        """
+        Oublie l'image précédente : l'image suivante sera entièrement recalculée, par exemple après un
+        changement de plan.
+        """
+        self.m_master = None
+        self.m_output_array = None
+
+    def getStats(self) -> dict:
+        """
+        Renvoie les compteurs de la suite.
+
+        Returns:
+            dict: Le nombre d'images, dont celles entièrement recalculées, et la part des pixels produits qui
+            ont été recalculés.
+        """
+        return {'frames': self.frames, 'full_frames': self.full_frames,
+                'rendered_ratio': self.pixels_rendered / self.pixels_output if self.pixels_output else 0.0}
+
+
+class LazyPicture():
+
+    def __init__(self, master: PixelMaster, method: str, argument: dict, size: tuple, args: tuple, kwargs: dict):
+        """
+        Image produite par une méthode draw, calculée seulement pour les parties demandées : crop, tile et
+        thumbnail ne calculent que les sections qui touchent la zone demandée, une miniature étant calculée
+        par bandes réduites au fur et à mesure. toImage calcule l'image entière, qui est ensuite gardée et
+        découpée par crop et tile. Construite par PixelMaster.getLazyPicture.
+
+        Args:
+            master (PixelMaster): L'instance de l'image d'origine.
+            method (str): La méthode : une clé de PixelMaster.METHOD_DICT.
+            argument (dict): Les paramètres de la méthode draw, sans workers.
+            size (tuple): La largeur et la hauteur de l'image produite.
+            args (tuple): Les arguments positionnels donnés à la méthode draw.
+            kwargs (dict): Les arguments nommés donnés à la méthode draw.
+        """
+        self.m_master = master
+        self.m_method = method
+        self.m_argument = argument
+        self.m_args = args
+        self.m_kwargs = kwargs
+        self.size = size
+        # Image entière, une fois calculée par toImage
+        self.m_picture = None
+
+    @property
+    def width(self) -> int:
+        """
+        Renvoie la largeur de l'image produite.
+
+        Returns:
+            int: La largeur, en pixels.
+        """
+        return self.size[0]
+
+    @property
+    def height(self) -> int:
+        """
+        Renvoie la hauteur de l'image produite.
+
+        Returns:
+            int: La hauteur, en pixels.
+        """
+        return self.size[1]
+
+    def toImage(self) -> Image:
+        """
+        Calcule l'image entière avec la méthode draw, qui profite du cache et du calcul en parallèle de
+        l'instance, et la garde pour les appels suivants.
+
+        Returns:
+            Image: Une copie de l'image produite.
+        """
+        if self.m_picture is None:
+            self.m_picture = getattr(self.m_master, PixelMaster.METHOD_DICT[self.m_method])(
+                *self.m_args, **self.m_kwargs)
+        return self.m_picture.copy()
+
+    def crop(self, box: tuple) -> Image:
+        """
+        Calcule une zone de l'image produite. Comme pour Image.crop, la partie de la zone hors de l'image est
+        remplie de zéros.
+
+        Args:
+            box (tuple): La zone (gauche, haut, droite, bas).
+
+        Returns:
+            Image: La zone.
+        """
+        if self.m_picture is not None:
+            return self.m_picture.crop(box)
+        left, top, right, bottom = (int(value) for value in box)
+        width, height = self.size
+        inner_box = (max(left, 0), max(top, 0), min(right, width), min(bottom, height))
+        if inner_box[0] >= inner_box[2] or inner_box[1] >= inner_box[3]:
+            # Un seul pixel calculé donne le mode et la palette d'une zone vide
+            inner_box = (0, 0, 1, 1)
+        picture = self.m_master._renderLazy(self.m_method, self.m_argument, inner_box)
+        if inner_box == (left, top, right, bottom):
+            return picture
+        return picture.crop((left - inner_box[0], top - inner_box[1], right - inner_box[0], bottom - inner_box[1]))
+
+    def getMaxZoom(self, tile_size: int = 256) -> int:
+        """
+        Renvoie le niveau de zoom des tuiles à pleine résolution : au niveau 0, l'image tient dans une
+        seule tuile, et chaque niveau double la résolution du précédent.
+
+        Args:
+            tile_size (int, optionnel): Le côté des tuiles, en pixels. Defaults to 256.
+
+        Returns:
+            int: Le niveau de zoom maximal.
+        """
+        max_zoom = 0
+        while tile_size << max_zoom < max(self.size):
+            max_zoom += 1
+        return max_zoom
+
+    def tile(self, x: int, y: int, z: int, tile_size: int = 256) -> Image:
+        """
+        Calcule une tuile pour une visionneuse à zoom profond. Au niveau z, l'image est réduite d'un facteur
+        2 ** (getMaxZoom() - z) puis découpée en tuiles de tile_size pixels de côté, celles des bords droit et
+        bas étant plus petites. Seule la zone de l'image produite couverte par la tuile est calculée.
+
+        Args:
+            x (int): La colonne de la tuile.
+            y (int): La ligne de la tuile.
+            z (int): Le niveau de zoom, de 0 à getMaxZoom(tile_size).
+            tile_size (int, optionnel): Le côté des tuiles, en pixels. Defaults to 256.
+
+        Returns:
+            Image: La tuile.
+
+        Raises:
+            ValueError: Si le niveau ou la tuile n'existe pas.
+        """
+        max_zoom = self.getMaxZoom(tile_size)
+        if not 0 <= z <= max_zoom:
+            raise ValueError(f"Niveau de zoom inconnu : {z} (de 0 à {max_zoom})")
+        scale = 2 ** (max_zoom - z)
+        span = tile_size * scale
+        width, height = self.size
+        if x < 0 or y < 0 or x * span >= width or y * span >= height:
+            raise ValueError(f"Tuile inconnue au niveau {z} : {(x, y)}")
+        box = (x * span, y * span, min((x + 1) * span, width), min((y + 1) * span, height))
+        if scale == 1:
+            return self.crop(box)
+        return self.m_master._renderLazy(self.m_method, self.m_argument, box, scale)
+
+    def thumbnail(self, size: tuple, resample=Image.Resampling.BICUBIC) -> Image:
+        """
+        Calcule une miniature qui tient dans size en gardant les proportions, sans construire l'image
+        entière : l'image est calculée par bandes réduites d'un facteur entier dans le mode de travail, puis
+        la miniature est rééchantillonnée, comme le fait Image.thumbnail avec reducing_gap=2.
+
+        Args:
+            size (tuple): La largeur et la hauteur maximales.
+            resample (optionnel): Le filtre du dernier rééchantillonnage. Defaults to Image.Resampling.BICUBIC.
+
+        Returns:
+            Image: La miniature, jamais plus grande que l'image produite.
+        """
+        width, height = self.size
+        ratio = min(size[0] / width, size[1] / height, 1)
+        thumbnail_size = (max(1, round(width * ratio)), max(1, round(height * ratio)))
+        # Un facteur de réduction qui laisse au moins deux fois la taille visée au rééchantillonnage
+        scale = max(1, int(1 / ratio / 2))
+        picture = self.m_master._renderLazy(self.m_method, self.m_argument, (0, 0, width, height), scale)
+        if picture.size != thumbnail_size:
+            picture = picture.resize(thumbnail_size, resample)
+        return picture
+
+    def __repr__(self):
+        return f"LazyPicture({self.m_method!r}, {self.m_argument!r}, size={self.size!r})"
+
+
+class BatchResult():
+
+    def __init__(self, path: str, effect: tuple, picture: Image = None, output: str = None,
+                 error: Exception = None, size: tuple = None, duration: float = None):
+        """
+        Résultat d'un effet appliqué à une image par processBatch.
+
+        Args:
+            path (str): Le chemin de l'image d'origine.
+            effect (tuple): L'effet appliqué, tel que donné à processBatch.
+            picture (Image, optionnel): L'image produite, si elle n'a pas été enregistrée.
+            output (str, optionnel): Le chemin de l'image produite, si elle a été enregistrée.
+            error (Exception, optionnel): L'erreur survenue en ouvrant l'image ou en appliquant l'effet.
+            size (tuple, optionnel): La largeur et la hauteur de l'image d'origine, si elle a pu être ouverte.
+            duration (float, optionnel): La durée du calcul et de l'enregistrement de l'effet, en secondes.
+        """
+        self.path = path
+        self.effect = effect
+        self.picture = picture
+        self.output = output
+        self.error = error
+        self.size = size
+        self.duration = duration
+
+    @property
+    def ok(self) -> bool:
+        """
+        Indique si l'effet a été appliqué sans erreur.
+
+        Returns:
+            bool: True si aucune erreur n'est survenue.
+        """
+        return self.error is None
+
+    def __repr__(self):
+        if self.error is not None:
+            state = f"error={self.error!r}"
+        elif self.output is not None:
+            state = f"output={self.output!r}"
+        else:
+            state = f"picture={self.picture!r}"
+        return f"BatchResult({self.path!r}, {self.effect!r}, {state})"
+
+
+def _getDraftScale(size: tuple, method: str, division_nb: int, tolerance: float, max_value: int,
+                   edge: bool = False) -> int:
+    """
+    Renvoie le plus grand facteur de réduction qui garde l'erreur sur la couleur de chaque section sous
+    tolerance. Un pixel réduit à cheval sur deux sections mêle leurs couleurs : sur chaque bord d'une
+    section, au plus scale / 4 pixels par pixel de bord sont comptés à tort, soit une erreur d'au plus
+    max_value * scale / 2 * (1 / largeur + 1 / hauteur) de la section. La borne est prise sur les sections
+    entières de la grille.
+
+    Args:
+        size (tuple): La largeur et la hauteur de l'image entière.
+        method (str): La méthode : 'square' ou 'circle'.
+        division_nb (int): Le nombre de divisions de l'image.
+        tolerance (float): L'erreur tolérée sur chaque composante, dans les unités des pixels.
+        max_value (int): La plus grande valeur d'une composante.
+        edge (bool, optionnel): Si True, la borne porte aussi sur la dernière section incomplète de chaque
+            axe de la grille proportionnelle ('square'). Defaults to False, ces sections étant lues à pleine
+            résolution par renderFile.
+
+    Returns:
+        int: Le facteur de réduction, 1 pour décoder l'image entière.
+    """
+    width, height = size
+    if method == 'circle':
+        section_width = section_height = min(width, height) // division_nb
+    else:
+        section_width, section_height = width // division_nb, height // division_nb
+    if tolerance <= 0 or section_width < 1 or section_height < 1:
+        return 1
+    if edge and method != 'circle':
+        # La grille proportionnelle finit par une section de taille % section + 1 pixels : un seul pixel
+        # quand la taille est un multiple de la section
+        section_width = min(section_width, width % section_width + 1)
+        section_height = min(section_height, height % section_height + 1)
+    return max(1, int(2 * tolerance / (max_value * (1 / section_width + 1 / section_height))))
+
+
+def renderFile(path, method: str, *args, tolerance: float = 2.0, backend: str = None, **kwargs) -> Image:
+    """
+    Ouvre une image et lui applique une méthode draw. Pour 'square' et 'circle', dont les grandes sections
+    couvrent des centaines de pixels, l'image est décodée à la résolution la plus réduite qui garde l'erreur
+    estimée sur la couleur de chaque section sous tolerance : draft() réduit les JPEG par 2, 4 ou 8 pendant
+    le décodage, puis reduce() complète la réduction. Les sections restent celles de l'image entière et
+    l'image produite a sa taille. Quand la dernière colonne ou la dernière ligne de sections de 'square' est
+    trop étroite pour la réduction, l'image est décodée entière et ces sections sont sommées exactement,
+    seules les autres étant lues dans l'image réduite. Les autres méthodes et les autres images décodent
+    l'image entière.
+
+    Args:
+        path: Le chemin de l'image, ou un fichier ouvert en binaire.
+        method (str): La méthode : 'square', 'triangle', 'circle', 'blur' ou 'enhance'.
+        *args: Les arguments de la méthode draw correspondante, par exemple division_nb.
+        tolerance (float, optionnel): L'erreur tolérée sur chaque composante de la couleur des sections,
+            en niveaux (sur 255). 0 décode toujours l'image entière. Defaults to 2.0.
+        backend (str, optionnel): Le moteur d'accès aux pixels. La réduction nécessite le moteur 'numpy'.
+            Par défaut, le plus rapide disponible.
+        **kwargs: Les arguments nommés de la méthode draw correspondante.
+
+    Returns:
+        Image: L'image produite, à la taille de l'image d'origine.
+
+    Raises:
+        ValueError: Si la méthode n'existe pas.
+        OSError: Si l'image ne peut pas être lue.
+    """
+    if method not in PixelMaster.METHOD_DICT:
+        raise ValueError(f"Méthode inconnue : {method}")
+    draw_name = PixelMaster.METHOD_DICT[method]
+    with Image.open(path) as picture:
+        scale = 1
+        exact_edge = False
+        # Les modes sans alpha que reduce() prend en charge, dont ceux des JPEG
+        if method in ('square', 'circle') and picture.mode in ('L', 'RGB', 'CMYK') and np is not None \
+                and backend in (None, 'numpy') and kwargs.get('region') is None:
+            argument = inspect.signature(getattr(PixelMaster, draw_name)).bind(None, *args, **kwargs)
+            division_nb = argument.arguments['division_nb']
+            scale = _getDraftScale(picture.size, method, division_nb, tolerance, 255)
+            # La dernière section de chaque axe de la grille carrée n'a parfois que quelques pixels : elle
+            # est alors lue dans l'image entière, que draft() ne doit pas réduire
+            exact_edge = scale > _getDraftScale(picture.size, method, division_nb, tolerance, 255, True)
+        if scale == 1:
+            return getattr(PixelMaster(picture, backend), draw_name)(*args, **kwargs)
+        size = picture.size
+        if not exact_edge:
+            # draft() choisit la plus forte réduction du décodeur qui garde au moins la taille demandée ;
+            # il est sans effet hors JPEG
+            picture.draft(picture.mode, (math.ceil(size[0] / scale), math.ceil(size[1] / scale)))
+        draft_scale = max(1, round(size[0] / picture.size[0]))
+        reduced_picture = picture
+        if scale // draft_scale > 1:
+            reduced_picture = picture.reduce(scale // draft_scale)
+        scale = draft_scale * max(1, scale // draft_scale)
+        return PixelMaster(reduced_picture, 'numpy')._renderDraft(
+            method, args, kwargs, size, scale, picture if exact_edge else None)
+
+
+def _getEffectCall(effect: tuple) -> tuple:
+    """
+    Décompose un effet de processBatch en méthode draw et arguments.
+
+    Args:
+        effect (tuple): L'effet : (méthode, arguments...) avec éventuellement un dict d'arguments nommés
+            en dernier, par exemple ('square', 4) ou ('blur', 2, {'kernel': 'box'}).
+
+    Returns:
+        tuple: Le nom de la méthode draw, ses arguments positionnels et ses arguments nommés.
+
+    Raises:
+        ValueError: Si la méthode n'existe pas.
+    """
+    if isinstance(effect, str):
+        effect = (effect,)
+    method, *args = effect
+    if method not in PixelMaster.METHOD_DICT:
+        raise ValueError(f"Méthode inconnue : {method}")
+    kwargs = args.pop() if args and isinstance(args[-1], dict) else {}
+    return PixelMaster.METHOD_DICT[method], tuple(args), kwargs
+
+
+def _getEffectName(path: str, effect: tuple, extension: str) -> str:
+    """
+    Construit le nom du fichier produit par un effet, par exemple photo_square_4.png.
+
+    Args:
+        path (str): Le chemin de l'image d'origine.
+        effect (tuple): L'effet appliqué.
+        extension (str): L'extension du fichier produit.
+
+    Returns:
+        str: Le nom du fichier.
+    """
+    def getPart(value) -> str:
+        if isinstance(value, (tuple, list)):
+            return '-'.join(str(item) for item in value)
+        return str(value)
+
+    if isinstance(effect, str):
+        effect = (effect,)
+    part_list = [os.path.splitext(os.path.basename(path))[0]]
+    for value in effect:
+        if isinstance(value, dict):
+            part_list.extend(f"{key}-{getPart(value[key])}" for key in sorted(value))
+        else:
+            part_list.append(getPart(value))
+    return '_'.join(part_list) + extension
+
+
+def _processBatchPicture(path: str, effect_list: list, output_dir: str, backend: str, extension: str) -> list:
+    """
+    Ouvre une image une seule fois et lui applique tous les effets, dans un processus du pool de
+    processBatch. Une erreur n'interrompt que l'effet concerné.
+
+    Args:
+        path (str): Le chemin de l'image.
+        effect_list (list): Les effets à appliquer.
+        output_dir (str): Le dossier où enregistrer les images produites, ou None pour les renvoyer.
+        backend (str): Le moteur d'accès aux pixels.
+        extension (str): L'extension des fichiers produits.
+
+    Returns:
+        list: Un BatchResult par effet, dans l'ordre des effets.
+    """
+    try:
+        with Image.open(path) as picture:
+            picture.load()
+        master = PixelMaster(picture, backend)
+    except Exception as error:
+        return [BatchResult(path, effect, error=error) for effect in effect_list]
+    result_list = []
+    for effect in effect_list:
+        start = time.perf_counter()
+        try:
+            method, args, kwargs = _getEffectCall(effect)
+            effect_picture = getattr(master, method)(*args, **kwargs)
+            if output_dir is None:
+                result = BatchResult(path, effect, picture=effect_picture)
+            else:
+                output = os.path.join(output_dir, _getEffectName(path, effect, extension))
+                effect_picture.save(output)
+                result = BatchResult(path, effect, output=output)
+        except Exception as error:
+            result = BatchResult(path, effect, error=error)
+        result.size = picture.size
+        result.duration = time.perf_counter() - start
+        result_list.append(result)
+    return result_list
+
+
+def processBatch(source, effect_list: list, output_dir: str = None, workers: int = None, backend: str = None,
+                 extension: str = '.png'):
+    """
+    Applique une liste d'effets à une liste d'images, en répartissant les images entre plusieurs processus.
+    Chaque image n'est ouverte et décodée qu'une fois pour tous ses effets, et les résultats sont renvoyés
+    au fur et à mesure, dans l'ordre où les images sont terminées. Seules quelques images sont en cours à
+    la fois, quel que soit leur nombre.
+
+    Args:
+        source: Un dossier (toutes les images qu'il contient, par ordre alphabétique) ou une liste de
+            chemins d'images.
+        effect_list (list): Les effets : (méthode, arguments...) avec éventuellement un dict d'arguments
+            nommés en dernier, par exemple [('square', 4), ('circle', 4), ('blur', 2, {'kernel': 'box'})].
+        output_dir (str, optionnel): Le dossier où enregistrer les images produites, sous le nom
+            image_méthode_arguments. Par défaut, les images produites sont renvoyées dans les résultats.
+        workers (int, optionnel): Le nombre de processus. 1 traite les images dans ce processus. Par
+            défaut, le nombre de cœurs.
+        backend (str, optionnel): Le moteur d'accès aux pixels, voir PixelMaster.
+        extension (str, optionnel): L'extension, et donc le format, des fichiers produits. Defaults to '.png'.
+
+    Yields:
+        BatchResult: Le résultat de chaque effet de chaque image. Une image illisible ou un effet en erreur
+        donne un résultat dont error est renseigné, sans interrompre les autres.
+
+    Raises:
+        ValueError: Si un effet n'existe pas ou si workers est inférieur à 1.
+    """
+    effect_list = list(effect_list)
+    for effect in effect_list:
+        _getEffectCall(effect)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"Le nombre de processus doit être au moins 1 : {workers}")
+    if isinstance(source, (str, os.PathLike)) and os.path.isdir(source):
+        image_extension = set(Image.registered_extensions())
+        source = sorted(os.path.join(source, name) for name in os.listdir(source)
+                        if os.path.splitext(name)[1].lower() in image_extension)
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    path_iterator = iter(source)
+    if workers == 1:
+        for path in path_iterator:
+            yield from _processBatchPicture(path, effect_list, output_dir, backend, extension)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        while True:
+            # Deux images par processus au plus en attente : la liste des chemins n'est parcourue qu'au fur
+            # et à mesure
+            for path in path_iterator:
+                future = executor.submit(_processBatchPicture, path, effect_list, output_dir, backend, extension)
+                pending[future] = path
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                return
+            done = wait(pending, return_when=FIRST_COMPLETED)[0]
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    result_list = future.result()
+                except Exception as error:
+                    # Le processus a échoué sans pouvoir renvoyer de résultat, par exemple faute de mémoire
+                    result_list = [BatchResult(path, effect, error=error) for effect in effect_list]
+                yield from result_list
+
+
+def _renderEffect(picture, draw_name: str, argument: dict, backend: str) -> Image:
+    """
+    Calcule l'image produite par une méthode draw, dans l'exécuteur de RenderService.
+
+    Args:
+        picture: L'image d'origine, image PIL ou tableau NumPy.
+        draw_name (str): Le nom de la méthode draw.
+        argument (dict): Les arguments nommés de la méthode draw.
+        backend (str): Le moteur d'accès aux pixels.
+
+    Returns:
+        Image: L'image produite.
+    """
+    return getattr(PixelMaster(picture, backend), draw_name)(**argument)
+
+
+class RenderService():
+
+    def __init__(self, concurrency: int = None, executor=None, backend: str = None, max_waiting: int = None,
+                 cache: ResultCache = None):
+        """
+        Service asynchrone de calcul des images, pour les serveurs asyncio : les méthodes draw, longues et
+        synchrones, sont exécutées dans un exécuteur sans bloquer la boucle d'événements. Au plus concurrency
+        calculs tournent à la fois, les suivants attendent leur tour, et les demandes identiques (même image,
+        même méthode, mêmes paramètres) arrivées pendant un calcul en attendent le résultat au lieu d'en
+        lancer un autre.
+
+        Args:
+            concurrency (int, optionnel): Le nombre maximal de calculs simultanés. Par défaut, le nombre de
+                cœurs.
+            executor (optionnel): L'exécuteur des calculs, par exemple un ThreadPoolExecutor. Par défaut, un
+                ProcessPoolExecutor de concurrency processus, créé au premier calcul et arrêté par close.
+            backend (str, optionnel): Le moteur d'accès aux pixels, voir PixelMaster.
+            max_waiting (int, optionnel): Le nombre maximal de calculs en attente d'une place ; au-delà, render
+                refuse les nouveaux calculs. Par défaut, pas de limite.
+            cache (ResultCache, optionnel): Un cache consulté avant chaque calcul et complété après. Par
+                défaut, pas de cache.
+
+        Raises:
+            ValueError: Si concurrency est inférieur à 1.
+        """
+        self.m_concurrency = concurrency or os.cpu_count() or 1
+        if self.m_concurrency < 1:
+            raise ValueError(f"Le nombre de calculs simultanés doit être au moins 1 : {concurrency}")
+        self.m_executor = executor
+        self.m_own_executor = executor is None
+        self.m_backend = backend
+        self.m_max_waiting = max_waiting
+        self.m_cache = cache
+        # Places libres, et places attendues par les calculs en attente, dans l'ordre d'arrivée
+        self.m_free_slot = self.m_concurrency
+        self.m_slot_queue = deque()
+        # Calcul en cours pour chaque clé de ResultCache
+        self.m_task_dict = {}
+        self.m_waiting = 0
+        self.m_running = 0
+        self.computed = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    async def render(self, picture, method: str, *args, **kwargs) -> Image:
+        """
+        Calcule l'image produite par une méthode sans bloquer la boucle d'événements. Si la même image est
+        déjà en cours de calcul avec la même méthode et les mêmes paramètres, son résultat est partagé.
+
+        Args:
+            picture: L'image d'origine, image PIL ou tableau NumPy, qui ne doit pas être modifiée pendant
+                le calcul.
+            method (str): La méthode : 'square', 'triangle', 'circle', 'blur' ou 'enhance'.
+            *args: Les arguments de la méthode draw correspondante, par exemple division_nb.
+            **kwargs: Les arguments nommés de la méthode draw correspondante.
+
+        Returns:
+            Image: L'image produite, une copie propre à chaque appel.
+
+        Raises:
+            ValueError: Si la méthode n'existe pas.
+            TypeError: Si les arguments ne correspondent pas à la méthode draw.
+            RuntimeError: Si max_waiting calculs attendent déjà une place.
+        """
+        if method not in PixelMaster.METHOD_DICT:
+            raise ValueError(f"Méthode inconnue : {method}")
+        draw_name = PixelMaster.METHOD_DICT[method]
+        argument = inspect.signature(getattr(PixelMaster, draw_name)).bind(None, *args, **kwargs)
+        argument.apply_defaults()
+        argument = dict(argument.arguments)
+        del argument['self']
+        # Le nombre de processus ne change pas l'image produite
+        key_argument = {name: value for name, value in argument.items() if name != 'workers'}
+        loop = asyncio.get_running_loop()
+        picture_digest = await loop.run_in_executor(None, ResultCache.getPictureDigest, picture)
+        key = ResultCache.getKey(picture_digest, method, key_argument)
+        task = self.m_task_dict.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            result = self.m_cache.get(key) if self.m_cache is not None else None
+            if result is not None:
+                return result
+            # La place est réservée dès maintenant : seul un calcul qui n'en trouve pas attend
+            slot = None
+            if self.m_free_slot > 0:
+                self.m_free_slot -= 1
+            else:
+                if self.m_max_waiting is not None and self.m_waiting >= self.m_max_waiting:
+                    self.rejected += 1
+                    raise RuntimeError(f"Trop de calculs en attente : {self.m_waiting}")
+                self.m_waiting += 1
+                slot = loop.create_future()
+                self.m_slot_queue.append(slot)
+            task = loop.create_task(self.__compute(key, picture, draw_name, argument, slot))
+            self.m_task_dict[key] = task
+            task.add_done_callback(functools.partial(self.__forget, key))
+        # Un appel annulé n'annule pas le calcul, que d'autres appels attendent peut-être
+        return (await asyncio.shield(task)).copy()
+
+    async def __compute(self, key: str, picture, draw_name: str, argument: dict, slot=None) -> Image:
+        """
+        Attend, s'il le faut, qu'une place soit libérée puis calcule l'image dans l'exécuteur.
+
+        Args:
+            key (str): La clé de l'image produite.
+            picture: L'image d'origine.
+            draw_name (str): Le nom de la méthode draw.
+            argument (dict): Les arguments nommés de la méthode draw.
+            slot (asyncio.Future, optionnel): La place attendue, terminée par __releaseSlot. Par défaut, une
+                place déjà réservée.
+
+        Returns:
+            Image: L'image produite.
+        """
+        if slot is not None:
+            try:
+                await slot
+            finally:
+                self.m_waiting -= 1
+        self.m_running += 1
+        try:
+            if self.m_executor is None:
+                self.m_executor = ProcessPoolExecutor(max_workers=self.m_concurrency)
+            result = await asyncio.get_running_loop().run_in_executor(
+                self.m_executor, _renderEffect, picture, draw_name, argument, self.m_backend)
+        finally:
+            self.m_running -= 1
+            self.__releaseSlot()
+        self.computed += 1
+        if self.m_cache is not None:
+            self.m_cache.put(key, result)
+        return result
+
+    def __releaseSlot(self):
+        """
+        Donne la place d'un calcul terminé au plus ancien calcul en attente, ou la rend libre.
+        """
+        while self.m_slot_queue:
+            slot = self.m_slot_queue.popleft()
+            if not slot.done():
+                slot.set_result(None)
+                return
+        self.m_free_slot += 1
+
+    def __forget(self, key: str, task):
+        """
+        Retire un calcul terminé des calculs en cours.
+
+        Args:
+            key (str): La clé de l'image produite.
+            task (asyncio.Task): Le calcul.
+        """
+        if self.m_task_dict.get(key) is task:
+            del self.m_task_dict[key]
+        # L'erreur est transmise aux appels qui attendent ; si tous ont été annulés, elle est ignorée
+        if not task.cancelled():
+            task.exception()
+
+    def getStats(self) -> dict:
+        """
+        Renvoie les compteurs du service, pour le dimensionner.
+
+        Returns:
+            dict: Les nombres de calculs terminés, de demandes partagées avec un calcul en cours et de
+            demandes refusées, ainsi que le nombre de calculs en cours et en attente d'une place.
+        """
+        return {'computed': self.computed, 'coalesced': self.coalesced, 'rejected': self.rejected,
+                'running': self.m_running, 'waiting': self.m_waiting, 'in_flight': len(self.m_task_dict)}
+
+    def close(self):
+        """
+        Arrête l'exécuteur créé par le service, après la fin des calculs en cours. Un exécuteur fourni au
+        service n'est pas arrêté.
+        """
+        if self.m_own_executor and self.m_executor is not None:
+            self.m_executor.shutdown()
+            self.m_executor = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+
+def _readPicture(data: bytes) -> Image:
+    """
+    Décode une image reçue par le service HTTP.
+
+    Args:
+        data (bytes): Le fichier de l'image.
+
+    Returns:
+        Image: L'image.
+    """
+    with Image.open(io.BytesIO(data)) as picture:
+        picture.load()
+    return picture
+
+
+def _getPngData(picture: Image) -> bytes:
+    """
+    Encode une image produite en PNG pour le service HTTP.
+
+    Args:
+        picture (Image): L'image.
+
+    Returns:
+        bytes: Le fichier PNG.
+    """
+    output = io.BytesIO()
+    picture.save(output, 'PNG')
+    return output.getvalue()
+
+
+async def _getHttpResponse(service: RenderService, verb: str, target: str, body: bytes) -> tuple:
+    """
+    Traite une requête du service HTTP : POST /méthode?paramètre=valeur avec l'image dans le corps, ou
+    GET /stats pour les compteurs du service.
+
+    Args:
+        service (RenderService): Le service qui calcule les images.
+        verb (str): La méthode HTTP.
+        target (str): Le chemin et les paramètres de la requête.
+        body (bytes): Le corps de la requête.
+
+    Returns:
+        tuple: Le code HTTP, le type du contenu et le contenu de la réponse.
+    """
+    url = urllib.parse.urlsplit(target)
+    method = url.path.strip('/')
+    if method == 'stats':
+        if verb != 'GET':
+            return 405, 'text/plain; charset=utf-8', b"GET attendu"
+        return 200, 'application/json', json.dumps(service.getStats()).encode()
+    if method not in PixelMaster.METHOD_DICT:
+        return 404, 'text/plain; charset=utf-8', f"Méthode inconnue : {method}".encode()
+    if verb != 'POST':
+        return 405, 'text/plain; charset=utf-8', b"POST attendu"
+    loop = asyncio.get_running_loop()
+    try:
+        parameter_dict = inspect.signature(getattr(PixelMaster, PixelMaster.METHOD_DICT[method])).parameters
+        kwargs = {}
+        for name, value in urllib.parse.parse_qsl(url.query):
+            if name not in parameter_dict or name in ('self', 'workers', 'region'):
+                raise ValueError(f"Paramètre inconnu : {name}")
+            kwargs[name] = _getParameterType(parameter_dict[name])(value)
+        picture = await loop.run_in_executor(None, _readPicture, body)
+        picture = await service.render(picture, method, **kwargs)
+        return 200, 'image/png', await loop.run_in_executor(None, _getPngData, picture)
+    except RuntimeError as error:
+        return 503, 'text/plain; charset=utf-8', str(error).encode()
+    except (ValueError, TypeError, OSError) as error:
+        return 400, 'text/plain; charset=utf-8', str(error).encode()
+    except Exception as error:
+        return 500, 'text/plain; charset=utf-8', repr(error).encode()
+
+
+async def _handleHttpConnection(service: RenderService, max_body: int, reader, writer):
+    """
+    Répond aux requêtes d'une connexion HTTP/1.1, gardée ouverte entre les requêtes sauf demande contraire.
+
+    Args:
+        service (RenderService): Le service qui calcule les images.
+        max_body (int): La taille maximale du corps d'une requête, en octets.
+        reader (asyncio.StreamReader): La lecture de la connexion.
+        writer (asyncio.StreamWriter): L'écriture de la connexion.
+    """
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            header_dict = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                header_dict[name.strip().lower()] = value.strip()
+            keep_alive = header_dict.get('connection', '').lower() != 'close'
+            try:
+                verb, target, version = request_line.decode('latin-1').split()
+                length = int(header_dict.get('content-length', 0))
+            except ValueError:
+                status, content_type, content = 400, 'text/plain; charset=utf-8', "Requête invalide".encode()
+                keep_alive = False
+            else:
+                keep_alive = keep_alive and version == 'HTTP/1.1'
+                if length > max_body:
+                    status, content_type, content = 413, 'text/plain; charset=utf-8', b"Image trop grande"
+                    keep_alive = False
                 else:
-                    red_total, green_total, blue_total, px_blur = self.__totalPixelColorEnhance(
-                        enhance_picture, x, y)
-                    red_avg, green_avg, blue_avg = self.__averagePixelColorEnhance(
-                        red_total, green_total, blue_total, px_blur)
-                    enhance_picture.putpixel(
-                        (x, y), (red_avg, green_avg, blue_avg))
-        return enhance_picture
+                    if header_dict.get('expect', '').lower() == '100-continue':
+                        writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                    body = await reader.readexactly(length)
+                    status, content_type, content = await _getHttpResponse(service, verb, target, body)
+            writer.write(f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                         f"Content-Type: {content_type}\r\nContent-Length: {len(content)}\r\n"
+                         f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + content)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        # Les processus de l'exécuteur créés par fork pendant la connexion en ont hérité : la fin de l'envoi
+        # est signalée explicitement, sinon le client l'attendrait jusqu'à l'arrêt de ces processus
+        try:
+            writer.write_eof()
+        except OSError:
+            pass
+        writer.close()
+
+
+async def startHttpServer(service: RenderService, host: str = '127.0.0.1', port: int = 8000,
+                          max_body: int = 64 * 2**20):
+    """
+    Démarre un serveur HTTP local minimal devant un RenderService, pour l'essayer ou le soumettre à un test
+    de charge sur une seule machine. Chaque effet répond à POST /méthode?paramètre=valeur, l'image d'origine
+    dans le corps de la requête, par une image PNG ; GET /stats renvoie les compteurs du service en JSON.
+
+    Args:
+        service (RenderService): Le service qui calcule les images.
+        host (str, optionnel): L'adresse d'écoute. Defaults to '127.0.0.1'.
+        port (int, optionnel): Le port d'écoute, 0 pour un port libre. Defaults to 8000.
+        max_body (int, optionnel): La taille maximale d'une image envoyée, en octets. Defaults to 64 Mio.
+
+    Returns:
+        asyncio.Server: Le serveur, déjà à l'écoute.
+    """
+    return await asyncio.start_server(functools.partial(_handleHttpConnection, service, max_body), host, port)
+
+
+def _parseColor(text: str) -> tuple:
+    """
+    Lit une couleur donnée en ligne de commande sous la forme 255,128,0.
+
+    Args:
+        text (str): La couleur.
+
+    Returns:
+        tuple: Les composantes de la couleur.
+    """
+    return tuple(int(value) for value in text.split(','))
+
+
+def _getParameterType(parameter: inspect.Parameter):
+    """
+    Renvoie la fonction qui lit, depuis du texte, la valeur d'un paramètre d'une méthode draw.
+
+    Args:
+        parameter (inspect.Parameter): Le paramètre.
+
+    Returns:
+        La fonction : _parseColor pour les couleurs, le type annoncé du paramètre sinon.
+    """
+    return _parseColor if parameter.annotation is tuple else parameter.annotation
+
+
+def _getSourceList(pattern_list: list) -> list:
+    """
+    Développe les chemins donnés en ligne de commande : les dossiers en leurs images, les motifs
+    (photos/*.jpg) en les fichiers correspondants.
+
+    Args:
+        pattern_list (list): Les fichiers, dossiers et motifs.
+
+    Returns:
+        list: Les chemins des images, sans doublon, dans l'ordre.
+    """
+    image_extension = set(Image.registered_extensions())
+    path_list = []
+    for pattern in pattern_list:
+        if os.path.isdir(pattern):
+            path_list.extend(sorted(os.path.join(pattern, name) for name in os.listdir(pattern)
+                                    if os.path.splitext(name)[1].lower() in image_extension))
+        elif glob.has_magic(pattern):
+            path_list.extend(sorted(glob.glob(pattern, recursive=True)))
+        else:
+            path_list.append(pattern)
+    return list(dict.fromkeys(path_list))
+
+
+def _getArgumentParser() -> argparse.ArgumentParser:
+    """
+    Construit l'analyseur de la ligne de commande : une sous-commande par méthode draw, dont les paramètres
+    sont repris de la signature de la méthode (positionnels sans valeur par défaut, options sinon).
+
+    Returns:
+        argparse.ArgumentParser: L'analyseur.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m PixelMaster',
+        description="Applique un effet de PixelMaster à des images et mesure le débit.")
+    subparser_list = parser.add_subparsers(dest='method', required=True, metavar='method')
+    for method, draw_name in PixelMaster.METHOD_DICT.items():
+        draw = getattr(PixelMaster, draw_name)
+        subparser = subparser_list.add_parser(
+            method, help=inspect.getdoc(draw).splitlines()[0])
+        for name, parameter in inspect.signature(draw).parameters.items():
+            if name in ('self', 'workers', 'region'):
+                continue
+            value_type = _getParameterType(parameter)
+            if parameter.default is inspect.Parameter.empty:
+                subparser.add_argument(name, type=value_type)
+            else:
+                subparser.add_argument('--' + name.replace('_', '-'), dest=name, type=value_type,
+                                       default=parameter.default, help=f"défaut : {parameter.default}")
+        subparser.add_argument('source', nargs='+', help="images, dossiers ou motifs (photos/*.jpg)")
+        subparser.add_argument('-o', '--output-dir', default='.', help="dossier des images produites")
+        subparser.add_argument('-w', '--workers', type=int, default=1, help="nombre de processus")
+        subparser.add_argument('--backend', choices=list(BACKEND_DICT), help="moteur d'accès aux pixels")
+        subparser.add_argument('--extension', default='.png', help="format des images produites")
+        subparser.add_argument('-q', '--quiet', action='store_true', help="n'affiche que le bilan")
+    subparser = subparser_list.add_parser('serve', help="Lance le service HTTP local de RenderService.")
+    subparser.add_argument('--host', default='127.0.0.1', help="adresse d'écoute")
+    subparser.add_argument('--port', type=int, default=8000, help="port d'écoute")
+    subparser.add_argument('-c', '--concurrency', type=int, help="calculs simultanés, par défaut le nombre de cœurs")
+    subparser.add_argument('--max-waiting', type=int, help="calculs en attente avant de refuser (503)")
+    subparser.add_argument('--backend', choices=list(BACKEND_DICT), help="moteur d'accès aux pixels")
+    return parser
+
+
+async def _serveHttp(host: str, port: int, concurrency: int, max_waiting: int, backend: str):
+    """
+    Lance le service HTTP de la sous-commande serve, jusqu'à l'interruption du processus.
+
+    Args:
+        host (str): L'adresse d'écoute.
+        port (int): Le port d'écoute.
+        concurrency (int): Le nombre maximal de calculs simultanés.
+        max_waiting (int): Le nombre maximal de calculs en attente.
+        backend (str): Le moteur d'accès aux pixels.
+    """
+    async with RenderService(concurrency, backend=backend, max_waiting=max_waiting) as service:
+        server = await startHttpServer(service, host, port)
+        print(f"PixelMaster à l'écoute sur http://{host}:{port}/", flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv: list = None) -> int:
+    """
+    Point d'entrée de la ligne de commande, par exemple :
+    python -m PixelMaster square 4 photos/ "scans/*.png" -o out --workers 8
+
+    Chaque image est traitée par processBatch ; une ligne par image donne sa taille, la durée de l'effet et
+    le débit en mégapixels par seconde, puis un bilan donne le débit global, mesuré sur le temps écoulé.
+    La sous-commande serve lance à la place le service HTTP local de startHttpServer :
+    python -m PixelMaster serve --port 8000 --concurrency 4
+
+    Args:
+        argv (list, optionnel): Les arguments. Par défaut, ceux de la ligne de commande.
+
+    Returns:
+        int: Le code de sortie : 0 si tout a réussi, 1 si au moins une image est en erreur.
+    """
+    argument = vars(_getArgumentParser().parse_args(argv))
+    method = argument.pop('method')
+    if method == 'serve':
+        try:
+            asyncio.run(_serveHttp(**argument))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    source_list = _getSourceList(argument.pop('source'))
+    output_dir = argument.pop('output_dir')
+    workers = argument.pop('workers')
+    backend = argument.pop('backend')
+    extension = argument.pop('extension')
+    quiet = argument.pop('quiet')
+    # Les valeurs par défaut restent implicites, pour que les noms des fichiers produits restent courts
+    draw = inspect.signature(getattr(PixelMaster, PixelMaster.METHOD_DICT[method])).parameters
+    positional = tuple(argument.pop(name) for name in list(argument)
+                       if draw[name].default is inspect.Parameter.empty)
+    option = {name: value for name, value in argument.items() if value != draw[name].default}
+    effect = (method,) + positional + ((option,) if option else ())
+    start = time.perf_counter()
+    megapixel_total, error_nb, picture_nb = 0, 0, 0
+    for result in processBatch(source_list, [effect], output_dir, workers, backend, extension):
+        picture_nb += 1
+        if not result.ok:
+            error_nb += 1
+            print(f"{result.path}: erreur : {result.error}", file=sys.stderr)
+            continue
+        megapixel = result.size[0] * result.size[1] / 1e6
+        megapixel_total += megapixel
+        if not quiet:
+            print(f"{result.path}  {result.size[0]}x{result.size[1]}  {megapixel:.2f} MP  "
+                  f"{result.duration:.3f} s  {megapixel / max(result.duration, 1e-9):.2f} MP/s")
+    elapsed = time.perf_counter() - start
+    print(f"{picture_nb} images, {error_nb} erreurs, {megapixel_total:.2f} MP en {elapsed:.3f} s : "
+          f"{megapixel_total / max(elapsed, 1e-9):.2f} MP/s ({workers} processus)")
+    return 1 if error_nb else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
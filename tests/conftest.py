@@ -0,0 +1,8 @@
+"""
+Rend le module PixelMaster de src et le banc d'essai de benchmarks importables par les tests.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
@@ -0,0 +1,27 @@
+"""
+Vérifie que le banc d'essai de benchmarks tourne encore, en mode rapide sur une image minuscule.
+"""
+import json
+
+import benchmark
+
+
+def testQuickBenchmark(tmp_path, capsys):
+    output = tmp_path / 'current.json'
+    assert benchmark.main(['--quick', '--output', str(output)]) == 0
+    with open(output) as output_file:
+        current = json.load(output_file)
+    # Une mesure par méthode, pour sa première valeur, sur l'image 32x32
+    assert [(case['method'], case['size'], case['value']) for case in current['results']] == \
+        [(method, '32', value_list[0]) for method, (parameter, value_list) in benchmark.PARAMETER_DICT.items()]
+    for case in current['results']:
+        assert case['wall_s'] > 0 and case['mp_per_s'] > 0 and case['peak_rss_mb'] > 0
+    # Comparés à eux-mêmes, les résultats ne montrent aucune régression ; deux fois plus lents, tous
+    assert benchmark.main(['--compare', str(output), str(output)]) == 0
+    for case in current['results']:
+        case['wall_s'] *= 2
+    slower = tmp_path / 'slower.json'
+    with open(slower, 'w') as slower_file:
+        json.dump(current, slower_file)
+    assert benchmark.main(['--compare', str(output), str(slower), '--threshold', '0.5']) == 1
+    assert f"{len(current['results'])} régression(s)" in capsys.readouterr().out
@@ -0,0 +1,1046 @@
+"""
+Compare les méthodes draw de PixelMaster, avec chaque moteur, aux boucles pixel par pixel d'origine
+(baseline_pixelmaster), sur de petites images de tailles impaires, puis les autres façons de calculer une image
+(bandes, tuiles parallèles, cache, zones, suites d'images, calcul paresseux, tampons, service asynchrone) au
+résultat des méthodes draw.
+"""
+import asyncio
+import io
+import json
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import PixelMaster as pixelmaster_module
+from PixelMaster import (AnimationWriter, PixelMaster, RenderService, RenderStats, ResultCache, SequenceRenderer,
+                         _getArgumentParser, _getDraftScale, main, processBatch, renderFile, startHttpServer)
+from baseline_pixelmaster import PixelMaster as BaselinePixelMaster
+
+BACKEND_LIST = ('numpy', 'pixelaccess', 'buffer')
+# Tailles (largeur, hauteur) impaires, pour que les grilles aient une dernière section incomplète
+SIZE_LIST = ((23, 17), (31, 19), (17, 29), (9, 13))
+MOSAIC_METHOD_LIST = ('drawSquarePicture', 'drawTriangularPicture', 'drawCircularPicture')
+
+
+def getRandomPicture(width: int, height: int, mode: str = 'RGB', seed: int = 0) -> Image:
+    """
+    Construit une image de bruit déterministe.
+
+    Args:
+        width (int): La largeur de l'image.
+        height (int): La hauteur de l'image.
+        mode (str, optionnel): Le mode de l'image. Defaults to 'RGB'.
+        seed (int, optionnel): La graine du bruit. Defaults to 0.
+
+    Returns:
+        Image: L'image.
+    """
+    random = np.random.default_rng(seed)
+    if mode == 'I;16':
+        return Image.fromarray(random.integers(0, 2**16, (height, width), dtype=np.uint16))
+    if mode == 'P':
+        return getRandomPicture(width, height, 'RGB', seed).quantize(16)
+    nb_band = len(Image.new(mode, (1, 1)).getbands())
+    picture_array = random.integers(0, 256, (height, width, nb_band), dtype=np.uint8)
+    return Image.fromarray(picture_array.squeeze(axis=2) if nb_band == 1 else picture_array, mode)
+
+
+def getSquareGrid(master_class):
+    """
+    Renvoie une sous-classe qui découpe l'image sur la grille non proportionnelle des cercles pour toutes
+    les méthodes, afin de comparer aussi les sections carrées sans la dernière section incomplète.
+
+    Args:
+        master_class: PixelMaster ou sa copie d'origine.
+
+    Returns:
+        La sous-classe.
+    """
+    class SquareGridMaster(master_class):
+        def _PixelMaster__getPictureSeparation(self, division_nb, proportional=True):
+            return master_class._PixelMaster__getPictureSeparation(self, division_nb, False)
+    return SquareGridMaster
+
+
+def assertSamePicture(picture: Image, reference: Image):
+    """
+    Vérifie que deux images ont le même mode, la même taille et les mêmes pixels.
+    """
+    assert picture.mode == reference.mode
+    assert picture.size == reference.size
+    np.testing.assert_array_equal(np.asarray(picture), np.asarray(reference))
+
+
+@pytest.mark.parametrize('size', SIZE_LIST)
+@pytest.mark.parametrize('method', MOSAIC_METHOD_LIST)
+@pytest.mark.parametrize('proportional', (True, False))
+@pytest.mark.parametrize('backend', BACKEND_LIST)
+def testMosaicMatchesBaseline(size, method, proportional, backend):
+    picture = getRandomPicture(*size, seed=size[0] * size[1])
+    master_class, baseline_class = PixelMaster, BaselinePixelMaster
+    if not proportional:
+        master_class, baseline_class = getSquareGrid(master_class), getSquareGrid(baseline_class)
+    for division_nb in (1, 2, 3, 5):
+        reference = getattr(baseline_class(picture), method)(division_nb)
+        assertSamePicture(getattr(master_class(picture, backend=backend), method)(division_nb), reference)
+
+
+@pytest.mark.parametrize('size', SIZE_LIST)
+@pytest.mark.parametrize('backend', BACKEND_LIST)
+def testEnhanceMatchesBaseline(size, backend):
+    picture = getRandomPicture(*size, seed=size[0] * size[1])
+    reference = BaselinePixelMaster(picture).drawEnhancePicture()
+    assertSamePicture(PixelMaster(picture, backend=backend).drawEnhancePicture(2), reference)
+
+
+@pytest.mark.parametrize('factor', (3, 4, 8))
+@pytest.mark.parametrize('mode', ('L', 'RGB', 'RGBA'))
+@pytest.mark.parametrize('backend', ('numpy', 'buffer'))
+def testEnhanceFactorMatchesLoop(factor, mode, backend):
+    # Au-delà du facteur 2 d'origine, la référence est la boucle pixel par pixel du moteur 'pixelaccess'
+    picture = getRandomPicture(11, 7, mode, seed=factor)
+    reference = PixelMaster(picture, 'pixelaccess').drawEnhancePicture(factor)
+    assert reference.mode == mode and reference.size == (11 * factor, 7 * factor)
+    assertSamePicture(PixelMaster(picture, backend).drawEnhancePicture(factor), reference)
+
+
+@pytest.mark.parametrize('mode', ('I;16', 'RGBA'))
+def testIntegralWrapsAround(mode):
+    # Une image presque blanche dont la somme déborde des entiers 32 bits de l'image intégrale
+    picture_array = np.asarray(getRandomPicture(260, 260, mode, seed=3))
+    picture_array = np.maximum(picture_array, np.iinfo(picture_array.dtype).max - 3)
+    picture = Image.fromarray(picture_array, mode if mode == 'RGBA' else None)
+    assert picture.mode == mode and 260 * 260 * (255 * 255 if mode == 'RGBA' else 2**16 - 1) > 2**32
+    master = PixelMaster(picture)
+    # Avec 13 divisions, chaque section tient sur 32 bits ; avec 1, elle est sommée sur ses pixels
+    for division_nb in (13, 1):
+        for method in MOSAIC_METHOD_LIST:
+            reference = getattr(PixelMaster(picture, backend='pixelaccess'), method)(division_nb)
+            assertSamePicture(getattr(master, method)(division_nb), reference)
+
+
+@pytest.mark.parametrize('mode', ('RGB', 'RGBA'))
+def testIntegralReusedAcrossDivisions(mode):
+    picture = getRandomPicture(37, 23, mode, seed=2)
+    master = PixelMaster(picture)
+    for division_nb in (7, 2, 5, 2):
+        for method in ('drawSquarePicture', 'drawCircularPicture'):
+            reference = getattr(PixelMaster(picture, backend='pixelaccess'), method)(division_nb)
+            assertSamePicture(getattr(master, method)(division_nb), reference)
+    height, width = picture.height, picture.width
+    weighted_array = np.asarray(picture).astype(np.int64)
+    if mode == 'RGBA':
+        weighted_array[..., :-1] *= weighted_array[..., -1:]
+    extended_array = weighted_array[np.arange(-1, height)][:, np.arange(-1, width)]
+    integral_array = master._PixelMaster__getIntegralArray()
+    np.testing.assert_array_equal(integral_array[1:, 1:], extended_array.cumsum(axis=0).cumsum(axis=1))
+    assert not integral_array[0].any() and not integral_array[:, 0].any()
+
+
+@pytest.mark.parametrize('mode', ('RGB', 'LA', 'I;16'))
+def testTrianglesReusedAcrossDivisions(mode):
+    picture = getRandomPicture(41, 26, mode, seed=3)
+    master = PixelMaster(picture)
+    for division_nb in (6, 3, 6, 13, 1):
+        reference = PixelMaster(picture, backend='pixelaccess').drawTriangularPicture(division_nb)
+        assertSamePicture(master.drawTriangularPicture(division_nb), reference)
+        # Une zone est calculée à partir des pixels lus, sans l'image intégrale
+        box = (5, 4, 30, 19)
+        region_picture = master.drawTriangularPicture(division_nb, region=[box])
+        assertSamePicture(region_picture.crop(box), reference.crop(box))
+    assert list(master.m_triangle_dict) == [1]
+
+
+@pytest.mark.parametrize('size', ((640, 480), (643, 487)))
+@pytest.mark.parametrize('format', ('JPEG', 'PNG'))
+@pytest.mark.parametrize('method', ('square', 'circle'))
+@pytest.mark.parametrize('division_nb', (2, 4))
+def testRenderFileMatchesDrawPicture(size, format, method, division_nb):
+    # Des blocs de 3 pixels contrastés, pour que les pixels réduits à cheval sur deux sections se voient
+    picture = getRandomPicture(size[0] // 3 + 1, size[1] // 3 + 1, seed=5).resize(size, Image.Resampling.NEAREST)
+    picture_file = io.BytesIO()
+    picture.save(picture_file, format)
+    draw_name = PixelMaster.METHOD_DICT[method]
+    for tolerance in (2, 16):
+        picture_file.seek(0)
+        with Image.open(picture_file) as decoded_picture:
+            reference = getattr(PixelMaster(decoded_picture), draw_name)(division_nb)
+        picture_file.seek(0)
+        draft_picture = renderFile(picture_file, method, division_nb, tolerance=tolerance)
+        assert draft_picture.mode == reference.mode and draft_picture.size == reference.size
+        scale = _getDraftScale(size, method, division_nb, tolerance, 255)
+        if scale == 1:
+            assertSamePicture(draft_picture, reference)
+        else:
+            error = np.abs(np.asarray(draft_picture, dtype=np.int64) - np.asarray(reference, dtype=np.int64))
+            assert error.max() <= tolerance
+        if method == 'square':
+            # La dernière section de chaque axe n'a que quelques pixels : elle est lue dans l'image entière
+            width, height = size
+            edge_box_list = ((width - width % (width // division_nb) - 1, 0, width, height),
+                             (0, height - height % (height // division_nb) - 1, width, height))
+            for box in edge_box_list:
+                assertSamePicture(draft_picture.crop(box), reference.crop(box))
+    # Même avec une grille carrée, l'image est lue réduite
+    assert scale > 1
+
+
+@pytest.mark.parametrize('backend', BACKEND_LIST)
+@pytest.mark.parametrize('mode', ('RGB', 'RGBA'))
+@pytest.mark.parametrize('division_nb', (1, 3, 4, 7))
+def testMosaicPicturesMatchDrawPicture(division_nb, mode, backend):
+    picture = getRandomPicture(23, 17, mode, seed=8)
+    background = (10, 20, 30)
+    picture_dict = PixelMaster(picture, backend).drawMosaicPictures(division_nb, background=background)
+    assert set(picture_dict) == {'square', 'triangle', 'circle'}
+    # Chaque style est calculé par une instance neuve, sans la grille gardée par drawMosaicPictures
+    assertSamePicture(picture_dict['square'], PixelMaster(picture, backend).drawSquarePicture(division_nb))
+    assertSamePicture(picture_dict['triangle'], PixelMaster(picture, backend).drawTriangularPicture(division_nb))
+    assertSamePicture(picture_dict['circle'],
+                      PixelMaster(picture, backend).drawCircularPicture(division_nb, background))
+
+
+def testMosaicPicturesChecksStyles():
+    master = PixelMaster(getRandomPicture(23, 17, seed=8))
+    assert set(master.drawMosaicPictures(3, styles=('circle',))) == {'circle'}
+    with pytest.raises(ValueError):
+        master.drawMosaicPictures(3, styles=('hexagon',))
+    with pytest.raises(ValueError):
+        PixelMaster(getRandomPicture(23, 17, seed=8), 'pixelaccess').drawMosaicPictures(3, proportional=False)
+
+
+@pytest.mark.parametrize('method', MOSAIC_METHOD_LIST)
+def testInstrumentationCountsCachedGrid(method):
+    picture = getRandomPicture(40, 30, seed=6)
+    stats = RenderStats()
+    master = PixelMaster(picture, instrument=stats)
+    first_picture = getattr(master, method)(5)
+    assertSamePicture(getattr(master, method)(5), first_picture)
+    first_report, second_report = stats.reports
+    assert first_report['cells'] == second_report['cells'] > 0
+    assert (first_report['grid_cache'], second_report['grid_cache']) == ('miss', 'hit')
+    assert 'separation' in first_report['stages'] and 'separation' not in second_report['stages']
+    assert 'grid' in second_report['stages']
+    (total,) = stats.getSummary().values()
+    assert total['calls'] == 2 and total['cells'] == 2 * first_report['cells']
+
+
+def testInstrumentationCountsEachGridOnce():
+    picture = getRandomPicture(40, 30, seed=6)
+    stats = RenderStats()
+    master = PixelMaster(picture, instrument=stats)
+    master.drawSquarePicture(5)
+    master.drawSquarePicture(5, region=[(0, 0, 10, 10), (20, 10, 40, 30)])
+    master.drawTriangularPicture(4)
+    full_report, region_report, triangle_report = stats.reports
+    # Les zones relisent la même grille : ses cellules ne sont comptées qu'une fois
+    assert region_report['cells'] == full_report['cells'] > 0
+    assert triangle_report['cells'] > 0
+    assert sum(total['cells'] for total in stats.getSummary().values()) == \
+        2 * full_report['cells'] + triangle_report['cells']
+
+
+def getBlurReference(picture: Image, blur_nb: int) -> Image:
+    """
+    Floute une image avec la boucle de BaselinePixelMaster.drawBlurredPicture, dont le bras gauche de la
+    croix teste x - i >= 0 comme les autres bras au lieu de lire les pixels du bord droit.
+
+    Args:
+        picture (Image): L'image, en RGB.
+        blur_nb (int): Le nombre de pixels à prendre en compte pour le flou.
+
+    Returns:
+        Image: L'image floutée.
+    """
+    baseline = BaselinePixelMaster(picture)
+    total_pixel_color = baseline._PixelMaster__totalPixelColor
+    width, height = picture.size
+    blurred_picture = Image.new('RGB', (width, height))
+    for x in range(width):
+        for y in range(height):
+            total = (0, 0, 0, 0)
+            for i in range(1, blur_nb+1):
+                for x_ref, y_ref, inside in ((-i, 0, x-i >= 0), (i, 0, x+i < width),
+                                             (0, -i, y-i >= 0), (0, i, y+i < height)):
+                    if inside:
+                        total = total_pixel_color(*total, x+x_ref, y+y_ref)
+            for x_ref in range(blur_nb):
+                y_ref = int((math.sqrt(1-(x_ref/blur_nb)**2))*blur_nb)
+                coef = (math.sqrt(x_ref**2+y_ref**2))
+                for x_sign, y_sign in ((-1, -1), (1, 1), (1, -1), (-1, 1)):
+                    if 0 <= x + x_sign*x_ref < width and 0 <= y + y_sign*y_ref < height:
+                        total = total_pixel_color(*total, x + x_sign*x_ref, y + y_sign*y_ref, coef)
+            average = baseline._PixelMaster__averagePixelColor(*total)
+            blurred_picture.putpixel((x, y), tuple(int(value) for value in average))
+    return blurred_picture
+
+
+@pytest.mark.parametrize('size', SIZE_LIST)
+@pytest.mark.parametrize('backend', BACKEND_LIST)
+def testBlurMatchesBaseline(size, backend):
+    picture = getRandomPicture(*size, seed=size[0] * size[1])
+    reference = BaselinePixelMaster(picture).drawBlurredPicture(1)
+    assertSamePicture(PixelMaster(picture, backend=backend).drawBlurredPicture(1), reference)
+
+
+def getBlurMethod(blur_method: str):
+    """
+    Renvoie une sous-classe de PixelMaster qui applique toujours le noyau de flou avec la même méthode.
+
+    Args:
+        blur_method (str): 'direct', 'separable' ou 'fft'.
+
+    Returns:
+        La sous-classe.
+    """
+    class BlurMethodMaster(PixelMaster):
+        def _PixelMaster__getBlurMethod(self, blur_nb, kernel, width, height):
+            return blur_method
+    return BlurMethodMaster
+
+
+@pytest.mark.parametrize('size', SIZE_LIST)
+def testBlurMatchesFixedLoop(size):
+    picture = getRandomPicture(*size, seed=size[0] * size[1])
+    for blur_nb in (2, 3):
+        reference = getBlurReference(picture, blur_nb)
+        for backend in ('pixelaccess', 'buffer'):
+            assertSamePicture(PixelMaster(picture, backend=backend).drawBlurredPicture(blur_nb), reference)
+        assertSamePicture(getBlurMethod('direct')(picture).drawBlurredPicture(blur_nb), reference)
+        # La transformée de Fourier arrondit les sommes : un quotient à quelques ulp d'un entier peut
+        # tomber de l'autre côté
+        fft_picture = getBlurMethod('fft')(picture).drawBlurredPicture(blur_nb)
+        error = np.abs(np.asarray(fft_picture, dtype=np.int64) - np.asarray(reference, dtype=np.int64))
+        assert error.max() <= 1 and (error > 0).mean() < 0.01
+
+
+@pytest.mark.parametrize('kernel', ('cross', 'box', 'gaussian'))
+@pytest.mark.parametrize('blur_nb', (1, 2, 5))
+def testBlurConvolutionsAgree(kernel, blur_nb):
+    master = PixelMaster(getRandomPicture(23, 17, seed=7))
+    picture_array = master._PixelMaster__getPictureArray()
+    kernel_list = master._PixelMaster__getBlurKernel(blur_nb, kernel)
+    result_list = [master._PixelMaster__convolveDirect(picture_array, kernel_list),
+                   master._PixelMaster__convolveFFT(picture_array.astype(np.float64), kernel_list)]
+    if kernel != 'cross':
+        result_list.append(master._PixelMaster__convolveSeparable(picture_array, blur_nb, kernel))
+    total_array, nb_pixel_array = result_list[0]
+    for other_total_array, other_nb_pixel_array in result_list[1:]:
+        np.testing.assert_allclose(other_total_array, total_array, rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(other_nb_pixel_array, nb_pixel_array, rtol=1e-9, atol=1e-9)
+
+
+def testBlurMethodChoice():
+    get_blur_method = PixelMaster(getRandomPicture(9, 13))._PixelMaster__getBlurMethod
+    # La croix a peu de voisins pour un petit rayon, beaucoup trop pour un grand
+    assert get_blur_method(1, 'cross', 1920, 1080) == 'direct'
+    assert get_blur_method(2, 'cross', 1920, 1080) == 'direct'
+    assert get_blur_method(3, 'cross', 1920, 1080) == 'fft'
+    assert get_blur_method(20, 'cross', 1920, 1080) == 'fft'
+    # Le noyau 'box' coûte le même prix quel que soit le rayon
+    assert get_blur_method(1, 'box', 1920, 1080) == 'separable'
+    assert get_blur_method(200, 'box', 1920, 1080) == 'separable'
+    assert get_blur_method(2, 'gaussian', 1920, 1080) == 'separable'
+    assert get_blur_method(50, 'gaussian', 1920, 1080) == 'fft'
+    # Le flou d'une petite image passe par la transformée de Fourier dès que la croix a plus de voisins
+    # que log2 de sa surface
+    assert get_blur_method(1, 'cross', 31, 19) == 'direct'
+    assert get_blur_method(2, 'cross', 31, 19) == 'fft'
+
+
+def getDiscReference(width_pixel: int, height_pix: int):
+    """
+    Trace le cercle d'une section point par point, comme la boucle de drawCircularPicture.
+
+    Args:
+        width_pixel (int): La différence entre les coordonnées de fin et de début de la section en x.
+        height_pix (int): La différence entre les coordonnées de fin et de début de la section en y.
+
+    Returns:
+        numpy.ndarray: Le masque booléen (height_pix + 1, width_pixel + 1) du cercle.
+    """
+    disc_mask = np.zeros((height_pix + 1, width_pixel + 1), dtype=bool)
+    x_loc_zone = (width_pixel + 1) // 2
+    y_loc_zone = (height_pix + 1) // 2
+    point_list = []
+    for i_width in range(x_loc_zone):
+        for x in range(i_width):
+            point_list.append((x, int((math.sqrt(1-(x/i_width)**2))*i_width)))
+    for i_height in range(y_loc_zone):
+        for y in range(i_height):
+            point_list.append((int((math.sqrt(1-(y/i_height)**2))*i_height), y))
+    for x, y in point_list:
+        for x_point in (x_loc_zone + x, x_loc_zone - x):
+            for y_point in (y_loc_zone + y, y_loc_zone - y):
+                if 0 <= x_point <= width_pixel and 0 <= y_point <= height_pix:
+                    disc_mask[y_point, x_point] = True
+    return disc_mask
+
+
+def testDiscMaskMatchesLoop():
+    get_disc_mask = PixelMaster._PixelMaster__getDiscMask
+    for size in list(range(80)) + [127, 255, 256, 511]:
+        np.testing.assert_array_equal(get_disc_mask(size, size), getDiscReference(size, size))
+    for width_pixel, height_pix in ((0, 5), (7, 2), (12, 31), (40, 9)):
+        np.testing.assert_array_equal(get_disc_mask(width_pixel, height_pix),
+                                      getDiscReference(width_pixel, height_pix))
+
+
+EFFECT_LIST = (('square', 3), ('triangle', 4), ('circle', 3), ('blur', 2), ('enhance', 2))
+
+
+@pytest.mark.parametrize('method, value', EFFECT_LIST)
+@pytest.mark.parametrize('extension', ('.png', '.ppm'))
+def testStreamMatchesDrawPicture(tmp_path, method, value, extension):
+    picture = getRandomPicture(37, 29, seed=9)
+    master = PixelMaster(picture)
+    reference = getattr(PixelMaster(picture), PixelMaster.METHOD_DICT[method])(value)
+    # Une mémoire de travail de quelques lignes, pour que l'image soit écrite en plusieurs bandes
+    strip_list = []
+    master.streamPicture(method, lambda top, strip: strip_list.append((top, strip)), value, memory_limit=4096)
+    assert len(strip_list) > 1
+    stream_picture = Image.new(reference.mode, reference.size)
+    for top, strip in strip_list:
+        stream_picture.paste(strip, (0, top))
+    assertSamePicture(stream_picture, reference)
+    path = tmp_path / f'{method}{extension}'
+    master.streamPicture(method, str(path), value, memory_limit=4096)
+    with Image.open(path) as stream_picture:
+        assertSamePicture(stream_picture, reference)
+
+
+@pytest.mark.parametrize('mode', ('L', 'LA', 'RGBA', 'I;16', 'P'))
+def testStreamKeepsMode(tmp_path, mode):
+    picture = getRandomPicture(21, 26, mode, seed=10)
+    reference = PixelMaster(picture).drawSquarePicture(4)
+    path = tmp_path / 'SquarePicture.png'
+    PixelMaster(picture).streamPicture('square', str(path), 4, memory_limit=2048)
+    with Image.open(path) as stream_picture:
+        stream_picture.load()
+        if mode == 'P':
+            assert stream_picture.getpalette() == reference.getpalette()
+        assertSamePicture(stream_picture, reference)
+
+
+@pytest.mark.parametrize('method, value', EFFECT_LIST)
+@pytest.mark.parametrize('mode', ('RGB', 'RGBA'))
+def testParallelMatchesSerial(method, value, mode):
+    picture = getRandomPicture(67, 45, mode, seed=11)
+    draw_name = PixelMaster.METHOD_DICT[method]
+    reference = getattr(PixelMaster(picture), draw_name)(value)
+    assertSamePicture(getattr(PixelMaster(picture), draw_name)(value, workers=3), reference)
+
+
+def testParallelWorkersChecked():
+    picture = getRandomPicture(9, 13)
+    with pytest.raises(ValueError):
+        PixelMaster(picture).drawSquarePicture(2, workers=0)
+    with pytest.raises(ValueError):
+        PixelMaster(picture, backend='pixelaccess').drawSquarePicture(2, workers=2)
+    assertSamePicture(PixelMaster(picture, backend='pixelaccess').drawSquarePicture(2, workers=1),
+                      PixelMaster(picture).drawSquarePicture(2))
+
+
+def testCacheHitsAndEvicts():
+    picture = getRandomPicture(30, 20, seed=12)
+    cache = ResultCache(max_bytes=2 * 30 * 20 * 3)
+    master = PixelMaster(picture, cache=cache)
+    reference = PixelMaster(picture).drawSquarePicture(3)
+    first_picture = master.drawSquarePicture(3)
+    assertSamePicture(first_picture, reference)
+    # La copie gardée ne suit pas les modifications de l'image renvoyée
+    first_picture.paste((1, 2, 3), (0, 0, 30, 20))
+    # Une autre instance de la même image partage les entrées ; workers ne change pas la clé
+    assertSamePicture(PixelMaster(picture.copy(), cache=cache).drawSquarePicture(3, workers=1), reference)
+    assert cache.getStats() == {'hits': 1, 'disk_hits': 0, 'misses': 1, 'evictions': 0, 'entries': 1,
+                                'bytes': 30 * 20 * 3}
+    # Deux images produites tiennent en mémoire : la troisième évince la moins récemment utilisée
+    master.drawSquarePicture(4)
+    master.drawSquarePicture(3)
+    master.drawCircularPicture(3)
+    stats = cache.getStats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['entries']) == (2, 3, 1, 2)
+    assertSamePicture(master.drawSquarePicture(3), reference)
+    assert cache.getStats()['hits'] == 3
+
+
+def testCacheDiskTier(tmp_path):
+    picture = getRandomPicture(30, 20, 'RGBA', seed=13)
+    reference = PixelMaster(picture).drawTriangularPicture(4)
+    cache = ResultCache(cache_dir=str(tmp_path))
+    assertSamePicture(PixelMaster(picture, cache=cache).drawTriangularPicture(4), reference)
+    assert len(list(tmp_path.glob('*/*.png'))) == 1
+    # Un autre cache, par exemple dans un autre processus, relit l'image sur le disque
+    other_cache = ResultCache(cache_dir=str(tmp_path))
+    assertSamePicture(PixelMaster(picture, cache=other_cache).drawTriangularPicture(4), reference)
+    assert other_cache.getStats()['disk_hits'] == 1
+    other_cache.clear()
+    assertSamePicture(PixelMaster(picture, cache=other_cache).drawTriangularPicture(4), reference)
+    assert (other_cache.hits, other_cache.disk_hits, other_cache.misses) == (2, 2, 0)
+
+
+def testCacheInvalidated():
+    picture = getRandomPicture(30, 20, seed=14)
+    cache = ResultCache()
+    master = PixelMaster(picture, cache=cache)
+    master.drawSquarePicture(3)
+    # Les paramètres, le masque des zones et le contenu de l'image font partie de la clé
+    master.drawSquarePicture(3, region=[(0, 0, 10, 10)])
+    mask_array = np.zeros((20, 30), dtype=bool)
+    mask_array[5:15, 5:25] = True
+    masked_picture = master.drawSquarePicture(3, region=mask_array)
+    mask_array[:] = False
+    assert not np.array_equal(np.asarray(master.drawSquarePicture(3, region=mask_array)),
+                              np.asarray(masked_picture))
+    assert cache.hits == 0 and cache.misses == 4
+    patch = getRandomPicture(7, 5, seed=15)
+    master.updatePicture(patch, (3, 4))
+    updated_picture = picture.copy()
+    updated_picture.paste(patch, (3, 4))
+    assertSamePicture(master.drawSquarePicture(3), PixelMaster(updated_picture).drawSquarePicture(3))
+    assert cache.hits == 0 and cache.misses == 5
+
+
+def getMovingFrameList(width: int, height: int, frame_nb: int, seed: int = 0) -> list:
+    """
+    Construit une suite d'images : un fond fixe sur lequel un petit carré se déplace.
+
+    Args:
+        width (int): La largeur des images.
+        height (int): La hauteur des images.
+        frame_nb (int): Le nombre d'images.
+        seed (int, optionnel): La graine du fond. Defaults to 0.
+
+    Returns:
+        list: Les images, en tableaux NumPy RGB.
+    """
+    background_array = np.asarray(getRandomPicture(width, height, seed=seed))
+    frame_list = []
+    for index in range(frame_nb):
+        frame_array = background_array.copy()
+        frame_array[10:16, 4 + 5 * index:10 + 5 * index] = (255, 0, 128)
+        frame_list.append(frame_array)
+    return frame_list
+
+
+@pytest.mark.parametrize('method, value', EFFECT_LIST)
+def testSequenceMatchesDrawPicture(method, value):
+    frame_list = getMovingFrameList(96, 64, 4, seed=16)
+    renderer = SequenceRenderer(method, value, block_size=8)
+    draw_name = PixelMaster.METHOD_DICT[method]
+    # Le même tampon est réutilisé pour chaque image, comme par un lecteur de vidéo
+    buffer_array = np.empty_like(frame_list[0])
+    for frame_array in frame_list:
+        buffer_array[:] = frame_array
+        assertSamePicture(renderer.render(buffer_array), getattr(PixelMaster(frame_array), draw_name)(value))
+    stats = renderer.getStats()
+    assert stats['frames'] == 4 and stats['full_frames'] == 1
+    assert stats['rendered_ratio'] < 0.75
+    renderer.reset()
+    renderer.render(frame_list[0])
+    # Une image d'une autre taille est entièrement recalculée
+    small_frame_array = frame_list[1][:40, :50]
+    assertSamePicture(renderer.render(small_frame_array),
+                      getattr(PixelMaster(small_frame_array), draw_name)(value))
+    assert renderer.getStats()['full_frames'] == 3
+
+
+def testSequenceChecksArguments():
+    with pytest.raises(ValueError):
+        SequenceRenderer('mosaic', 4)
+    with pytest.raises(ValueError):
+        SequenceRenderer('square', 4, block_size=0)
+
+
+@pytest.mark.parametrize('method, value', EFFECT_LIST)
+@pytest.mark.parametrize('mode', ('RGB', 'RGBA'))
+def testRefreshMatchesDrawPicture(method, value, mode):
+    picture = getRandomPicture(61, 47, mode, seed=17)
+    original_array = np.asarray(picture).copy()
+    master = PixelMaster(picture)
+    draw_name = PixelMaster.METHOD_DICT[method]
+    output = getattr(master, draw_name)(value)
+    updated_picture = picture.copy()
+    for patch, position in ((getRandomPicture(5, 4, mode, seed=18), (30, 20)),
+                            (np.asarray(getRandomPicture(3, 6, mode, seed=19)), (0, 41))):
+        box = master.updatePicture(patch, position)
+        patch_picture = Image.fromarray(patch) if isinstance(patch, np.ndarray) else patch
+        assert box == position + (position[0] + patch_picture.width, position[1] + patch_picture.height)
+        updated_picture.paste(patch_picture, position)
+        box_list = master.refreshPicture(output, box, method, value)
+        reference = getattr(PixelMaster(updated_picture), draw_name)(value)
+        assertSamePicture(output, reference)
+        assert sum((right - left) * (bottom - top) for left, top, right, bottom in box_list) \
+            < output.width * output.height // 2
+        assertSamePicture(getattr(master, draw_name)(value), reference)
+    # L'image donnée à la construction n'est pas modifiée
+    np.testing.assert_array_equal(np.asarray(picture), original_array)
+
+
+def testUpdateChecksArguments():
+    picture = getRandomPicture(20, 10, seed=20)
+    master = PixelMaster(picture, backend='pixelaccess')
+    with pytest.raises(ValueError):
+        master.updatePicture(getRandomPicture(5, 5), (18, 0))
+    with pytest.raises(ValueError):
+        master.updatePicture(np.zeros((2, 2, 3), dtype=np.uint16))
+    box = master.updatePicture(Image.new('RGB', (4, 3), (9, 8, 7)), (2, 2))
+    updated_picture = picture.copy()
+    updated_picture.paste((9, 8, 7), box)
+    # Les moteurs pixel par pixel relisent la zone remplacée
+    assertSamePicture(master.drawSquarePicture(3), PixelMaster(updated_picture).drawSquarePicture(3))
+    with pytest.raises(ValueError):
+        master.refreshPicture(Image.new('RGB', (5, 5)), box, 'square', 3)
+
+
+@pytest.mark.parametrize('method, value', EFFECT_LIST)
+@pytest.mark.parametrize('backend', ('numpy', 'pixelaccess'))
+def testRegionMatchesDrawPicture(method, value, backend):
+    picture = getRandomPicture(53, 41, seed=21)
+    draw_name = PixelMaster.METHOD_DICT[method]
+    reference_array = np.asarray(getattr(PixelMaster(picture), draw_name)(value))
+    factor = value if method == 'enhance' else 1
+    original_array = np.asarray(picture).repeat(factor, axis=0).repeat(factor, axis=1)
+    mask_array = np.zeros((41, 53), dtype=bool)
+    mask_array[3:9, 40:50] = True
+    mask_array[20:35, 5:12] = True
+    box_mask_array = np.zeros((41, 53), dtype=bool)
+    box_mask_array[2:12, 4:30] = box_mask_array[30:60, 45:] = True
+    for region, region_mask_array in (([(4, 2, 30, 12), (45, 30, 60, 60)], box_mask_array),
+                                      (mask_array, mask_array),
+                                      (Image.fromarray(mask_array), mask_array)):
+        region_array = np.asarray(getattr(PixelMaster(picture, backend=backend), draw_name)(value, region=region))
+        inside_array = region_mask_array.repeat(factor, axis=0).repeat(factor, axis=1)
+        np.testing.assert_array_equal(region_array[inside_array], reference_array[inside_array])
+        np.testing.assert_array_equal(region_array[~inside_array], original_array[~inside_array])
+
+
+def testRegionChecksMask():
+    with pytest.raises(ValueError):
+        PixelMaster(getRandomPicture(20, 10)).drawSquarePicture(3, region=np.ones((20, 10), dtype=bool))
+    with pytest.raises(ValueError):
+        PixelMaster(getRandomPicture(20, 10)).drawSquarePicture(3, region=[(0, 0, 5)])
+
+
+def getReducedArray(picture_array, scale: int):
+    """
+    Réduit des pixels RGB d'un facteur entier : chaque pixel réduit est la moyenne, arrondie à l'entier
+    inférieur, d'un carré de scale pixels de côté, plus petit sur les bords.
+    """
+    height, width = picture_array.shape[:2]
+    reduced_array = np.empty(((height + scale - 1) // scale, (width + scale - 1) // scale, 3), dtype=np.uint8)
+    for y in range(reduced_array.shape[0]):
+        for x in range(reduced_array.shape[1]):
+            block_array = picture_array[y * scale:(y + 1) * scale, x * scale:(x + 1) * scale]
+            reduced_array[y, x] = block_array.sum(axis=(0, 1)) // (block_array.shape[0] * block_array.shape[1])
+    return reduced_array
+
+
+@pytest.mark.parametrize('method, value', EFFECT_LIST)
+def testLazyPictureMatchesDrawPicture(method, value):
+    picture = getRandomPicture(70, 50, seed=22)
+    reference = getattr(PixelMaster(picture), PixelMaster.METHOD_DICT[method])(value)
+    master = PixelMaster(picture)
+    lazy_picture = master.getLazyPicture(method, value)
+    assert lazy_picture.size == reference.size
+    for box in ((0, 0, 10, 10), (13, 7, 41, 29), (-5, -3, 12, 8), (60, 40, 200, 120), (300, 300, 310, 305)):
+        assertSamePicture(lazy_picture.crop(box), reference.crop(box))
+    tile_size = 16
+    max_zoom = lazy_picture.getMaxZoom(tile_size)
+    assertSamePicture(lazy_picture.tile(1, 2, max_zoom, tile_size),
+                      reference.crop((16, 32, 32, 48)))
+    reference_array = np.asarray(reference)
+    for z in range(max_zoom):
+        scale = 2 ** (max_zoom - z)
+        reduced_array = getReducedArray(reference_array, scale)
+        np.testing.assert_array_equal(np.asarray(lazy_picture.tile(0, 0, z, tile_size)),
+                                      reduced_array[:tile_size, :tile_size])
+    thumbnail = lazy_picture.thumbnail((20, 20))
+    ratio = min(20 / reference.width, 20 / reference.height)
+    scale = max(1, int(1 / ratio / 2))
+    thumbnail_size = (round(reference.width * ratio), round(reference.height * ratio))
+    assertSamePicture(thumbnail, Image.fromarray(getReducedArray(reference_array, scale)).resize(
+        thumbnail_size, Image.Resampling.BICUBIC))
+    # Rien n'a demandé l'image entière
+    assert master.m_integral_array is None and master.m_picture_array is None
+    assertSamePicture(lazy_picture.toImage(), reference)
+    assertSamePicture(lazy_picture.crop((5, 5, 20, 20)), reference.crop((5, 5, 20, 20)))
+    with pytest.raises(ValueError):
+        lazy_picture.tile(0, 0, max_zoom + 1, tile_size)
+    with pytest.raises(ValueError):
+        lazy_picture.tile(10, 0, max_zoom, tile_size)
+
+
+@pytest.mark.parametrize('mode', ('L', 'RGB', 'RGBA', 'I;16'))
+def testBufferInputMatchesPicture(mode):
+    picture = getRandomPicture(29, 17, mode, seed=23)
+    reference_list = [PixelMaster(picture).drawSquarePicture(4), PixelMaster(picture).drawBlurredPicture(1)]
+    picture_array = np.array(picture)
+    buffer = bytearray(picture_array.tobytes())
+    master_list = [PixelMaster(buffer, size=picture.size, mode=mode),
+                   PixelMaster(memoryview(picture_array)),
+                   PixelMaster(picture_array, backend='pixelaccess')]
+    if mode != 'I;16':
+        # Le mode d'un tampon d'octets se déduit de sa taille
+        master_list.append(PixelMaster(buffer, size=picture.size))
+    for master in master_list:
+        assertSamePicture(master.drawSquarePicture(4), reference_list[0])
+        assertSamePicture(master.drawBlurredPicture(1), reference_list[1])
+    # Le tampon et le tableau sont lus sans copie
+    assert np.shares_memory(master_list[0].m_picture_array, np.frombuffer(buffer, dtype=np.uint8))
+    assert np.shares_memory(master_list[1].m_picture_array, picture_array)
+
+
+def testBufferInputChecked():
+    with pytest.raises(ValueError):
+        PixelMaster(bytearray(10), size=(3, 3))
+    with pytest.raises(ValueError):
+        PixelMaster(bytearray(27), size=(3, 3), mode='RGBA')
+    with pytest.raises(ValueError):
+        PixelMaster(bytearray(27), size=(3, 3), mode='CMYK')
+    with pytest.raises(ValueError):
+        PixelMaster(np.zeros((3, 3, 3), dtype=np.float32))
+
+
+@pytest.mark.parametrize('method, value', EFFECT_LIST)
+@pytest.mark.parametrize('mode', ('L', 'RGBA'))
+def testRenderArrayWritesOut(method, value, mode):
+    picture_array = np.asarray(getRandomPicture(31, 22, mode, seed=24))
+    master = PixelMaster(picture_array)
+    reference_array = np.asarray(getattr(PixelMaster(picture_array), PixelMaster.METHOD_DICT[method])(value))
+    np.testing.assert_array_equal(master.renderArray(method, value), reference_array)
+    out_array = np.zeros_like(reference_array)
+    pixelated_array = master.renderArray(method, value, out=out_array)
+    assert np.shares_memory(pixelated_array, out_array)
+    np.testing.assert_array_equal(out_array, reference_array)
+    # Un tampon d'octets est écrit sur place, par exemple celui d'une vidéo
+    out_buffer = bytearray(reference_array.nbytes)
+    pixelated_array = master.renderArray(method, value, out=out_buffer)
+    assert np.shares_memory(pixelated_array, np.frombuffer(out_buffer, dtype=np.uint8))
+    assert bytes(out_buffer) == reference_array.tobytes()
+    with pytest.raises(ValueError):
+        master.renderArray(method, value, out=np.zeros((2, 2), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        master.renderArray(method, value, out=out_array.astype(np.uint16))
+
+
+MODE_LIST = ('L', 'LA', 'RGBA', 'I;16', 'P')
+
+
+@pytest.mark.parametrize('mode', MODE_LIST)
+@pytest.mark.parametrize('method, value', EFFECT_LIST)
+def testModeKeptByEveryBackend(mode, method, value):
+    picture = getRandomPicture(19, 14, mode, seed=25)
+    draw_name = PixelMaster.METHOD_DICT[method]
+    reference = getattr(PixelMaster(picture), draw_name)(value)
+    assert reference.mode == mode
+    if mode == 'P':
+        assert reference.getpalette() == picture.getpalette()
+    if mode == 'I;16' and method != 'circle':
+        # Les valeurs 16 bits ne sont pas ramenées sur 8 bits
+        assert np.asarray(reference).max() > 255
+    for backend in ('pixelaccess', 'buffer'):
+        assertSamePicture(getattr(PixelMaster(picture, backend=backend), draw_name)(value), reference)
+    # Une image à une composante, ou avec alpha, est traitée dans son mode : le résultat sur le tableau de ses
+    # pixels est le même
+    if mode != 'P':
+        assertSamePicture(getattr(PixelMaster(np.asarray(picture)), draw_name)(value), reference)
+
+
+def testAlphaWeightsAverages():
+    # Les pixels transparents ne colorent pas la moyenne d'une section
+    picture_array = np.zeros((4, 4, 4), dtype=np.uint8)
+    picture_array[:, :2] = (255, 0, 0, 255)
+    picture_array[:, 2:] = (0, 0, 255, 0)
+    square_array = np.asarray(PixelMaster(Image.fromarray(picture_array, 'RGBA')).drawSquarePicture(1))
+    # La première section couvre les deux colonnes rouges opaques et deux colonnes bleues transparentes
+    np.testing.assert_array_equal(square_array[0, 0], (255, 0, 0, 127))
+
+
+async def waitUntil(condition, timeout: float = 10):
+    """
+    Attend qu'une condition soit vraie, au plus timeout secondes.
+
+    Args:
+        condition: Une fonction sans argument qui renvoie la condition.
+        timeout (float, optionnel): Le délai maximal, en secondes. Defaults to 10.
+
+    Raises:
+        TimeoutError: Si la condition est encore fausse après timeout secondes.
+    """
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+def testServiceCoalescesRequests():
+    picture = getRandomPicture(40, 30, seed=26)
+    gate = threading.Event()
+
+    async def scenario():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Le seul fil de l'exécuteur est occupé jusqu'à l'ouverture de la barrière
+            executor.submit(gate.wait)
+            try:
+                service = RenderService(concurrency=1, executor=executor, max_waiting=2)
+                task_list = [asyncio.create_task(service.render(picture, 'square', 4)) for _ in range(3)]
+                task_list += [asyncio.create_task(service.render(picture, 'square', 5)),
+                              asyncio.create_task(service.render(picture, 'circle', 4, workers=1))]
+                await waitUntil(lambda: service.getStats()['in_flight'] == 3)
+                # Le premier calcul a la seule place, les deux autres l'attendent
+                assert service.getStats()['waiting'] == 2
+                with pytest.raises(RuntimeError):
+                    await service.render(picture, 'triangle', 4)
+                # Une demande identique à un calcul en cours le partage ; workers ne change pas l'image produite
+                task_list.append(asyncio.create_task(service.render(picture, 'circle', 4)))
+                await waitUntil(lambda: service.getStats()['coalesced'] == 3)
+            finally:
+                gate.set()
+            result_list = await asyncio.wait_for(asyncio.gather(*task_list), 30)
+            return result_list, service.getStats()
+
+    result_list, stats = asyncio.run(scenario())
+    assert stats == {'computed': 3, 'coalesced': 3, 'rejected': 1, 'running': 0, 'waiting': 0, 'in_flight': 0}
+    square_picture = PixelMaster(picture).drawSquarePicture(4)
+    for result in result_list[:3]:
+        assertSamePicture(result, square_picture)
+    # Chaque appel reçoit sa propre copie
+    assert len({id(result) for result in result_list}) == len(result_list)
+    assertSamePicture(result_list[3], PixelMaster(picture).drawSquarePicture(5))
+    assertSamePicture(result_list[4], PixelMaster(picture).drawCircularPicture(4))
+    assertSamePicture(result_list[5], result_list[4])
+
+
+def testServiceCountsOnlyWaitingRequests():
+    picture = getRandomPicture(20, 15, seed=28)
+    gate = threading.Event()
+
+    async def scenario():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            executor.submit(gate.wait)
+            executor.submit(gate.wait)
+            try:
+                # Deux places et aucune attente permise : deux calculs distincts demandés coup sur coup ont
+                # chacun une place, le troisième est refusé
+                service = RenderService(concurrency=2, executor=executor, max_waiting=0)
+                task_list = [asyncio.create_task(service.render(picture, 'square', 3)),
+                             asyncio.create_task(service.render(picture, 'circle', 3))]
+                await waitUntil(lambda: service.getStats()['in_flight'] == 2)
+                assert service.getStats()['waiting'] == 0
+                with pytest.raises(RuntimeError):
+                    await service.render(picture, 'square', 4)
+            finally:
+                gate.set()
+            await asyncio.wait_for(asyncio.gather(*task_list), 30)
+            # Les places libérées servent aux calculs suivants
+            await asyncio.wait_for(service.render(picture, 'square', 4), 30)
+            return service.getStats()
+
+    stats = asyncio.run(scenario())
+    assert stats == {'computed': 3, 'coalesced': 0, 'rejected': 1, 'running': 0, 'waiting': 0, 'in_flight': 0}
+
+
+async def getHttpResponse(port: int, verb: str, target: str, body: bytes = b'') -> tuple:
+    """
+    Envoie une requête au service HTTP local et lit la réponse.
+
+    Args:
+        port (int): Le port du service.
+        verb (str): La méthode HTTP.
+        target (str): Le chemin et les paramètres de la requête.
+        body (bytes, optionnel): Le corps de la requête. Defaults to b''.
+
+    Returns:
+        tuple: Le code HTTP, le type du contenu et le contenu de la réponse.
+    """
+    reader, writer = await asyncio.wait_for(asyncio.open_connection('127.0.0.1', port), 10)
+    writer.write(f"{verb} {target} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+                 f"Connection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await asyncio.wait_for(reader.read(), 30)
+    writer.close()
+    header, _, content = response.partition(b'\r\n\r\n')
+    line_list = header.decode('latin-1').split('\r\n')
+    header_dict = dict(line.split(': ', 1) for line in line_list[1:])
+    return int(line_list[0].split()[1]), header_dict['Content-Type'], content
+
+
+def testHttpServer():
+    picture_dict = {mode: getRandomPicture(23, 18, mode, seed=27) for mode in ('RGB',) + MODE_LIST}
+
+    async def scenario():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            service = RenderService(executor=executor)
+            server = await startHttpServer(service, port=0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                response_dict = {}
+                for mode, picture in picture_dict.items():
+                    picture_file = io.BytesIO()
+                    picture.save(picture_file, 'PNG')
+                    response_dict[mode] = await getHttpResponse(
+                        port, 'POST', '/triangle?division_nb=4', picture_file.getvalue())
+                error_list = [await getHttpResponse(port, 'POST', '/square?division_nb=four', picture_file.getvalue()),
+                              await getHttpResponse(port, 'POST', '/square?division=4', picture_file.getvalue()),
+                              await getHttpResponse(port, 'POST', '/square?division_nb=4', b'not a picture'),
+                              await getHttpResponse(port, 'POST', '/square', picture_file.getvalue()),
+                              await getHttpResponse(port, 'POST', '/mosaic?division_nb=4', picture_file.getvalue()),
+                              await getHttpResponse(port, 'GET', '/square?division_nb=4')]
+                stats_response = await getHttpResponse(port, 'GET', '/stats')
+            finally:
+                server.close()
+                await server.wait_closed()
+            return response_dict, error_list, stats_response
+
+    response_dict, error_list, stats_response = asyncio.run(scenario())
+    # Chaque image revient en PNG dans son mode
+    for mode, (status, content_type, content) in response_dict.items():
+        assert (status, content_type) == (200, 'image/png')
+        with Image.open(io.BytesIO(content)) as response_picture:
+            response_picture.load()
+        assertSamePicture(response_picture, PixelMaster(picture_dict[mode]).drawTriangularPicture(4))
+    assert [status for status, content_type, content in error_list] == [400, 400, 400, 400, 404, 405]
+    status, content_type, content = stats_response
+    assert (status, content_type) == (200, 'application/json')
+    assert json.loads(content)['computed'] == len(picture_dict)
+
+
+@pytest.mark.parametrize('output', (False, True))
+def testBatchMatchesDrawPicture(tmp_path, output):
+    picture_dict = {}
+    for index, size in enumerate(SIZE_LIST[:3]):
+        picture_dict[str(tmp_path / f'picture{index}.png')] = getRandomPicture(*size, seed=30 + index)
+    for path, picture in picture_dict.items():
+        picture.save(path)
+    (tmp_path / 'broken.png').write_bytes(b'not a picture')
+    effect_list = [('square', 4), ('circle', 3), ('blur', 2, {'kernel': 'box'})]
+    output_dir = str(tmp_path / 'output') if output else None
+    result_list = list(processBatch(str(tmp_path), effect_list, output_dir=output_dir, workers=2))
+    assert len(result_list) == (len(picture_dict) + 1) * len(effect_list)
+    # L'image illisible donne un résultat en erreur par effet, sans interrompre les autres
+    error_list = [result for result in result_list if not result.ok]
+    assert {result.path for result in error_list} == {str(tmp_path / 'broken.png')}
+    assert len(error_list) == len(effect_list) and all(result.error is not None for result in error_list)
+    for result in result_list:
+        if not result.ok:
+            continue
+        picture = picture_dict[result.path]
+        assert result.size == picture.size
+        method, value, *kwargs = result.effect
+        reference = getattr(PixelMaster(picture), PixelMaster.METHOD_DICT[method])(value, **(kwargs or [{}])[0])
+        if output:
+            assert result.picture is None
+            with Image.open(result.output) as result_picture:
+                result_picture.load()
+        else:
+            result_picture = result.picture
+        assertSamePicture(result_picture, reference)
+
+
+def getPalettePicture() -> Image:
+    """
+    Construit une image en couleurs indexées dont une couleur est transparente.
+
+    Returns:
+        Image: L'image, en mode 'P'.
+    """
+    picture = getRandomPicture(23, 17, 'P', seed=40)
+    picture.info['transparency'] = 3
+    return picture
+
+
+@pytest.mark.parametrize('extension', ('.gif', '.png', '.apng', '.webp'))
+@pytest.mark.parametrize('mode', ('RGB', 'P'))
+def testAnimationRoundTrip(tmp_path, extension, mode):
+    picture = getPalettePicture() if mode == 'P' else getRandomPicture(23, 17, seed=40)
+    master = PixelMaster(picture)
+    value_list = (2, 3, 5)
+    frame_list = list(master.iterPictures('square', value_list))
+    assert len(frame_list) == len(value_list)
+    for value, frame in zip(value_list, frame_list):
+        assertSamePicture(frame, PixelMaster(picture).drawSquarePicture(value))
+    path = tmp_path / f'animation{extension}'
+    master.saveAnimation(str(path), 'square', value_list, duration=50)
+    with Image.open(path) as animation:
+        assert animation.n_frames == len(value_list) and animation.size == picture.size
+        for index, frame in enumerate(frame_list):
+            animation.seek(index)
+            if extension in ('.png', '.apng'):
+                # L'APNG garde les pixels exacts, et en mode 'P' la palette et la transparence d'origine
+                assert animation.mode == frame.mode
+                if mode == 'P':
+                    assert animation.getpalette() == picture.getpalette()
+                    assert animation.info.get('transparency') == picture.info['transparency']
+                    assert animation.tobytes() == frame.tobytes()
+                else:
+                    assertSamePicture(animation, frame)
+            elif extension == '.gif' and mode == 'P':
+                # Le GIF écrit les images indexées telles quelles, avec leur palette
+                assert np.array_equal(np.asarray(animation.convert('RGB')), np.asarray(frame.convert('RGB')))
+
+
+def testAnimationChecksArguments(tmp_path):
+    master = PixelMaster(getRandomPicture(23, 17, seed=40))
+    with pytest.raises(ValueError):
+        master.saveAnimation(str(tmp_path / 'animation.gif'), 'square', [])
+    with pytest.raises(ValueError):
+        master.saveAnimation(str(tmp_path / 'animation.bmp'), 'square', (2, 3))
+    with pytest.raises(ValueError):
+        master.saveAnimation(str(tmp_path / 'animation.gif'), 'hexagon', (2, 3))
+    with pytest.raises(ValueError):
+        AnimationWriter(str(tmp_path / 'animation.tiff'), (23, 17), 'RGB', 2)
+    with AnimationWriter(str(tmp_path / 'animation.png'), (23, 17), 'RGB', 1) as writer:
+        with pytest.raises(ValueError):
+            writer.write(getRandomPicture(17, 23, seed=40))
+        writer.write(getRandomPicture(23, 17, seed=40))
+
+
+def testCommandLineWritesPicture(tmp_path, capsys):
+    picture = getRandomPicture(23, 17, seed=41)
+    picture.save(tmp_path / 'photo.png')
+    output_dir = tmp_path / 'output'
+    assert main(['square', '4', str(tmp_path / '*.png'), '-o', str(output_dir), '--quiet']) == 0
+    with Image.open(output_dir / 'photo_square_4.png') as output_picture:
+        output_picture.load()
+    assertSamePicture(output_picture, PixelMaster(picture).drawSquarePicture(4))
+    assert capsys.readouterr().out.startswith('1 images, 0 erreurs')
+    # Seules les options différentes de leur valeur par défaut apparaissent dans le nom du fichier
+    assert main(['blur', '2', '--kernel', 'box', str(tmp_path / 'photo.png'), '-o', str(output_dir)]) == 0
+    assert (output_dir / 'photo_blur_2_kernel-box.png').exists()
+
+
+def testCommandLineReportsErrors(tmp_path, capsys):
+    (tmp_path / 'broken.png').write_bytes(b'not a picture')
+    getRandomPicture(23, 17, seed=41).save(tmp_path / 'photo.png')
+    assert main(['circle', '3', str(tmp_path / 'broken.png'), '-o', str(tmp_path)]) == 1
+    assert 'broken.png: erreur' in capsys.readouterr().err
+    # Un noyau inconnu n'est refusé que par la méthode draw, comme une image en erreur
+    assert main(['blur', '2', '--kernel', 'disc', str(tmp_path / 'photo.png'), '-o', str(tmp_path)]) == 1
+    assert 'photo.png: erreur' in capsys.readouterr().err
+    for argv in (['hexagon', '3', str(tmp_path)], ['square', 'four', str(tmp_path)], ['square', str(tmp_path)],
+                 ['square', '3', '--backend', 'opencl', str(tmp_path)], ['serve', '--port', 'http']):
+        with pytest.raises(SystemExit) as error:
+            main(argv)
+        assert error.value.code == 2
+
+
+def testCommandLineServe(monkeypatch):
+    argument = vars(_getArgumentParser().parse_args(['serve']))
+    assert argument == {'method': 'serve', 'host': '127.0.0.1', 'port': 8000, 'concurrency': None,
+                        'max_waiting': None, 'backend': None}
+    argument_list = []
+
+    async def serveHttp(**argument):
+        argument_list.append(argument)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(pixelmaster_module, '_serveHttp', serveHttp)
+    assert main(['serve', '--host', '0.0.0.0', '--port', '0', '-c', '2', '--max-waiting', '3',
+                 '--backend', 'buffer']) == 0
+    assert argument_list == [{'host': '0.0.0.0', 'port': 0, 'concurrency': 2, 'max_waiting': 3,
+                              'backend': 'buffer'}]